@@ -1,13 +1,20 @@
 import datetime
+import os
+import sys
 import threading
 from abc import ABC, abstractmethod
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Common"))
+from credentials import PinHasher, RateLimiter
+
 # Account Class
 class Account:
+    hasher = PinHasher()
+
     def __init__(self, account_number, balance, pin):
         self.account_number = account_number
         self.balance = balance
-        self.pin = pin  # Store the PIN inside the account itself
+        self.pin_hash = self.hasher.hash(pin)  # Only a salted keyed hash of the PIN is stored
 
     def get_account_number(self):
         return self.account_number
@@ -16,7 +23,7 @@ class Account:
         return self.balance
 
     def verify_pin(self, entered_pin):
-        return self.pin == entered_pin
+        return self.hasher.verify(self.pin_hash, entered_pin)
 
     def debit(self, amount):
         self.balance -= amount
@@ -68,6 +75,7 @@ class DepositTransaction(Transaction):
 class BankingService:
     def __init__(self):
         self.accounts = {}
+        self.pin_limiter = RateLimiter(capacity=3, refill_per_second=1 / 300)  # per account, shared by all ATMs
 
     def create_account(self, account_number, initial_balance, pin):
         self.accounts[account_number] = Account(account_number, initial_balance, pin)
@@ -75,6 +83,15 @@ class BankingService:
     def get_account(self, account_number):
         return self.accounts.get(account_number)
 
+    def verify_pin(self, account, entered_pin):
+        """ Check a PIN unless the account has run out of attempts; None when throttled """
+        if not self.pin_limiter.allow(account.get_account_number()):
+            return None
+        if account.verify_pin(entered_pin):
+            self.pin_limiter.reset(account.get_account_number())
+            return True
+        return False
+
     def process_transaction(self, transaction):
         transaction.execute()
 
@@ -104,7 +121,11 @@ class ATM:
     def authenticate_user(self, account):
         """ Authenticate user by verifying their PIN """
         entered_pin = input("🔑 Enter your PIN: ")
-        if account.verify_pin(entered_pin):
+        verified = self.banking_service.verify_pin(account, entered_pin)
+        if verified is None:
+            print("🚫 Too many incorrect PINs. Card temporarily blocked, try again later.")
+            return False
+        if verified:
             print("✅ Authentication Successful")
             return True
         else:
@@ -1,5 +1,13 @@
+from collections import deque
 from enum import Enum
-import random
+import heapq
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Common"))
+from credentials import PinHasher, RateLimiter, generate_pin
 
 # Enum for package sizes
 class PackageSize(Enum):
@@ -7,49 +15,97 @@ class PackageSize(Enum):
     MEDIUM = 2
     LARGE = 3
 
+# Locker sizes a package may go into, in order of preference (nesting rules)
+FALLBACK_SIZES = {
+    PackageSize.SMALL: [PackageSize.SMALL, PackageSize.MEDIUM, PackageSize.LARGE],
+    PackageSize.MEDIUM: [PackageSize.MEDIUM, PackageSize.LARGE],
+    PackageSize.LARGE: [PackageSize.LARGE],
+}
+
 # Locker class representing individual lockers
 class Locker:
+    hasher = PinHasher()  # PINs are kept only as salted keyed hashes
+
     def __init__(self, locker_id: int, size: PackageSize):
         self.locker_id = locker_id
         self.size = size
         self.is_assigned = False
-        self.pin = None
+        self.pin_hash = None
         self.assigned_customer = None  # Track current assigned customer
+        self.assigned_at = None  # When the current package was assigned (epoch seconds)
+        self.generation = 0  # Bumped on every assignment, so stale expiry entries can be told apart
+        self.lock = threading.Lock()  # makes claim and PIN-checked release atomic
 
-    def assign(self, customer, pin: int):
-        """ Assign locker to a customer with a PIN and notify them """
-        self.is_assigned = True
-        self.pin = pin
-        self.assigned_customer = customer
-        customer.update(self.locker_id, self.pin)  # Notify the customer
+    def assign(self, customer, pin: int, now: float = None) -> int:
+        """ Claim the locker for a customer with a PIN at time `now` (default: wall clock) and notify them.
+        Returns the new assignment generation (always >= 1), or 0 if the locker is already taken """
+        with self.lock:
+            if self.is_assigned:
+                return 0
+            self.is_assigned = True
+            self.pin_hash = self.hasher.hash(pin)
+            self.assigned_customer = customer
+            self.assigned_at = time.time() if now is None else now
+            self.generation += 1
+            generation = self.generation
+        customer.update(self.locker_id, pin)  # Notify the customer
+        return generation
 
     def free(self):
         """ Free up the locker and remove customer association """
-        if self.assigned_customer:
-            self.assigned_customer.remove_locker(self.locker_id)  # Remove from customer's record
+        with self.lock:
+            self._clear()
+
+    def unlock(self, pin: int) -> int:
+        """ Check the PIN and free the locker in one step, so only one pickup of a package can succeed.
+        Returns the generation of the assignment picked up, or 0 if the PIN is refused """
+        with self.lock:
+            if not (self.is_assigned and self.hasher.verify(self.pin_hash, pin)):
+                return 0
+            self._clear()
+            return self.generation
+
+    def reclaim(self, generation: int):
+        """ Free the locker if it still holds the assignment `generation`; returns the customer it was taken from """
+        with self.lock:
+            if not self.is_assigned or self.generation != generation:
+                return None  # picked up (and maybe reassigned) since the expiry was scheduled
+            customer = self._clear()
+        if customer:
+            customer.locker_expired(self.locker_id)
+        return customer
+
+    def _clear(self):
+        # Caller holds self.lock
+        customer = self.assigned_customer
         self.is_assigned = False
-        self.pin = None
+        self.pin_hash = None
         self.assigned_customer = None  # Remove assigned customer reference
+        self.assigned_at = None
+        return customer
 
     def check_pin(self, pin: int) -> bool:
         """ Validate PIN before allowing access """
-        return self.is_assigned and self.pin == pin
+        return self.is_assigned and self.hasher.verify(self.pin_hash, pin)
 
 # Customer class representing a customer
+# Which lockers a customer holds is answered by the assignment table (AmazonLockerSystem.lockers_of); the
+# customer only keeps the PINs it was sent, as a phone keeps its messages.
 class Customer:
     def __init__(self, customer_id: int):
         self.customer_id = customer_id
-        self.assigned_lockers = {}  # Stores multiple locker assignments {locker_id: pin}
+        self.pins = {}  # latest PIN received per locker {locker_id: pin}
+        self.lock = threading.Lock()  # kiosks and courier devices notify concurrently
 
     def update(self, locker_id: int, pin: int):
         """ Receive notification when locker is assigned """
-        self.assigned_lockers[locker_id] = pin
+        with self.lock:
+            self.pins[locker_id] = pin
         print(f"🔔 Notification: Customer {self.customer_id} - Assigned Locker {locker_id}, PIN: {pin}")
 
-    def remove_locker(self, locker_id: int):
-        """ Remove locker from the customer's assigned list """
-        if locker_id in self.assigned_lockers:
-            del self.assigned_lockers[locker_id]
+    def locker_expired(self, locker_id: int):
+        """ Receive notification when an uncollected package's locker is reclaimed """
+        print(f"⏰ Notification: Customer {self.customer_id} - Locker {locker_id} reservation expired, package returned to sender")
 
     def order_package(self, package_size: PackageSize, amazon_locker_system):
         """ Place an order and request a locker """
@@ -57,86 +113,358 @@ class Customer:
 
     def unassign_locker(self, locker_id: int, pin: int):
         """ Attempt to unlock a specific locker with Locker ID & PIN """
-        if locker_id in self.assigned_lockers and self.assigned_lockers[locker_id] == pin:
+        if self.pins.get(locker_id) == pin:
             amazon_locker_system.unlock_locker(self, locker_id, pin)
         else:
             print(f"❌ Customer {self.customer_id}: Invalid Locker ID or Incorrect PIN.")
 
+# Locker Desk: the steps around handing a locker out and taking it back, with every hook (PIN limiter,
+# assignment table, journal, expiry, demand forecast) in one place. Shared by the single-site
+# AmazonLockerSystem and locker_network.LockerNetwork, so neither can skip a step the other takes.
+# The desk's clock stamps each assignment once, and that one timestamp goes to the locker, the assignment
+# table, the journal and the expiry, so age queries, reclaims and a recovery all agree on it.
+class LockerDesk:
+    def _init_desk(self, clock=time.time):
+        self.clock = clock
+        self.expiry = None
+        self.journal = None
+        self.forecaster = None
+        self.pin_limiter = RateLimiter()  # per locker: 5 tries, then one a minute
+
+    def set_clock(self, clock):
+        """ Time source for assignments (epoch seconds); simulations pass their own """
+        self.clock = clock
+
+    def set_expiry(self, expiry):
+        """ Reclaim lockers whose packages are not collected in time (see locker_expiry.LockerExpiry); the
+        expiry must run on the desk's clock """
+        if expiry and expiry.clock is not self.clock:
+            raise ValueError("LockerExpiry runs on another clock than the desk; set_clock(expiry.clock) first")
+        self.expiry = expiry
+
+    def set_journal(self, journal):
+        """ Record every assignment and pickup (see locker_journal.LockerJournal); give the same journal to
+        the LockerExpiry so reclaims are recorded too """
+        self.journal = journal
+
+    def set_forecaster(self, forecaster):
+        """ Report every order to a demand forecaster (see locker_forecast.DemandForecaster); every location
+        of this desk is added to it, and so is any location added later """
+        self.forecaster = forecaster
+        if forecaster:
+            for location in self._locations():
+                forecaster.add_site(location)
+
+    def _locations(self):
+        """ Every Location this desk hands lockers out from """
+        raise NotImplementedError
+
+    def location_of(self, locker_id: int):
+        """ The Location holding this locker, or None if the desk has no such locker """
+        raise NotImplementedError
+
+    def waiting_longer_than(self, seconds: float):
+        """ Assignments older than `seconds` by the desk's clock, at every location, oldest first """
+        tables = {id(location.assignments): location.assignments for location in self._locations()}
+        now = self.clock()
+        return sorted((record for table in tables.values() for record in table.waiting_longer_than(seconds, now)),
+                      key=lambda record: record.assigned_at)
+
+    def _issue_pin(self, location, locker, customer) -> int:
+        """ Assign the locker under a fresh PIN; its attempt budget starts over with the new PIN.
+        Returns the assignment generation, or 0 if the locker turned out to be taken """
+        assigned_at = self.clock()
+        generation = locker.assign(customer, generate_pin(), assigned_at)
+        if generation:
+            location.assignments.add(locker, generation)
+            self.pin_limiter.reset(locker.locker_id)
+            if self.journal:
+                self.journal.record_assign(locker, generation)
+            if self.expiry:
+                self.expiry.track(locker, generation, location, assigned_at)
+        return generation
+
+    def _hand_over(self, location, locker, pin: int) -> bool:
+        """ Open the locker if the PIN matches; a second kiosk racing on the same locker is refused """
+        generation = locker.unlock(pin)
+        if generation:
+            if self.journal:
+                self.journal.record_free(locker.locker_id, generation)
+            location.release(locker)  # back in the pool only after it is fully freed
+        return bool(generation)
+
 # Amazon Locker Management System (Singleton)
-class AmazonLockerSystem:
+class AmazonLockerSystem(LockerDesk):
     _instance = None
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance.locker_location = None
+            cls._instance._init_desk()
         return cls._instance
 
     def set_location(self, location):
-        """ Set the single location containing lockers """
+        """ Set the single location containing lockers; its assignment table is the system's """
         self.locker_location = location
+        if self.forecaster and location:
+            self.forecaster.add_site(location)
+
+    def _locations(self):
+        return [self.locker_location] if self.locker_location else []
+
+    def location_of(self, locker_id: int):
+        location = self.locker_location
+        return location if location and location.get_locker(locker_id) else None
+
+    def lockers_of(self, customer):
+        """ Ids of the lockers holding this customer's packages, from the assignment table """
+        return self.locker_location.assignments.lockers_of(customer.customer_id) if self.locker_location else []
 
     def find_available_locker(self, package_size: PackageSize):
-        """ Find an available locker based on nesting rules """
+        """ Find an available locker based on nesting rules (without claiming it) """
         if not self.locker_location:
             return None
+        return self.locker_location.peek(package_size)
 
-        if package_size == PackageSize.SMALL:
-            # Try small lockers first, then fallback to medium, then large
-            for size in [PackageSize.SMALL, PackageSize.MEDIUM, PackageSize.LARGE]:
-                for locker in self.locker_location.lockers[size]:
-                    if not locker.is_assigned:
-                        return locker
-
-        elif package_size == PackageSize.MEDIUM:
-            # Try medium lockers first, then fallback to large
-            for size in [PackageSize.MEDIUM, PackageSize.LARGE]:
-                for locker in self.locker_location.lockers[size]:
-                    if not locker.is_assigned:
-                        return locker
-
-        elif package_size == PackageSize.LARGE:
-            # Large packages can only go into large lockers
-            for locker in self.locker_location.lockers[PackageSize.LARGE]:
-                if not locker.is_assigned:
-                    return locker
-
-        return None  # No available locker found
+    def assign_batch(self, drop):
+        """ Assign a courier drop of (customer, package_size) pairs in one pass; returns lockers (None if unplaced) """
+        if not self.locker_location:
+            return [None] * len(drop)
+        if self.forecaster:
+            for _, package_size in drop:
+                self.forecaster.record(self.locker_location, package_size)
+        lockers = self.locker_location.allocate_batch([package_size for _, package_size in drop])
+        for index, ((customer, package_size), locker) in enumerate(zip(drop, lockers)):
+            if locker and not self._issue_pin(self.locker_location, locker, customer):
+                lockers[index] = locker = None  # taken behind the pool's back; not this package's
+            if not locker:
+                print(f"❌ No {package_size.name} locker left for Customer {customer.customer_id} in this drop.")
+        return lockers
 
     def assign_locker(self, customer, package_size: PackageSize):
-        """ Assign an available locker based on package size constraints """
-        locker = self.find_available_locker(package_size)
-        if locker:
-            pin = random.randint(1000, 9999)
-            locker.assign(customer, pin)
-            return True
+        """ Assign an available locker based on package size constraints; returns the locker or None """
+        if self.forecaster and self.locker_location:
+            self.forecaster.record(self.locker_location, package_size)  # demand, whether or not it can be placed
+        # The pool pop is atomic, so the popped locker belongs to this caller alone
+        locker = self.locker_location.allocate(package_size) if self.locker_location else None
+        if locker and self._issue_pin(self.locker_location, locker, customer):
+            return locker
         else:
             print(f"❌ No available lockers for Customer {customer.customer_id}. Please try later.")
-            return False
+            return None
 
     def unlock_locker(self, customer, locker_id: int, pin: int):
         """ Allow the customer to unlock a specific locker with the correct PIN """
-        for size in self.locker_location.lockers:
-            for locker in self.locker_location.lockers[size]:
-                if locker.locker_id == locker_id and locker.is_assigned:
-                    if locker.check_pin(pin):
-                        print(f"🔓 Customer {customer.customer_id}: Locker {locker_id} Unlocked Successfully! Package Retrieved.")
-                        locker.free()  # Properly free locker before reassigning
-                        return
-                    else:
-                        print(f"❌ Customer {customer.customer_id}: Wrong PIN for Locker {locker_id}. Access Denied.")
-                        return
+        if not self.pin_limiter.allow(locker_id):  # brute force stops here, before any locker state is read
+            print(f"🚫 Customer {customer.customer_id}: Too many attempts on Locker {locker_id}. Try again later.")
+            return False
+        locker = self.locker_location.get_locker(locker_id)
+        if locker and locker.is_assigned:
+            if self._hand_over(self.locker_location, locker, pin):
+                print(f"🔓 Customer {customer.customer_id}: Locker {locker_id} Unlocked Successfully! Package Retrieved.")
+                return True
+            else:
+                print(f"❌ Customer {customer.customer_id}: Wrong PIN for Locker {locker_id}. Access Denied.")
+                return False
         print(f"❌ Customer {customer.customer_id}: Invalid Locker ID or Locker Not Assigned.")
+        return False
+
+# Assignment record: one per package waiting in a locker
+class Assignment:
+    __slots__ = ("locker_id", "customer_id", "generation", "assigned_at", "active")
+
+    def __init__(self, locker_id: int, customer_id: int, generation: int, assigned_at: float):
+        self.locker_id = locker_id
+        self.customer_id = customer_id
+        self.generation = generation
+        self.assigned_at = assigned_at
+        self.active = True
+
+# Assignment Table: the index of who holds which locker, one per AmazonLockerSystem or LockerNetwork
+# The only record of a customer's lockers: lockers know their current customer, customers know nothing.
+# Both directions are dictionaries, so adding or dropping an assignment is O(1) however many customers
+# there are. A deque keeps the records in assignment order for age queries; a freed record is only marked
+# inactive there and skipped (or compacted away once stale records outnumber live ones).
+class AssignmentTable:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.by_locker = {}  # locker_id -> Assignment
+        self.by_customer = {}  # customer_id -> {locker_id: Assignment}
+        self.by_time = deque()  # Assignments, oldest first; may include inactive ones
+        self.stale = 0
+
+    def add(self, locker: Locker, generation: int):
+        """ Index the locker's assignment `generation`, unless it has been picked up already """
+        with locker.lock:  # the locker cannot be freed (and so released) until it is indexed
+            if locker.generation != generation or not locker.is_assigned:
+                return
+            record = Assignment(locker.locker_id, locker.assigned_customer.customer_id, generation, locker.assigned_at)
+            with self.lock:
+                previous = self.by_locker.get(locker.locker_id)
+                if previous:
+                    self._drop(previous)  # freed with Locker.free() but never released
+                self.by_locker[locker.locker_id] = record
+                self.by_customer.setdefault(record.customer_id, {})[locker.locker_id] = record
+                self.by_time.append(record)
+
+    def remove(self, locker_id: int):
+        """ Forget the locker's assignment in O(1); returns the Assignment or None """
+        with self.lock:
+            record = self.by_locker.get(locker_id)
+            if record:
+                self._drop(record)
+            return record
+
+    def _drop(self, record):
+        # Caller holds self.lock
+        del self.by_locker[record.locker_id]
+        held = self.by_customer[record.customer_id]
+        del held[record.locker_id]
+        if not held:
+            del self.by_customer[record.customer_id]  # no empty entries left behind for millions of customers
+        record.active = False
+        self.stale += 1
+        if self.stale > 1024 and self.stale > len(self.by_locker):
+            self.by_time = deque(entry for entry in self.by_time if entry.active)
+            self.stale = 0
+
+    def customer_of(self, locker_id: int):
+        record = self.by_locker.get(locker_id)
+        return record.customer_id if record else None
+
+    def lockers_of(self, customer_id: int):
+        with self.lock:
+            return list(self.by_customer.get(customer_id, ()))
+
+    def waiting_longer_than(self, seconds: float, now: float):
+        """ Assignments older than `seconds` at time `now` (the desk's clock), oldest first: reads only the
+        old end of the time index """
+        cutoff = now - seconds
+        waiting = []
+        with self.lock:
+            while self.by_time and not self.by_time[0].active:
+                self.by_time.popleft()  # freed records at the old end are dropped for good
+                self.stale -= 1
+            for record in self.by_time:
+                if record.assigned_at > cutoff:
+                    break
+                if record.active:
+                    waiting.append(record)
+        return waiting
+
+    def __len__(self):
+        return len(self.by_locker)
+
+def sequential_layout(small: int = 20, medium: int = 20, large: int = 20):
+    """ (locker_id, size) pairs numbered from 1: all small lockers, then medium, then large """
+    sizes = [PackageSize.SMALL] * small + [PackageSize.MEDIUM] * medium + [PackageSize.LARGE] * large
+    return list(enumerate(sizes, start=1))
 
 # Location class representing a single location with lockers
 class Location:
-    def __init__(self):
-        """ Initialize the locker system with 60 lockers (20 small, 20 medium, 20 large) """
-        self.lockers = {
-            PackageSize.SMALL: [Locker(i, PackageSize.SMALL) for i in range(1, 21)],
-            PackageSize.MEDIUM: [Locker(i, PackageSize.MEDIUM) for i in range(21, 41)],
-            PackageSize.LARGE: [Locker(i, PackageSize.LARGE) for i in range(41, 61)],
-        }
+    def __init__(self, small: int = 20, medium: int = 20, large: int = 20, layout=None, assignments=None):
+        """ Lockers numbered 1.. by size (20 small, 20 medium, 20 large by default), or an explicit
+        layout of (locker_id, PackageSize) pairs for banks with any numbering and mix of sizes.
+        Sites of a locker network pass the network's shared assignment table """
+        if layout is None:
+            layout = sequential_layout(small, medium, large)
+
+        self.lockers = {size: [] for size in PackageSize}
+        self.lockers_by_id = {}  # locker_id -> Locker, so pickup is one lookup whatever the layout
+        for locker_id, size in layout:
+            if locker_id in self.lockers_by_id:
+                raise ValueError(f"Duplicate locker id {locker_id} in layout")
+            locker = Locker(locker_id, size)
+            self.lockers[size].append(locker)
+            self.lockers_by_id[locker_id] = locker
+
+        # Free pools: per size, a min-heap of (locker_id, locker) so the lowest numbered free locker goes first
+        self.free_lockers = {size: [(locker.locker_id, locker) for locker in lockers]
+                             for size, lockers in self.lockers.items()}
+        for pool in self.free_lockers.values():
+            heapq.heapify(pool)
+        self.reserved = dict.fromkeys(PackageSize, 0)  # per size, free lockers held back for packages of that size
+        self.lock = threading.Lock()  # guards the free pools
+        self.listeners = []  # objects with on_free_count(location, size, free), e.g. a locker network
+        self.assignments = AssignmentTable() if assignments is None else assignments  # customer <-> locker index
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def free_count(self, size: PackageSize) -> int:
+        return len(self.free_lockers[size])
+
+    def _notify(self, size: PackageSize):
+        for listener in self.listeners:
+            listener.on_free_count(self, size, len(self.free_lockers[size]))
+
+    def get_locker(self, locker_id: int):
+        return self.lockers_by_id.get(locker_id)
+
+    def reserve(self, size: PackageSize, count: int):
+        """ Keep the last `count` free lockers of `size` for packages of that size, so smaller packages cannot
+        fall back into them ahead of an expected peak (see locker_forecast) """
+        with self.lock:
+            self.reserved[size] = count
+            self._notify(size)
+
+    def held_back(self, size: PackageSize, package_size: PackageSize) -> int:
+        """ Free lockers of `size` that a `package_size` package must leave in the pool """
+        return 0 if size is package_size else self.reserved[size]
+
+    def peek(self, package_size: PackageSize):
+        """ The locker allocate() would hand out, or None """
+        for size in FALLBACK_SIZES[package_size]:
+            if len(self.free_lockers[size]) > self.held_back(size, package_size):
+                return self.free_lockers[size][0][1]
+        return None
+
+    def allocate(self, package_size: PackageSize):
+        """ Take the smallest fitting free locker: one heap pop, whatever the bank size """
+        with self.lock:
+            for size in FALLBACK_SIZES[package_size]:
+                if len(self.free_lockers[size]) > self.held_back(size, package_size):
+                    locker = heapq.heappop(self.free_lockers[size])[1]
+                    self._notify(size)
+                    return locker
+        return None
+
+    def allocate_batch(self, package_sizes):
+        """ Lockers for a whole drop, aligned with package_sizes (None where nothing fits).
+        Largest packages are placed first and each takes the smallest fitting locker, so a MEDIUM package can
+        only spill into a LARGE locker that no LARGE package in the drop needs. With nested sizes this places
+        as many packages as any assignment can. """
+        by_size = {size: [] for size in PackageSize}  # bucket the drop by size instead of sorting it
+        for index, package_size in enumerate(package_sizes):
+            by_size[package_size].append(index)
+        lockers = [None] * len(package_sizes)
+        with self.lock:
+            for package_size in sorted(PackageSize, key=lambda size: size.value, reverse=True):
+                waiting, placed = by_size[package_size], 0
+                for size in FALLBACK_SIZES[package_size]:
+                    pool, floor = self.free_lockers[size], self.held_back(size, package_size)
+                    while placed < len(waiting) and len(pool) > floor:
+                        lockers[waiting[placed]] = heapq.heappop(pool)[1]
+                        placed += 1
+            for size in PackageSize:
+                self._notify(size)  # once per size for the whole drop
+        return lockers
+
+    def rebuild_pools(self):
+        """ Refill the free pools from the lockers' own state, e.g. after restoring assignments from a journal """
+        with self.lock:
+            for size, lockers in self.lockers.items():
+                self.free_lockers[size] = [(locker.locker_id, locker) for locker in lockers if not locker.is_assigned]
+                heapq.heapify(self.free_lockers[size])
+                self._notify(size)
+
+    def release(self, locker: Locker):
+        """ Return a freed locker to its size's pool """
+        self.assignments.remove(locker.locker_id)
+        with self.lock:
+            heapq.heappush(self.free_lockers[locker.size], (locker.locker_id, locker))
+            self._notify(locker.size)
 
 # Example usage
 if __name__ == "__main__":
@@ -157,7 +485,7 @@ if __name__ == "__main__":
     customer1.order_package(PackageSize.SMALL, amazon_locker_system)  # Assign another locker
     customer2.order_package(PackageSize.MEDIUM, amazon_locker_system)
 
-    customer1.unassign_locker(1, customer1.assigned_lockers[1])  # Should succeed
+    customer1.unassign_locker(1, customer1.pins[1])  # Should succeed
 
     customer3.order_package(PackageSize.SMALL, amazon_locker_system)
     customer3.order_package(PackageSize.SMALL, amazon_locker_system)
@@ -165,9 +493,14 @@ if __name__ == "__main__":
     customer3.order_package(PackageSize.SMALL, amazon_locker_system)
     customer3.order_package(PackageSize.SMALL, amazon_locker_system)
 
-    customer3.unassign_locker(2, customer1.assigned_lockers[2])  # Should succeed
+    customer3.unassign_locker(2, customer1.pins[2])  # Should succeed
 
-    customer1.unassign_locker(2, customer1.assigned_lockers[2])  # Should succeed
+    customer1.unassign_locker(2, customer1.pins[2])  # Should succeed
 
-    customer3.unassign_locker(4, customer3.assigned_lockers[4]) 
-    customer3.order_package(PackageSize.SMALL, amazon_locker_system)
\ No newline at end of file
+    customer3.unassign_locker(4, customer3.pins[4]) 
+    customer3.order_package(PackageSize.SMALL, amazon_locker_system)
+    # A courier drop placed as one batch: the LARGE packages get the large lockers first
+    drop = [(customer2, PackageSize.MEDIUM)] * 3 + [(customer1, PackageSize.LARGE)] * 2
+    placed = amazon_locker_system.assign_batch(drop)
+    print(f"📦 Courier drop: placed {sum(1 for locker in placed if locker)} of {len(drop)} packages")
+    print(f"🗂️ Customer 1 now holds lockers {amazon_locker_system.lockers_of(customer1)}")
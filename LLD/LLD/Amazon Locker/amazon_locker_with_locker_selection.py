@@ -1,5 +1,10 @@
 from enum import Enum
-import random
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Common"))
+from credentials import PinHasher, RateLimiter, generate_pin
 
 # Enum for package sizes
 class PackageSize(Enum):
@@ -9,47 +14,73 @@ class PackageSize(Enum):
 
 # Locker class representing individual lockers
 class Locker:
+    hasher = PinHasher()  # PINs are kept only as salted keyed hashes
+
     def __init__(self, locker_id: int, size: PackageSize):
         self.locker_id = locker_id
         self.size = size
         self.is_assigned = False
-        self.pin = None
+        self.pin_hash = None
         self.assigned_customer = None  # Track current assigned customer
+        self.lock = threading.Lock()  # makes claim and PIN-checked release atomic
 
-    def assign(self, customer, pin: int):
-        """ Assign locker to a customer with a PIN and notify them """
-        self.is_assigned = True
-        self.pin = pin
-        self.assigned_customer = customer
-        customer.update(self.locker_id, self.pin)  # Notify the customer
+    def assign(self, customer, pin: int) -> bool:
+        """ Claim the locker for a customer with a PIN and notify them; False if it is already taken """
+        with self.lock:
+            if self.is_assigned:
+                return False
+            self.is_assigned = True
+            self.pin_hash = self.hasher.hash(pin)
+            self.assigned_customer = customer
+        customer.update(self.locker_id, pin)  # Notify the customer
+        return True
 
     def free(self):
         """ Free up the locker and remove customer association """
-        if self.assigned_customer:
-            self.assigned_customer.remove_locker(self.locker_id)  # Remove from customer's record
+        with self.lock:
+            customer = self._clear()
+        if customer:
+            customer.remove_locker(self.locker_id)  # Remove from customer's record
+
+    def unlock(self, pin: int) -> bool:
+        """ Check the PIN and free the locker in one step, so only one pickup of a package can succeed """
+        with self.lock:
+            if not (self.is_assigned and self.hasher.verify(self.pin_hash, pin)):
+                return False
+            customer = self._clear()
+        if customer:
+            customer.remove_locker(self.locker_id)
+        return True
+
+    def _clear(self):
+        # Caller holds self.lock
+        customer = self.assigned_customer
         self.is_assigned = False
-        self.pin = None
+        self.pin_hash = None
         self.assigned_customer = None  # Remove assigned customer reference
+        return customer
 
     def check_pin(self, pin: int) -> bool:
         """ Validate PIN before allowing access """
-        return self.is_assigned and self.pin == pin
+        return self.is_assigned and self.hasher.verify(self.pin_hash, pin)
 
 # Customer class representing a customer
 class Customer:
     def __init__(self, customer_id: int):
         self.customer_id = customer_id
         self.assigned_lockers = {}  # Stores multiple locker assignments {locker_id: pin}
+        self.lock = threading.Lock()  # kiosks and courier devices update the record concurrently
 
     def update(self, locker_id: int, pin: int):
         """ Receive notification when locker is assigned """
-        self.assigned_lockers[locker_id] = pin
+        with self.lock:
+            self.assigned_lockers[locker_id] = pin
         print(f"🔔 Notification: Customer {self.customer_id} - Assigned Locker {locker_id}, PIN: {pin}")
 
     def remove_locker(self, locker_id: int):
         """ Remove locker from the customer's assigned list """
-        if locker_id in self.assigned_lockers:
-            del self.assigned_lockers[locker_id]
+        with self.lock:
+            self.assigned_lockers.pop(locker_id, None)
 
     def order_package(self, package_size: PackageSize, amazon_locker_system, locker_id: int):
         """ Place an order and request a specific locker """
@@ -70,6 +101,7 @@ class AmazonLockerSystem:
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance.locker_location = None
+            cls._instance.pin_limiter = RateLimiter()  # per locker: 5 tries, then one a minute
         return cls._instance
 
     def set_location(self, location):
@@ -82,40 +114,25 @@ class AmazonLockerSystem:
             print("❌ Locker location not set.")
             return False
 
-        # Determine locker size based on its ID
-        if 1 <= locker_id <= 20:
-            locker_list = self.locker_location.lockers[PackageSize.SMALL]
-        elif 21 <= locker_id <= 40:
-            locker_list = self.locker_location.lockers[PackageSize.MEDIUM]
-        elif 41 <= locker_id <= 60:
-            locker_list = self.locker_location.lockers[PackageSize.LARGE]
-        else:
+        locker = self.locker_location.get_locker(locker_id)
+        if locker is None:
             print(f"❌ Locker {locker_id} not found.")
             return False
 
-        # Get the specific locker (adjusting index)
-        locker = locker_list[(locker_id - 1) % 20]
-
         if locker.is_assigned:
             print(f"❌ Locker {locker_id} is already assigned. Choose another locker.")
             return False
 
-        # Validate size compatibility
-        if package_size == PackageSize.LARGE and locker.size == PackageSize.SMALL:
-            print(f"❌ Cannot place a LARGE package in a SMALL locker! Choose a bigger locker.")
+        # Validate size compatibility: a package fits its own size or anything bigger
+        if package_size.value > locker.size.value:
+            print(f"❌ Cannot place a {package_size.name} package in a {locker.size.name} locker! Choose a bigger locker.")
             return False
 
-        if package_size == PackageSize.LARGE and locker.size == PackageSize.MEDIUM:
-            print(f"❌ Cannot place a LARGE package in a SMALL locker! Choose a bigger locker.")
-            return False
-
-        if package_size == PackageSize.MEDIUM and locker.size == PackageSize.SMALL:
-            print(f"❌ Cannot place a LARGE package in a SMALL locker! Choose a bigger locker.")
+        # Assign the locker with a random PIN; the claim fails if another courier took it since the check above
+        if not locker.assign(customer, generate_pin()):
+            print(f"❌ Locker {locker_id} is already assigned. Choose another locker.")
             return False
-
-        # Assign the locker with a random PIN
-        pin = random.randint(1000, 9999)
-        locker.assign(customer, pin)
+        self.pin_limiter.reset(locker_id)  # the new PIN gets a fresh attempt budget
         print(f"✅ Locker {locker_id} assigned to Customer {customer.customer_id} for package size {package_size.name}.")
         return True
 
@@ -126,25 +143,19 @@ class AmazonLockerSystem:
             print("❌ Locker location not set.")
             return False
 
-        # Determine the correct locker list based on locker ID
-        if 1 <= locker_id <= 20:
-            locker_list = self.locker_location.lockers[PackageSize.SMALL]
-        elif 21 <= locker_id <= 40:
-            locker_list = self.locker_location.lockers[PackageSize.MEDIUM]
-        elif 41 <= locker_id <= 60:
-            locker_list = self.locker_location.lockers[PackageSize.LARGE]
-        else:
-            print(f"❌ Locker {locker_id} not found.")
+        if not self.pin_limiter.allow(locker_id):  # brute force stops here, before any locker state is read
+            print(f"🚫 Customer {customer.customer_id}: Too many attempts on Locker {locker_id}. Try again later.")
             return False
 
-        # Get the specific locker (adjusting index)
-        locker = locker_list[(locker_id - 1) % 20]
+        locker = self.locker_location.get_locker(locker_id)
+        if locker is None:
+            print(f"❌ Locker {locker_id} not found.")
+            return False
 
         # Check if locker is assigned and verify PIN
         if locker.is_assigned:
-            if locker.check_pin(pin):
+            if locker.unlock(pin):  # a second kiosk racing on the same locker gets False here
                 print(f"🔓 Customer {customer.customer_id}: Locker {locker_id} Unlocked Successfully! Package Retrieved.")
-                locker.free()  # Free the locker after successful retrieval
                 return True
             else:
                 print(f"❌ Customer {customer.customer_id}: Wrong PIN for Locker {locker_id}. Access Denied.")
@@ -153,15 +164,30 @@ class AmazonLockerSystem:
         print(f"❌ Locker {locker_id} is not assigned or does not exist.")
         return False
 
+def sequential_layout(small: int = 20, medium: int = 20, large: int = 20):
+    """ (locker_id, size) pairs numbered from 1: all small lockers, then medium, then large """
+    sizes = [PackageSize.SMALL] * small + [PackageSize.MEDIUM] * medium + [PackageSize.LARGE] * large
+    return list(enumerate(sizes, start=1))
+
 # Location class representing a single location with lockers
 class Location:
-    def __init__(self):
-        """ Initialize the locker system with 60 lockers (20 small, 20 medium, 20 large) """
-        self.lockers = {
-            PackageSize.SMALL: [Locker(i, PackageSize.SMALL) for i in range(1, 21)],
-            PackageSize.MEDIUM: [Locker(i, PackageSize.MEDIUM) for i in range(21, 41)],
-            PackageSize.LARGE: [Locker(i, PackageSize.LARGE) for i in range(41, 61)],
-        }
+    def __init__(self, small: int = 20, medium: int = 20, large: int = 20, layout=None):
+        """ Lockers numbered 1.. by size (20 small, 20 medium, 20 large by default), or an explicit
+        layout of (locker_id, PackageSize) pairs for banks with any numbering and mix of sizes """
+        if layout is None:
+            layout = sequential_layout(small, medium, large)
+
+        self.lockers = {size: [] for size in PackageSize}
+        self.lockers_by_id = {}  # locker_id -> Locker; the courier picks lockers by id
+        for locker_id, size in layout:
+            if locker_id in self.lockers_by_id:
+                raise ValueError(f"Duplicate locker id {locker_id} in layout")
+            locker = Locker(locker_id, size)
+            self.lockers[size].append(locker)
+            self.lockers_by_id[locker_id] = locker
+
+    def get_locker(self, locker_id: int):
+        return self.lockers_by_id.get(locker_id)
 
 # Example usage
 if __name__ == "__main__":
@@ -191,4 +217,9 @@ if __name__ == "__main__":
     customer1.unassign_locker(5, customer1.assigned_lockers[5])   # ✅ Should succeed
     customer2.unassign_locker(25, customer2.assigned_lockers[25]) # ✅ Should succeed
     customer3.unassign_locker(45, customer3.assigned_lockers[45]) # ✅ Should succeed
-    customer3.order_package(PackageSize.LARGE, amazon_locker_system, 45)
\ No newline at end of file
+    customer3.order_package(PackageSize.LARGE, amazon_locker_system, 45)
+    # Any bank layout works: ids come from the layout, not from fixed 1..20/21..40/41..60 ranges
+    amazon_locker_system.set_location(Location(layout=[(101, PackageSize.LARGE), (205, PackageSize.SMALL), (310, PackageSize.MEDIUM)]))
+    customer1.order_package(PackageSize.MEDIUM, amazon_locker_system, 310)  # ✅ Assigns locker 310
+    customer1.order_package(PackageSize.MEDIUM, amazon_locker_system, 205)  # ❌ Medium package in small locker
+    customer1.unassign_locker(310, customer1.assigned_lockers[310])         # ✅ Should succeed
@@ -0,0 +1,71 @@
+import argparse
+import contextlib
+import os
+import random
+import time
+
+from amazon_locker import AmazonLockerSystem, Customer, Location, PackageSize
+
+# "Which packages have been waiting more than 48 hours?" on a busy bank. Assignments are spread over the
+# last three days and a share of them already picked up. The query is answered by checking every locker in
+# the bank (the only way without the assignment table), and from the table's time index, which reads only
+# the records old enough to qualify.
+
+HOUR = 3600
+
+
+def fill(customers, lockers_per_size, picked_share, rng):
+    system = AmazonLockerSystem()
+    location = Location(small=lockers_per_size, medium=lockers_per_size, large=lockers_per_size)
+    system.set_location(location)
+    now = time.time()
+    held = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        ages = sorted((rng.uniform(0, 72 * HOUR) for _ in range(3 * lockers_per_size)), reverse=True)
+        for age in ages:  # oldest first, as they would have arrived
+            customer = customers[rng.randrange(len(customers))]
+            locker = system.assign_locker(customer, rng.choice(list(PackageSize)))
+            if locker:
+                locker.assigned_at = now - age  # backdate the assignment for the benchmark
+                location.assignments.by_locker[locker.locker_id].assigned_at = now - age
+                held.append((customer, locker.locker_id))
+        rng.shuffle(held)
+        for customer, locker_id in held[:int(len(held) * picked_share)]:
+            system.unlock_locker(customer, locker_id, customer.pins[locker_id])
+    return location, now
+
+
+def scan_lockers(location, cutoff):
+    return [locker.locker_id for locker in location.lockers_by_id.values()
+            if locker.is_assigned and locker.assigned_at <= cutoff]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Assignment age queries: locker scan vs assignment table")
+    parser.add_argument("--customers", type=int, default=100_000)
+    parser.add_argument("--lockers", default="2000,20000,200000", help="comma separated lockers per size")
+    parser.add_argument("--picked", type=float, default=0.4, help="share of packages already picked up")
+    parser.add_argument("--seed", type=int, default=6)
+    args = parser.parse_args()
+
+    print(f"\n📊 Packages waiting > 48h, {args.customers:,} customers, {args.picked:.0%} already picked up")
+    print(f"{'lockers':>11}{'waiting':>9}{'scan ms':>10}{'table ms':>10}")
+    customers = [Customer(i) for i in range(args.customers)]
+    for lockers_per_size in (int(value) for value in args.lockers.split(",")):
+        rng = random.Random(args.seed)
+        location, now = fill(customers, lockers_per_size, args.picked, rng)
+        cutoff = now - 48 * HOUR
+
+        started = time.perf_counter()
+        scanned = scan_lockers(location, cutoff)
+        scan_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        indexed = location.assignments.waiting_longer_than(48 * HOUR, now)
+        table_ms = (time.perf_counter() - started) * 1000
+        if sorted(scanned) != sorted(record.locker_id for record in indexed):
+            raise SystemExit("❌ Assignment table disagrees with the locker scan")
+        print(f"{3 * lockers_per_size:>11,}{len(indexed):>9,}{scan_ms:>10.1f}{table_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import contextlib
+import os
+import random
+import time
+
+from amazon_locker import Customer, Location, PackageSize
+
+# Courier drop benchmark: each round a courier drops a batch of packages at a bank that is already partly
+# full, then some earlier packages are picked up. The same seeded drops are placed either one package at a
+# time in arrival order (as assign_locker does) or as one batch (as assign_batch does). Smallest-fitting placement fills the same
+# number of lockers either way; what differs is which packages are left over. Greedy strands LARGE packages
+# whose lockers went to earlier MEDIUM/SMALL ones, so we report stranded packages by size, the share of
+# package volume placed (S=1, M=2, L=3) and throughput.
+
+
+def make_drops(rounds, drop_size, weights, rng):
+    sizes = list(PackageSize)
+    return [rng.choices(sizes, weights, k=drop_size) for _ in range(rounds)]
+
+
+def run(drops, lockers, pickup_share, batch, seed):
+    small, medium, large = lockers
+    location = Location(small=small, medium=medium, large=large)
+    rng = random.Random(seed)
+    customer = Customer(1)
+    occupied = []
+    placed = dropped = volume_placed = volume_dropped = 0
+    stranded = dict.fromkeys(PackageSize, 0)
+    elapsed = 0.0
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for drop in drops:
+            started = time.perf_counter()
+            if batch:
+                lockers_given = location.allocate_batch(drop)  # what assign_batch does, minus PIN generation
+            else:
+                lockers_given = [location.allocate(package_size) for package_size in drop]
+            for locker in lockers_given:
+                if locker:
+                    locker.assign(customer, 1234)
+            elapsed += time.perf_counter() - started
+            for package_size, locker in zip(drop, lockers_given):
+                volume_dropped += package_size.value
+                if locker:
+                    placed += 1
+                    volume_placed += package_size.value
+                    occupied.append(locker)
+                else:
+                    stranded[package_size] += 1
+            dropped += len(drop)
+
+            # Pickups between drops
+            rng.shuffle(occupied)
+            for _ in range(int(len(occupied) * pickup_share)):
+                locker = occupied.pop()
+                locker.free()
+                location.release(locker)
+    return placed / dropped, stranded, volume_placed / volume_dropped, dropped / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Greedy vs batch assignment of courier drops")
+    parser.add_argument("--rounds", type=int, default=2000)
+    parser.add_argument("--drop", type=int, default=50, help="packages per courier drop")
+    parser.add_argument("--lockers", default="40,20,20", help="small,medium,large lockers in the bank")
+    parser.add_argument("--mix", default="30,45,25", help="small,medium,large package weights")
+    parser.add_argument("--pickup", type=float, default=0.6, help="share of occupied lockers emptied between drops")
+    parser.add_argument("--seed", type=int, default=9)
+    args = parser.parse_args()
+
+    lockers = [int(value) for value in args.lockers.split(",")]
+    weights = [float(value) for value in args.mix.split(",")]
+    drops = make_drops(args.rounds, args.drop, weights, random.Random(args.seed))
+    print(f"\n📊 {args.rounds:,} drops of {args.drop} packages, bank {args.lockers} (S,M,L), mix {args.mix}")
+    print(f"{'approach':>10}{'placed':>9}{'stranded S/M/L':>18}{'volume':>9}{'packages/s':>13}")
+    for name, batch in (("greedy", False), ("batch", True)):
+        placed, stranded, volume, rate = run(drops, lockers, args.pickup, batch, args.seed)
+        stranded_text = "/".join(f"{stranded[size]:,}" for size in PackageSize)
+        print(f"{name:>10}{placed:>9.1%}{stranded_text:>18}{volume:>9.1%}{rate:>13,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import contextlib
+import os
+import random
+import time
+
+from amazon_locker import Customer, Location, PackageSize, FALLBACK_SIZES
+
+# Locker allocation benchmark: a bank is filled to the target utilization, then each iteration one random
+# package is picked up and a new one of a random size is assigned. The free pools are compared against the
+# previous linear scan over every locker list (replicated below), and pickup by locker id through the
+# location's id index against the old walk over every bucket.
+
+
+def scan_for_locker(location, package_size):
+    """ The original find_available_locker: walk each allowed size's list for the first unassigned locker """
+    for size in FALLBACK_SIZES[package_size]:
+        for locker in location.lockers[size]:
+            if not locker.is_assigned:
+                return locker
+    return None
+
+
+def scan_for_id(location, locker_id):
+    """ The original unlock_locker lookup: walk every size bucket for a matching locker_id """
+    for lockers in location.lockers.values():
+        for locker in lockers:
+            if locker.locker_id == locker_id:
+                return locker
+    return None
+
+
+def lookup_latency(lockers_per_size, lookups, rng):
+    """ Mean seconds per pickup lookup, (scan, index) """
+    location = Location(small=lockers_per_size, medium=lockers_per_size, large=lockers_per_size)
+    ids = [rng.randint(1, 3 * lockers_per_size) for _ in range(lookups)]
+    started = time.perf_counter()
+    for locker_id in ids:
+        scan_for_id(location, locker_id)
+    scanned = time.perf_counter() - started
+    started = time.perf_counter()
+    for locker_id in ids:
+        location.get_locker(locker_id)
+    indexed = time.perf_counter() - started
+    return scanned / lookups, indexed / lookups
+
+
+def run(lockers_per_size, utilization, churn, use_pools, rng):
+    location = Location(small=lockers_per_size, medium=lockers_per_size, large=lockers_per_size)
+    customer = Customer(1)
+    assigned = []
+    sizes = list(PackageSize)
+
+    def arrive():
+        package_size = rng.choice(sizes)
+        started = time.perf_counter()
+        if use_pools:
+            locker = location.allocate(package_size)
+        else:
+            locker = scan_for_locker(location, package_size)
+        if locker is not None:
+            locker.assign(customer, 1234)
+        elapsed = time.perf_counter() - started
+        if locker is not None:
+            assigned.append(locker)
+        return elapsed
+
+    def leave():
+        index = rng.randrange(len(assigned))
+        assigned[index], assigned[-1] = assigned[-1], assigned[index]
+        locker = assigned.pop()
+        locker.free()
+        if use_pools:
+            location.release(locker)
+
+    assign_time = 0.0
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        target = int(3 * lockers_per_size * utilization)
+        while len(assigned) < target:
+            arrive()
+        for _ in range(churn):
+            leave()
+            assign_time += arrive()
+    return churn / assign_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Locker allocation benchmark at high utilization")
+    parser.add_argument("--sizes", default="100,1000,5000", help="comma separated lockers per size")
+    parser.add_argument("--utilization", type=float, default=0.95)
+    parser.add_argument("--churn", type=int, default=2000, help="pickup/assign pairs per bank size")
+    parser.add_argument("--seed", type=int, default=21)
+    args = parser.parse_args()
+
+    print(f"\n📊 Locker assignment at {args.utilization:.0%} utilization, {args.churn:,} pickup/assign pairs")
+    print(f"{'lockers':>9}{'scan ops/s':>14}{'pools ops/s':>14}{'speedup':>9}")
+    for per_size in (int(value) for value in args.sizes.split(",")):
+        scan_rate = run(per_size, args.utilization, args.churn, False, random.Random(args.seed))
+        pool_rate = run(per_size, args.utilization, args.churn, True, random.Random(args.seed))
+        print(f"{3 * per_size:>9,}{scan_rate:>14,.0f}{pool_rate:>14,.0f}{pool_rate / scan_rate:>8.1f}x")
+
+    print(f"\n📊 Pickup lookup by locker id ({args.churn:,} random ids)")
+    print(f"{'lockers':>9}{'scan µs':>14}{'index µs':>14}")
+    for per_size in (int(value) for value in args.sizes.split(",")):
+        scanned, indexed = lookup_latency(per_size, args.churn, random.Random(args.seed))
+        print(f"{3 * per_size:>9,}{scanned * 1e6:>14.2f}{indexed * 1e6:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import math
+import threading
+import time
+
+# Locker reservation expiry
+# Every assignment is scheduled once on a hashed timing wheel: a ring of slots, one per tick, where an entry
+# due more than one revolution ahead carries a count of remaining rounds. Advancing the clock only visits
+# the slots for the ticks that passed, so reclaiming expired lockers never scans Location.lockers, and a
+# pickup needs no cancellation: the stale entry is skipped because the locker's generation moved on.
+
+
+# Timing Wheel
+class TimingWheel:
+    def __init__(self, tick_seconds, slots, start):
+        self.tick_seconds = tick_seconds
+        self.slots = [[] for _ in range(slots)]
+        self.current_tick = math.floor(start / tick_seconds)
+
+    def schedule(self, deadline, item):
+        """ Fire `item` on the first tick at or after `deadline` (never early) """
+        tick = max(math.ceil(deadline / self.tick_seconds), self.current_tick + 1)
+        rounds = (tick - self.current_tick - 1) // len(self.slots)
+        self.slots[tick % len(self.slots)].append([rounds, item])
+
+    def advance(self, now):
+        """ Move to `now`; returns the items that came due, visiting one slot per elapsed tick """
+        target = math.floor(now / self.tick_seconds)
+        due = []
+        while self.current_tick < target:
+            self.current_tick += 1
+            index = self.current_tick % len(self.slots)
+            waiting = []
+            for entry in self.slots[index]:
+                if entry[0] == 0:
+                    due.append(entry[1])
+                else:
+                    entry[0] -= 1
+                    waiting.append(entry)
+            self.slots[index] = waiting
+        return due
+
+    def __len__(self):
+        return sum(len(slot) for slot in self.slots)
+
+
+# Locker Expiry (set on AmazonLockerSystem via set_expiry)
+class LockerExpiry:
+    def __init__(self, ttl_seconds=72 * 3600, tick_seconds=60, slots=512, clock=time.time, journal=None):
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.journal = journal  # locker_journal.LockerJournal recording each reclaim, if any
+        self.lock = threading.Lock()
+        self.wheel = TimingWheel(tick_seconds, slots, clock())
+        self.reclaimed = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def track(self, locker, generation, location, assigned_at=None):
+        """ Schedule the reclaim of this assignment ttl_seconds after assigned_at (default: now) """
+        start = self.clock() if assigned_at is None else assigned_at
+        with self.lock:
+            self.wheel.schedule(start + self.ttl_seconds, (locker, generation, location))
+
+    def reclaim_expired(self):
+        """ Free every locker whose package has outstayed the TTL; returns the reclaimed lockers """
+        with self.lock:
+            due = self.wheel.advance(self.clock())
+        reclaimed = []
+        for locker, generation, location in due:
+            if locker.reclaim(generation):  # notifies the customer; skipped if already picked up
+                if self.journal:
+                    self.journal.record_free(locker.locker_id, generation, expired=True)
+                location.release(locker)
+                reclaimed.append(locker)
+        self.reclaimed += len(reclaimed)
+        return reclaimed
+
+    def _run(self):
+        while not self._stop_event.wait(self.wheel.tick_seconds):
+            self.reclaim_expired()
+
+    def start(self):
+        """ Reclaim in the background once per tick """
+        if self._thread is None:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="locker-expiry", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+
+
+# Demonstration with a simulated clock
+if __name__ == "__main__":
+    import contextlib
+    import io
+    import random
+
+    from amazon_locker import AmazonLockerSystem, Customer, Location, PackageSize
+
+    now = [0.0]
+    clock = lambda: now[0]
+    expiry = LockerExpiry(ttl_seconds=72 * 3600, tick_seconds=60, clock=clock)
+    system = AmazonLockerSystem()
+    location = Location()
+    system.set_location(location)
+    system.set_clock(clock)  # assignments are stamped on the simulated clock the expiry runs on
+    system.set_expiry(expiry)
+
+    customer1, customer2 = Customer(1), Customer(2)
+    first = system.assign_locker(customer1, PackageSize.SMALL)
+    system.assign_locker(customer2, PackageSize.MEDIUM)
+    now[0] += 24 * 3600
+    system.assign_locker(customer2, PackageSize.LARGE)
+    system.unlock_locker(customer1, first.locker_id, customer1.pins[first.locker_id])  # collected in time
+
+    now[0] += 49 * 3600  # 73 h after the first two assignments
+    reclaimed = expiry.reclaim_expired()
+    print(f"♻️ Reclaimed lockers {[locker.locker_id for locker in reclaimed]}; "
+          f"Customer 2 still holds {sorted(system.lockers_of(customer2))}, "
+          f"waiting {[(now[0] - record.assigned_at) / 3600 for record in system.waiting_longer_than(0)]} h")
+
+    # Reclaim cost with many outstanding reservations: only the due slots are visited
+    rng = random.Random(4)
+    big = Location(small=20_000, medium=20_000, large=20_000)
+    system.set_location(big)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(50_000):
+            now[0] += rng.uniform(0, 10)
+            system.assign_locker(customer1, rng.choice(list(PackageSize)))
+        now[0] += 72 * 3600 - 3600  # 71 h after the last one: all but the newest hour of reservations is due
+        started = time.perf_counter()
+        reclaimed = expiry.reclaim_expired()
+        elapsed = time.perf_counter() - started
+    print(f"⏱️ Reclaimed {len(reclaimed):,} of 50,000 reservations in {elapsed * 1000:.1f} ms "
+          f"without scanning the {sum(len(lockers) for lockers in big.lockers.values()):,} lockers")
@@ -0,0 +1,356 @@
+import os
+import struct
+import threading
+import time
+
+from amazon_locker import Customer, Locker, Location
+from credentials import PinHash  # on sys.path via amazon_locker
+
+# Crash-consistent locker journal
+# Every assignment and every pickup/reclaim is appended to events.log as a fixed-width binary record. Every
+# `snapshot_every` events the state of all lockers becomes the new snapshots.bin and events.log starts over
+# empty, so neither file grows with the journal's age: a restarted kiosk controller reads one snapshot and
+# replays only the events since it.
+#
+# Both files are replaced, never rewritten in place: the new content goes to a temporary file, is fsynced,
+# and is renamed over the old one (then the directory is fsynced so the rename itself survives a crash).
+# The log is fsynced before a snapshot is taken, so a snapshot never covers events that are not on disk.
+# Each log starts with its sequence number and each snapshot names the log it was taken from and how many
+# of its records it covers, so a crash between replacing the snapshot and starting the next log is harmless.
+#
+# Records carry the locker's assignment generation, and replay keeps, per locker, the highest generation
+# seen: ASSIGN g applies only if g is newer, FREE g frees anything up to g. Concurrent kiosks may therefore
+# append in any order (a pickup can reach the log before its assignment) and replay still ends in the
+# same state.
+#
+# Group commit: with durable=True an assignment returns only once its record is fsynced, but one fsync
+# covers every record appended while the previous fsync was running, so concurrent kiosks share the cost.
+#
+# PINs are journaled as their salted keyed hashes only, so they verify after a restart only under the same
+# key. The journal is opened with the controller's PinHasher (built from the key in its configuration) and
+# keeps that key's fingerprint in key.id: reopening it under another key, such as the random one a process
+# gets when no key is configured, is refused instead of restoring PINs that can never match. Restored PINs
+# are checked with Locker.hasher, so the controller installs its PinHasher there before calling recover(),
+# which refuses to run under any other key.
+
+ASSIGN = 1
+PICKUP = 2
+EXPIRED = 3
+
+# log sequence number, at the start of events.log
+LOG_HEADER = struct.Struct("<Q")
+# event, locker id, customer id, generation, timestamp, PIN salt, PIN digest (zeros for PICKUP/EXPIRED)
+EVENT = struct.Struct("<BIIId16s32s")
+# timestamp, events covered since the journal began, log sequence, records of that log covered, number of lockers
+SNAPSHOT_HEADER = struct.Struct("<dQQQI")
+# locker id, generation, assigned, customer id, assigned at, PIN salt, PIN digest
+SNAPSHOT_ENTRY = struct.Struct("<IIBId16s32s")
+
+NO_SALT = bytes(16)
+NO_DIGEST = bytes(32)
+
+
+# Locker Journal (set on AmazonLockerSystem via set_journal)
+class LockerJournal:
+    def __init__(self, directory, hasher=None, snapshot_every=10_000, durable=True, clock=time.time):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.events_path = os.path.join(directory, "events.log")
+        self.snapshots_path = os.path.join(directory, "snapshots.bin")
+        self.hasher = hasher or Locker.hasher  # the PinHasher whose key hashed the journaled PINs
+        self._check_key(os.path.join(directory, "key.id"))
+        self.snapshot_every = snapshot_every
+        self.durable = durable
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.synced = threading.Condition(self.lock)
+
+        # locker id -> [generation, assigned, customer id, assigned at, salt, digest]
+        self.lockers, self.event_count, self.log_seq, self.logged = self._load()
+        self.events = open(self.events_path, "ab")
+        self.synced_count = self.event_count  # events known to be on disk
+        self.syncing = False
+
+    def _check_key(self, path):
+        key_id = self.hasher.key_id()
+        if not os.path.exists(path):
+            with open(path, "wb") as key_file:
+                key_file.write(key_id)
+                key_file.flush()
+                os.fsync(key_file.fileno())
+        else:
+            with open(path, "rb") as key_file:
+                if key_file.read() != key_id:
+                    raise ValueError(f"Locker journal in {os.path.dirname(path)} was written under another PIN key; "
+                                     "open it with the PinHasher built from the service key")
+
+    def _replace(self, path, data):
+        """ Atomically make `data` the content of `path`, durably """
+        with open(path + ".tmp", "wb") as temporary:
+            temporary.write(data)
+            temporary.flush()
+            os.fsync(temporary.fileno())
+        os.replace(path + ".tmp", path)
+        directory = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+    def _load(self):
+        """ The snapshot, then the log records it does not cover; returns (lockers, events, log sequence, log records) """
+        lockers, total, snapshot_seq, covered = {}, 0, 0, 0
+        snapshot = os.path.exists(self.snapshots_path)
+        if snapshot:
+            with open(self.snapshots_path, "rb") as snapshots:
+                _, total, snapshot_seq, covered, count = SNAPSHOT_HEADER.unpack(snapshots.read(SNAPSHOT_HEADER.size))
+                for locker_id, *state in SNAPSHOT_ENTRY.iter_unpack(snapshots.read(count * SNAPSHOT_ENTRY.size)):
+                    lockers[locker_id] = state
+            total -= covered  # events before the snapshot's log
+
+        if not os.path.exists(self.events_path):
+            self._replace(self.events_path, LOG_HEADER.pack(snapshot_seq + 1 if snapshot else 0))
+        with open(self.events_path, "r+b") as events:
+            log_seq, = LOG_HEADER.unpack(events.read(LOG_HEADER.size))
+            size = os.fstat(events.fileno()).st_size - LOG_HEADER.size
+            if size % EVENT.size:
+                events.truncate(LOG_HEADER.size + size - size % EVENT.size)  # a crash mid-write left a partial record
+            logged = size // EVENT.size
+            if log_seq == snapshot_seq:
+                replay_from = min(covered, logged)  # the crash came before this log was replaced
+            elif log_seq == snapshot_seq + 1 and snapshot:
+                total, replay_from = total + covered, 0
+            else:
+                raise ValueError(f"{self.events_path} (log {log_seq}) does not follow {self.snapshots_path} (log {snapshot_seq})")
+            events.seek(LOG_HEADER.size + replay_from * EVENT.size)
+            tail = events.read((logged - replay_from) * EVENT.size)
+        for record in EVENT.iter_unpack(tail):
+            self._apply(lockers, *record)
+        return lockers, total + logged, log_seq, logged
+
+    @staticmethod
+    def _apply(lockers, event, locker_id, customer_id, generation, timestamp, salt, digest):
+        state = lockers.setdefault(locker_id, [0, False, 0, 0.0, NO_SALT, NO_DIGEST])
+        if event == ASSIGN:
+            if generation > state[0]:
+                lockers[locker_id] = [generation, True, customer_id, timestamp, salt, digest]
+        elif generation >= state[0]:
+            lockers[locker_id] = [generation, False, 0, 0.0, NO_SALT, NO_DIGEST]
+
+    def record_assign(self, locker, generation):
+        with locker.lock:
+            if locker.generation != generation or not locker.is_assigned:
+                return  # already picked up or reclaimed; its FREE record alone leaves the right state
+            customer_id, assigned_at = locker.assigned_customer.customer_id, locker.assigned_at
+            pin_hash = locker.pin_hash
+        self._append(ASSIGN, locker.locker_id, customer_id, generation, assigned_at, pin_hash.salt, pin_hash.digest)
+
+    def record_free(self, locker_id, generation, expired=False):
+        self._append(EXPIRED if expired else PICKUP, locker_id, 0, generation, self.clock(), NO_SALT, NO_DIGEST)
+
+    def _append(self, *record):
+        with self.lock:
+            self.events.write(EVENT.pack(*record))
+            self.event_count += 1
+            self.logged += 1
+            self._apply(self.lockers, *record)
+            if self.event_count % self.snapshot_every == 0:
+                self._write_snapshot()
+            if self.durable:
+                self._wait_synced(self.event_count)
+
+    def _wait_synced(self, count):
+        # Caller holds self.lock. The first waiter becomes the leader: it flushes everything appended so far
+        # and fsyncs outside the lock, while later appends queue up for the next leader's fsync.
+        while self.synced_count < count:
+            if self.syncing:
+                self.synced.wait()
+                continue
+            self.syncing = True
+            self.events.flush()
+            target = self.event_count
+            self.lock.release()
+            try:
+                os.fsync(self.events.fileno())
+            finally:
+                self.lock.acquire()
+                self.syncing = False
+            self.synced_count = max(self.synced_count, target)
+            self.synced.notify_all()
+
+    def _write_snapshot(self):
+        # Caller holds self.lock. The log is made durable first, so the snapshot never covers events that are
+        # not on disk; once the snapshot is in place the log starts over empty.
+        while self.syncing:
+            self.synced.wait()  # a group-commit leader is fsyncing the current log outside the lock
+        self.events.flush()
+        os.fsync(self.events.fileno())
+        self.synced_count = self.event_count
+        parts = [SNAPSHOT_HEADER.pack(self.clock(), self.event_count, self.log_seq, self.logged, len(self.lockers))]
+        parts.extend(SNAPSHOT_ENTRY.pack(locker_id, *state) for locker_id, state in self.lockers.items())
+        self._replace(self.snapshots_path, b"".join(parts))
+        self.events.close()
+        self._replace(self.events_path, LOG_HEADER.pack(self.log_seq + 1))
+        self.log_seq, self.logged = self.log_seq + 1, 0
+        self.events = open(self.events_path, "ab")
+
+    def close(self):
+        with self.lock:
+            while self.syncing:
+                self.synced.wait()
+            self.events.flush()
+            os.fsync(self.events.fileno())
+            self.synced_count = self.event_count
+        self.events.close()
+
+    def recover(self, lockers, customers=None, expiry=None):
+        """ Put freshly built lockers back into the journaled state; returns {customer id: Customer}.
+        `lockers` is the Location of a single site, or the desk (AmazonLockerSystem, LockerNetwork) whose
+        locations were journaled. Every journaled locker is looked up before any is touched, so a journal that
+        does not fit the lockers raises ValueError and leaves them as they were.
+        Pass the customers still connected to keep their objects (they hold the PINs); others are recreated
+        by id, and the assignment table tells which lockers are theirs. Pass the LockerExpiry to re-arm
+        reclaims from the original assignment times. """
+        if Locker.hasher.key_id() != self.hasher.key_id():
+            raise ValueError("Locker.hasher is not the journal's PinHasher; install the PinHasher built from the "
+                             "service key as Locker.hasher before recovering, or restored PINs can never match")
+        if isinstance(lockers, Location):
+            location_of = lambda locker_id: lockers if lockers.get_locker(locker_id) else None
+        else:
+            location_of = lockers.location_of
+        with self.lock:
+            current = {locker_id: list(state) for locker_id, state in self.lockers.items()}
+
+        restored, locations = [], {}
+        for locker_id, state in current.items():
+            location = location_of(locker_id)
+            if location is None:
+                raise ValueError(f"Journal mentions locker {locker_id}, which these locations do not have")
+            restored.append((location, location.get_locker(locker_id), state))
+            locations[id(location)] = location
+
+        customers = dict(customers or {})
+        # Oldest first, so the assignment table gets its time index in order
+        restored.sort(key=lambda entry: entry[2][3])
+        for location, locker, (generation, assigned, customer_id, assigned_at, salt, digest) in restored:
+            with locker.lock:
+                locker.generation = generation
+                if not assigned:
+                    continue
+                customer = customers.get(customer_id)
+                if customer is None:
+                    customer = customers[customer_id] = Customer(customer_id)
+                locker.is_assigned = True
+                locker.pin_hash = PinHash(salt, digest)
+                locker.assigned_customer = customer
+                locker.assigned_at = assigned_at
+            location.assignments.add(locker, generation)
+            if expiry:
+                expiry.track(locker, generation, location, assigned_at)
+        for location in locations.values():
+            location.rebuild_pools()
+        return customers
+
+
+# Demonstration: record, "crash", recover in a new process; then assignment throughput with and without group commit
+if __name__ == "__main__":
+    import contextlib
+    import json
+    import random
+    import secrets
+    import subprocess
+    import sys
+    import tempfile
+
+    from amazon_locker import AmazonLockerSystem, PackageSize
+    from credentials import PinHasher
+
+    if len(sys.argv) == 3 and sys.argv[1] == "--recover":
+        # The restarted controller: a fresh process with only the journal, the key from its configuration
+        # and the PINs the customers kept on their phones
+        directory = sys.argv[2]
+        try:
+            LockerJournal(directory, durable=False)  # no key configured: this process's random one
+        except ValueError:
+            print("🔐 Opened without the service key: refused, no PIN hashes restored")
+        started = time.perf_counter()
+        hasher = PinHasher(bytes.fromhex(os.environ["LOCKER_PIN_KEY"]))
+        journal = LockerJournal(directory, hasher, snapshot_every=5000, durable=False)
+        Locker.hasher = hasher  # every locker in this process checks PINs under the service key
+        location = Location(small=2000, medium=2000, large=1000)
+        customers = journal.recover(location)
+        elapsed = time.perf_counter() - started
+        system = AmazonLockerSystem()
+        system.set_location(location)
+        system.set_journal(journal)
+        with open(os.path.join(directory, "pins.json")) as pins_file:
+            held = json.load(pins_file)  # [customer id, locker id, PIN]
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            opened = sum(bool(system.unlock_locker(customers[customer_id], locker_id, pin))
+                         for customer_id, locker_id, pin in held)
+        free = sum(location.free_count(size) for size in PackageSize)
+        print(f"♻️ Recovered in {elapsed * 1000:.1f} ms in a new process; {opened:,} of {len(held):,} waiting "
+              f"packages picked up with their original PINs, {free:,} of 5,000 lockers free afterwards")
+        journal.close()
+        raise SystemExit(0)
+
+    key = secrets.token_bytes(32)  # stands in for the key in the controller's configuration
+    Locker.hasher = PinHasher(key)
+    directory = tempfile.mkdtemp(prefix="locker-journal-")
+    system = AmazonLockerSystem()
+    system.set_location(Location(small=2000, medium=2000, large=1000))
+    journal = LockerJournal(directory, Locker.hasher, snapshot_every=5000, durable=False)
+    system.set_journal(journal)
+    customers = {i: Customer(i) for i in range(200)}
+    rng = random.Random(8)
+    held = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(60_000):
+            if held and rng.random() < 0.45:
+                customer, locker_id = held.pop(rng.randrange(len(held)))
+                system.unlock_locker(customer, locker_id, customer.pins[locker_id])
+            else:
+                customer = customers[rng.randrange(len(customers))]
+                locker = system.assign_locker(customer, rng.choice(list(PackageSize)))
+                if locker:
+                    held.append((customer, locker.locker_id))
+    journal.close()
+    sizes = [os.path.getsize(os.path.join(directory, name)) / 1024 for name in ("snapshots.bin", "events.log")]
+    print(f"📒 Journaled {journal.event_count:,} events, {len(held):,} packages waiting; on disk: "
+          f"snapshot {sizes[0]:,.0f} KB, log {sizes[1]:,.0f} KB since it")
+
+    # Restart: a new controller process rebuilds its bank from the journal
+    with open(os.path.join(directory, "pins.json"), "w") as pins_file:
+        json.dump([(customer.customer_id, locker_id, customer.pins[locker_id]) for customer, locker_id in held], pins_file)
+    subprocess.run([sys.executable, os.path.abspath(__file__), "--recover", directory],
+                   env={**os.environ, "LOCKER_PIN_KEY": key.hex()}, check=True)
+
+    # Durable assignment throughput: fsync per record vs group commit across concurrent kiosks
+    def kiosks(journal, threads, assignments):
+        system.set_location(Location(small=threads * assignments, medium=0, large=0))
+        system.set_journal(journal)
+        workers = [threading.Thread(target=lambda customer: [system.assign_locker(customer, PackageSize.SMALL)
+                                                             for _ in range(assignments)], args=(Customer(t),))
+                   for t in range(threads)]
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            started = time.perf_counter()
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            elapsed = time.perf_counter() - started
+        journal.close()
+        return threads * assignments / elapsed
+
+    class FsyncEachRecord(LockerJournal):
+        def _wait_synced(self, count):
+            self.events.flush()
+            os.fsync(self.events.fileno())
+            self.synced_count = count
+
+    print(f"{'kiosks':>8}{'fsync each/s':>15}{'group commit/s':>17}")
+    for threads in (1, 8, 32):
+        each = kiosks(FsyncEachRecord(tempfile.mkdtemp(prefix="locker-journal-")), threads, 4000 // threads)
+        grouped = kiosks(LockerJournal(tempfile.mkdtemp(prefix="locker-journal-")), threads, 4000 // threads)
+        print(f"{threads:>8}{each:>15,.0f}{grouped:>17,.0f}")
+    system.set_journal(None)
@@ -0,0 +1,280 @@
+import math
+import random
+import threading
+import time
+
+from amazon_locker import AssignmentTable, Customer, LockerDesk, Location, PackageSize, FALLBACK_SIZES
+
+# Locker Network
+# Many locker sites behind one routing layer. Each site is a Location placed at (x, y); the network listens
+# to every Location's free counters and marks, per package size, which sites can still take that package
+# (a free locker of the size or any bigger fallback size) in a k-d tree over the sites. "Nearest site for a
+# MEDIUM package" then walks a few tree nodes instead of scanning every site.
+# Locker ids are unique across the network, so a pickup needs only the locker id and PIN, and one assignment
+# table shared by every site answers which lockers a customer holds anywhere in the network.
+# Handing lockers out and back goes through LockerDesk, as on a single-site AmazonLockerSystem: set_journal,
+# set_clock, set_expiry and set_forecaster work the same way (every site, also those added later, is forecast).
+
+
+# Site Tree (k-d tree over all sites; per package size, each subtree counts the sites that can take it)
+# Sites never move, so the tree is built once (and again only after new sites are added). A site filling up
+# or freeing a locker just adjusts the counts on its path to the root, and searches skip subtrees whose
+# count is zero, so a drained neighbourhood costs no more to route around than a busy one.
+class SiteTree:
+    def __init__(self):
+        self.points = []  # site index -> (x, y)
+        self.site_ids = []  # site index -> site id
+        self.open = {package_size: [] for package_size in PackageSize}  # size -> [site index can take it]
+        self.dirty = True
+
+    def add(self, site_id, x, y):
+        self.points.append((x, y))
+        self.site_ids.append(site_id)
+        for flags in self.open.values():
+            flags.append(False)
+        self.dirty = True
+        return len(self.points) - 1
+
+    def _build(self):
+        count = len(self.points)
+        self.node_of_site = [0] * count
+        self.node_site, self.node_axis, self.left, self.right, self.parent = [], [], [], [], []
+
+        def build(indexes, depth, parent):
+            if not indexes:
+                return -1
+            axis = depth % 2
+            indexes.sort(key=lambda index: self.points[index][axis])
+            middle = len(indexes) // 2
+            node = len(self.node_site)
+            self.node_site.append(indexes[middle])
+            self.node_axis.append(axis)
+            self.left.append(-1)
+            self.right.append(-1)
+            self.parent.append(parent)
+            self.node_of_site[indexes[middle]] = node
+            self.left[node] = build(indexes[:middle], depth + 1, node)
+            self.right[node] = build(indexes[middle + 1:], depth + 1, node)
+            return node
+
+        self.root = build(list(range(count)), 0, -1)
+        # Children are always numbered after their parent, so reverse sweeps aggregate subtrees bottom-up:
+        # a bounding box per subtree (for pruning) and, per package size, how many of its sites are open
+        self.box = [(x, x, y, y) for x, y in (self.points[site] for site in self.node_site)]
+        for node in range(len(self.box) - 1, 0, -1):
+            parent = self.parent[node]
+            min_x, max_x, min_y, max_y = self.box[node]
+            p_min_x, p_max_x, p_min_y, p_max_y = self.box[parent]
+            self.box[parent] = (min(min_x, p_min_x), max(max_x, p_max_x), min(min_y, p_min_y), max(max_y, p_max_y))
+        self.alive = {}
+        for package_size, flags in self.open.items():
+            alive = [int(flags[site]) for site in self.node_site]
+            for node in range(len(alive) - 1, 0, -1):
+                alive[self.parent[node]] += alive[node]
+            self.alive[package_size] = alive
+        self.dirty = False
+
+    def set_open(self, package_size, site_index, is_open):
+        flags = self.open[package_size]
+        if flags[site_index] == is_open:
+            return
+        flags[site_index] = is_open
+        if self.dirty:
+            return  # counts are recomputed on the next build
+        delta = 1 if is_open else -1
+        alive, parent = self.alive[package_size], self.parent
+        node = self.node_of_site[site_index]
+        while node != -1:
+            alive[node] += delta
+            node = parent[node]
+
+    def nearest(self, package_size, x, y, exclude=()):
+        """ Closest open site: depth-first, near side first, pruning empty subtrees and ones too far away """
+        if self.dirty:
+            self._build()
+        if not self.points or not self.alive[package_size][self.root]:
+            return None
+        alive, flags, points, box = self.alive[package_size], self.open[package_size], self.points, self.box
+        node_site, node_axis, left, right = self.node_site, self.node_axis, self.left, self.right
+        query = (x, y)
+        best_site, best_distance = None, math.inf  # squared distances throughout
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node == -1 or not alive[node]:
+                continue
+            min_x, max_x, min_y, max_y = box[node]
+            dx = min_x - x if x < min_x else (x - max_x if x > max_x else 0.0)
+            dy = min_y - y if y < min_y else (y - max_y if y > max_y else 0.0)
+            if dx * dx + dy * dy >= best_distance:
+                continue  # nothing in this subtree can beat the current best
+            site = node_site[node]
+            sx, sy = points[site]
+            if flags[site] and self.site_ids[site] not in exclude:
+                distance = (sx - x) ** 2 + (sy - y) ** 2
+                if distance < best_distance:
+                    best_site, best_distance = self.site_ids[site], distance
+            axis = node_axis[node]
+            if query[axis] < points[site][axis]:
+                stack.append(right[node])
+                stack.append(left[node])  # near side popped first
+            else:
+                stack.append(left[node])
+                stack.append(right[node])
+        return best_site
+
+
+# Locker Network (listens to every site's Location)
+class LockerNetwork(LockerDesk):
+    def __init__(self, clock=time.time):
+        self.lock = threading.Lock()
+        self.tree = SiteTree()
+        self.sites = {}  # site_id -> Location
+        self.site_index = {}  # site_id -> position in the tree
+        self.free = {}  # site_id -> {PackageSize: free lockers}
+        self.site_of_location = {}  # id(location) -> site_id, for listener callbacks
+        self.site_of_locker = {}  # locker_id -> site_id
+        self.next_locker_id = 1
+        self.assignments = AssignmentTable()  # every site's packages, keyed by network-wide locker id
+        self._init_desk(clock)  # PIN limiter per locker id, across the whole network
+
+    def add_site(self, site_id, x, y, small=20, medium=20, large=20):
+        """ Build a site whose locker ids continue the network-wide numbering """
+        sizes = [PackageSize.SMALL] * small + [PackageSize.MEDIUM] * medium + [PackageSize.LARGE] * large
+        with self.lock:  # sites added concurrently get disjoint id ranges
+            first_id = self.next_locker_id
+            self.next_locker_id += len(sizes)
+        layout = list(enumerate(sizes, start=first_id))
+        location = Location(layout=layout, assignments=self.assignments)
+        with self.lock:
+            self.sites[site_id] = location
+            self.site_index[site_id] = self.tree.add(site_id, x, y)
+            self.free[site_id] = dict.fromkeys(PackageSize, 0)
+            self.site_of_location[id(location)] = site_id
+            self.site_of_locker.update((locker_id, site_id) for locker_id, _ in layout)
+            for size in PackageSize:
+                self._set_free(site_id, size, location.free_count(size))
+        location.add_listener(self)
+        if self.forecaster:
+            self.forecaster.add_site(location)
+        return location
+
+    def _locations(self):
+        with self.lock:
+            return list(self.sites.values())
+
+    def location_of(self, locker_id):
+        site_id = self.site_of_locker.get(locker_id)
+        return self.sites[site_id] if site_id is not None else None
+
+    # Listener callback: keep the counters and tree in step with every Location
+    def on_free_count(self, location, size, free):
+        with self.lock:
+            self._set_free(self.site_of_location[id(location)], size, free)
+
+    def _set_free(self, site_id, size, free):
+        # Caller holds self.lock; the tree only changes when a package size gains or loses its last fitting locker
+        counts = self.free[site_id]
+        counts[size] = free
+        for package_size in PackageSize:
+            self.tree.set_open(package_size, self.site_index[site_id], self._fits(site_id, package_size))
+
+    def _fits(self, site_id, package_size):
+        counts, location = self.free[site_id], self.sites[site_id]
+        return any(counts[size] > location.held_back(size, package_size) for size in FALLBACK_SIZES[package_size])
+
+    def nearest_site(self, package_size, x, y, exclude=()):
+        with self.lock:
+            return self.tree.nearest(package_size, x, y, exclude)
+
+    def assign_nearest(self, customer, package_size, x, y):
+        """ Assign a locker at the closest site that can take the package; returns (site_id, locker) or None """
+        tried = set()
+        while True:
+            site_id = self.nearest_site(package_size, x, y, exclude=tried)
+            if site_id is None:
+                print(f"❌ No site can take a {package_size.name} package for Customer {customer.customer_id}.")
+                return None
+            location = self.sites[site_id]
+            if self.forecaster and not tried:
+                self.forecaster.record(location, package_size)  # demand counts once, at the site it was routed to
+            locker = location.allocate(package_size)
+            if locker is None:
+                tried.add(site_id)  # another caller took the last fitting locker first
+            elif self._issue_pin(location, locker, customer):
+                return site_id, locker
+            # else the locker was taken behind the pool's back; try the site's next one
+
+    def lockers_of(self, customer):
+        """ Ids of the lockers holding this customer's packages, at any site """
+        return self.assignments.lockers_of(customer.customer_id)
+
+    def unlock_locker(self, customer, locker_id, pin):
+        if not self.pin_limiter.allow(locker_id):
+            print(f"🚫 Customer {customer.customer_id}: Too many attempts on Locker {locker_id}. Try again later.")
+            return False
+        location = self.location_of(locker_id)
+        locker = location.get_locker(locker_id) if location else None
+        if locker and self._hand_over(location, locker, pin):
+            site_id = self.site_of_locker[locker_id]
+            print(f"🔓 Customer {customer.customer_id}: Locker {locker_id} at {site_id} Unlocked Successfully! Package Retrieved.")
+            return True
+        print(f"❌ Customer {customer.customer_id}: Invalid Locker ID or Incorrect PIN.")
+        return False
+
+
+# Demonstration of capacity-aware routing
+if __name__ == "__main__":
+    import contextlib
+    import io
+
+    network = LockerNetwork()
+    network.add_site("Downtown", 0.5, 0.5, small=1, medium=1, large=1)
+    network.add_site("Airport", 9.0, 9.0)
+    network.add_site("Mall", 3.0, 1.0, small=0, medium=2, large=0)
+
+    customer = Customer(1)
+    # Downtown takes the first LARGE; the second goes to the next closest site that still has a large locker
+    assigned = []
+    for package_size in (PackageSize.LARGE, PackageSize.LARGE, PackageSize.MEDIUM, PackageSize.MEDIUM):
+        site_id, locker = network.assign_nearest(customer, package_size, 0, 0)
+        assigned.append(locker.locker_id)
+        print(f"📍 {package_size.name} package → {site_id}, locker {locker.locker_id}")
+    network.unlock_locker(customer, assigned[0], customer.pins[assigned[0]])  # Downtown's large locker
+    print(f"📦 Nearest site for a LARGE package after pickup: {network.nearest_site(PackageSize.LARGE, 0, 0)}; "
+          f"Customer 1 still holds lockers {network.lockers_of(customer)}")
+
+    # Journal and expiry hook into the network exactly as into a single-site system
+    import tempfile
+    from locker_expiry import LockerExpiry
+    from locker_journal import LockerJournal
+
+    now = [time.time()]
+    clock = lambda: now[0]
+    journal = LockerJournal(tempfile.mkdtemp(prefix="locker-network-"), durable=False)
+    expiry = LockerExpiry(ttl_seconds=3600, clock=clock, journal=journal)
+    network.set_clock(clock)
+    network.set_journal(journal)
+    network.set_expiry(expiry)
+    site_id, locker = network.assign_nearest(customer, PackageSize.SMALL, 9, 9)
+    now[0] += 2 * 3600
+    reclaimed = [locker.locker_id for locker in expiry.reclaim_expired()]
+    print(f"📒 {site_id}: reclaimed {reclaimed} after the TTL; journal holds {journal.event_count} events")
+    journal.close()
+    network.set_journal(None)
+    network.set_expiry(None)
+
+    # Routing latency over thousands of sites
+    rng = random.Random(3)
+    big = LockerNetwork()
+    for i in range(5000):
+        big.add_site(f"SITE{i}", rng.uniform(0, 500), rng.uniform(0, 500), small=4, medium=4, large=2)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(40_000):  # 80% full, with the south-west corner drained first
+            big.assign_nearest(customer, rng.choice(list(PackageSize)), rng.uniform(0, 300), rng.uniform(0, 300))
+    queries = [(rng.choice(list(PackageSize)), rng.uniform(0, 500), rng.uniform(0, 500)) for _ in range(20_000)]
+    started = time.perf_counter()
+    for package_size, x, y in queries:
+        big.nearest_site(package_size, x, y)
+    elapsed = time.perf_counter() - started
+    print(f"⚡ {len(queries):,} routing queries over {len(big.sites):,} sites: {elapsed / len(queries) * 1e6:.1f} µs each")
@@ -0,0 +1,239 @@
+import argparse
+import contextlib
+import os
+import random
+import tempfile
+import threading
+import time
+
+from amazon_locker import AmazonLockerSystem, Customer, Locker, Location, PackageSize
+from credentials import PinHasher
+from locker_forecast import DemandForecaster
+from locker_journal import LockerJournal
+from locker_network import LockerNetwork
+
+# Multi-threaded stress test for kiosks and courier devices sharing one locker bank.
+# Churn: every thread keeps assigning packages and picking up its own, with a handful of customers shared
+# between threads. A ledger of locker -> owner (updated under its own lock) flags any locker handed out twice.
+# Race: all threads then try to pick up the same packages at once; each must be released exactly once.
+# After each round the bank is drained and the free pools are checked for lost or duplicated lockers.
+# Finally a fresh forecaster is attached to a system and to a network: orders must still go through and count.
+
+
+class AssignmentLedger:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.holders = {}  # locker_id -> thread id
+        self.violations = []
+
+    def claim(self, locker_id, holder):
+        with self.lock:
+            if locker_id in self.holders:
+                self.violations.append(f"locker {locker_id} given to {holder} while held by {self.holders[locker_id]}")
+            self.holders[locker_id] = holder
+
+    def release(self, locker_id):
+        with self.lock:
+            self.holders.pop(locker_id, None)
+
+
+def kiosk(thread_id, system, customers, ledger, operations, seed):
+    rng = random.Random(seed + thread_id)
+    held = []  # (locker_id, pin, customer)
+    sizes = list(PackageSize)
+    for i in range(operations):
+        if held and (rng.random() < 0.5 or i == operations - 1):
+            locker_id, pin, customer = held.pop(rng.randrange(len(held)))
+            ledger.release(locker_id)  # before the locker can be handed out again
+            if not system.unlock_locker(customer, locker_id, pin):
+                ledger.violations.append(f"thread {thread_id} could not pick up its own locker {locker_id}")
+            if system.unlock_locker(customer, locker_id, pin):
+                ledger.violations.append(f"locker {locker_id} opened twice with the same PIN")
+        else:
+            customer = customers[rng.randrange(len(customers))]
+            locker = system.assign_locker(customer, rng.choice(sizes))
+            if locker:
+                ledger.claim(locker.locker_id, thread_id)
+                held.append((locker.locker_id, customer.pins[locker.locker_id], customer))
+    for locker_id, pin, customer in held:
+        ledger.release(locker_id)
+        system.unlock_locker(customer, locker_id, pin)
+
+
+def race_pickups(system, location, customer, threads):
+    """ Fill the bank, then every thread tries every pickup; returns lockers not opened exactly once """
+    assigned = []
+    for size in PackageSize:
+        while True:
+            locker = system.assign_locker(customer, size)
+            if not locker:
+                break
+            assigned.append((locker.locker_id, customer.pins[locker.locker_id]))
+    opened = {locker_id: 0 for locker_id, _ in assigned}
+    count_lock = threading.Lock()
+
+    def attempt(order_seed):
+        order = list(assigned)
+        random.Random(order_seed).shuffle(order)
+        for locker_id, pin in order:
+            if system.unlock_locker(customer, locker_id, pin):
+                with count_lock:
+                    opened[locker_id] += 1
+
+    workers = [threading.Thread(target=attempt, args=(t,)) for t in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return [f"locker {locker_id} opened {count} times" for locker_id, count in opened.items() if count != 1]
+
+
+def check_bank(location):
+    """ After draining, every locker must be free exactly once in its pool and the assignment table must be empty """
+    problems = []
+    for size, lockers in location.lockers.items():
+        pooled = sorted(locker_id for locker_id, _ in location.free_lockers[size])
+        expected = sorted(locker.locker_id for locker in lockers)
+        if pooled != expected:
+            problems.append(f"{size.name} pool holds {len(pooled)} entries for {len(expected)} lockers")
+        problems.extend(f"locker {locker.locker_id} still assigned" for locker in lockers if locker.is_assigned)
+    if len(location.assignments):
+        problems.append(f"assignment table still indexes {len(location.assignments)} lockers")
+    return problems
+
+
+def check_forecaster(system):
+    """ Orders placed right after attaching a fresh forecaster (single, batched, routed) must succeed and count """
+    problems = []
+    previous = system.locker_location
+    network = LockerNetwork()
+    network.add_site("Before", 0, 0, small=2, medium=2, large=2)
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            system.set_location(Location(small=2, medium=2, large=2))
+            forecaster = DemandForecaster()
+            system.set_forecaster(forecaster)
+            system.set_forecaster(forecaster)  # attaching twice must not add the location twice
+            system.assign_locker(Customer(1), PackageSize.SMALL)
+            system.assign_batch([(Customer(2), PackageSize.LARGE)] * 2)
+            if len(forecaster.sites) != 1 or sum(forecaster.counts) != 3:
+                problems.append(f"forecaster holds {len(forecaster.sites)} sites and {sum(forecaster.counts):.0f} "
+                                f"orders, expected 1 and 3")
+
+            routed = DemandForecaster()
+            network.set_forecaster(routed)
+            network.add_site("After", 5, 5, small=2, medium=2, large=2)  # added once the forecaster is attached
+            network.assign_nearest(Customer(3), PackageSize.MEDIUM, 0, 0)
+            network.assign_nearest(Customer(3), PackageSize.MEDIUM, 5, 5)
+            if len(routed.sites) != 2 or sum(routed.counts) != 2:
+                problems.append(f"network forecaster holds {len(routed.sites)} sites and {sum(routed.counts):.0f} "
+                                f"orders, expected 2 and 2")
+    except Exception as error:
+        problems.append(f"order failed with a forecaster attached: {error!r}")
+    finally:
+        system.set_forecaster(None)
+        system.set_location(previous)
+    return problems
+
+
+def check_network_recovery():
+    """ A network's journal restores every site; a journal that does not fit, or another PIN key, is refused
+    before any locker is touched """
+    def build(site_ids):
+        network = LockerNetwork()
+        for index, site_id in enumerate(site_ids):
+            network.add_site(site_id, index, 0, small=3, medium=3, large=3)
+        return network
+
+    problems = []
+    directory = tempfile.mkdtemp(prefix="locker-stress-")
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        network = build(["North", "South"])
+        network.set_journal(LockerJournal(directory, snapshot_every=4, durable=False))  # recovery crosses a compaction
+        customer = Customer(1)
+        held = [network.assign_nearest(customer, package_size, x, 0)[1].locker_id
+                for x in (0, 1) for package_size in (PackageSize.SMALL, PackageSize.LARGE, PackageSize.LARGE)]
+        picked = held.pop(0)
+        network.unlock_locker(customer, picked, customer.pins[picked])
+        network.journal.close()
+
+        short = build(["North"])  # the South site is missing
+        try:
+            LockerJournal(directory, durable=False).recover(short)
+            problems.append("recovery into a network without the South site was accepted")
+        except ValueError:
+            touched = [locker.locker_id for location in short.sites.values() for lockers in location.lockers.values()
+                       for locker in lockers if locker.generation or locker.is_assigned]
+            if touched or len(short.assignments):
+                problems.append(f"refused recovery still changed lockers {touched}")
+
+        restarted = build(["North", "South"])
+        service_hasher = Locker.hasher
+        Locker.hasher = PinHasher()  # a process that has not installed the service key
+        try:
+            LockerJournal(directory, service_hasher, durable=False).recover(restarted)
+            problems.append("recovery under another PIN key was accepted")
+        except ValueError:
+            pass
+        finally:
+            Locker.hasher = service_hasher
+
+        journal = LockerJournal(directory, durable=False)
+        journal.recover(restarted, customers={1: customer})
+        if sorted(restarted.lockers_of(customer)) != sorted(held):
+            problems.append(f"recovered network holds {sorted(restarted.lockers_of(customer))}, expected {sorted(held)}")
+        opened = [locker_id for locker_id in held if restarted.unlock_locker(customer, locker_id, customer.pins[locker_id])]
+        if opened != held:
+            problems.append(f"only lockers {opened} of {held} opened with their PINs after recovery")
+        journal.close()
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent locker assignment and pickup stress test")
+    parser.add_argument("--lockers", type=int, default=50, help="lockers per size")
+    parser.add_argument("--threads", default="1,2,4,8,16,32")
+    parser.add_argument("--operations", type=int, default=3000, help="operations per thread")
+    parser.add_argument("--customers", type=int, default=8, help="customers shared by all threads")
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    system = AmazonLockerSystem()
+    location = Location(small=args.lockers, medium=args.lockers, large=args.lockers)
+    system.set_location(location)
+    customers = [Customer(i) for i in range(args.customers)]
+    failed = False
+    print(f"\n📊 Locker stress test: {3 * args.lockers} lockers, {args.operations:,} operations per thread")
+    print(f"{'threads':>8}{'ops/s':>12}{'violations':>12}")
+    for thread_count in (int(value) for value in args.threads.split(",")):
+        ledger = AssignmentLedger()
+        threads = [threading.Thread(target=kiosk, args=(t, system, customers, ledger, args.operations, args.seed))
+                   for t in range(thread_count)]
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+            problems = ledger.violations + check_bank(location)
+            problems += race_pickups(system, location, customers[0], thread_count) + check_bank(location)
+        print(f"{thread_count:>8}{thread_count * args.operations / elapsed:>12,.0f}{len(problems):>12}")
+        for problem in problems[:5]:
+            print(f"   ❌ {problem}")
+        failed = failed or bool(problems)
+
+    problems = check_forecaster(system)
+    print(f"🔭 Orders with a freshly attached forecaster: {'ok' if not problems else problems[0]}")
+    failed = failed or bool(problems)
+    problems = check_network_recovery()
+    print(f"♻️ Network recovered from its journal: {'ok' if not problems else problems[0]}")
+    failed = failed or bool(problems)
+
+    print("❌ Locker double-assignment, pool corruption or a failed order detected" if failed
+          else "✅ No locker was ever assigned twice")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import contextlib
+import hashlib
+import os
+import secrets
+import sys
+import time
+
+from credentials import PinHasher, RateLimiter, generate_pin
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Amazon Locker"))
+from amazon_locker import AmazonLockerSystem, Customer, Location, PackageSize
+
+# PIN verification benchmark.
+# 1. Cost of one check: the old plaintext ==, the keyed salted hash used now, and PBKDF2 for reference
+#    (what a password-style hash would cost every honest pickup).
+# 2. A brute-force run against locker pickups: an attacker cycles through every 4-digit PIN on a set of
+#    assigned lockers. Without the limiter every guess reaches the locker; with it, each locker allows a
+#    handful of guesses and the rest are turned away by one dictionary lookup.
+
+
+def per_second(check, pins):
+    started = time.perf_counter()
+    for pin in pins:
+        check(pin)
+    return len(pins) / (time.perf_counter() - started)
+
+
+def verification_rates(checks, pbkdf2_iterations):
+    pins = [generate_pin() for _ in range(checks)]
+    stored_pin = generate_pin()
+    hasher = PinHasher()
+    stored_hash = hasher.hash(stored_pin)
+    salt = secrets.token_bytes(16)
+    stored_pbkdf2 = hashlib.pbkdf2_hmac("sha256", str(stored_pin).encode(), salt, pbkdf2_iterations)
+    return [
+        ("plaintext ==", per_second(lambda pin: pin == stored_pin, pins)),
+        ("hmac-sha256", per_second(lambda pin: hasher.verify(stored_hash, pin), pins)),
+        (f"pbkdf2 x{pbkdf2_iterations:,}", per_second(
+            lambda pin: hashlib.pbkdf2_hmac("sha256", str(pin).encode(), salt, pbkdf2_iterations) == stored_pbkdf2,
+            pins[:max(1, checks // 1000)])),
+    ]
+
+
+def brute_force(lockers, limited):
+    """ Try every PIN on each locker; returns (attempts/s, lockers opened by the attacker) """
+    system = AmazonLockerSystem()
+    system.set_location(Location(small=lockers, medium=0, large=0))
+    system.pin_limiter = RateLimiter() if limited else RateLimiter(capacity=float("inf"))
+    owner, attacker = Customer(1), Customer(666)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        targets = [system.assign_locker(owner, PackageSize.SMALL).locker_id for _ in range(lockers)]
+        attempts = opened = 0
+        started = time.perf_counter()
+        for locker_id in targets:
+            for guess in range(1000, 10000):
+                attempts += 1
+                if system.unlock_locker(attacker, locker_id, guess):
+                    opened += 1
+                    break
+        elapsed = time.perf_counter() - started
+    return attempts / elapsed, opened
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PIN verification and brute-force throttling benchmark")
+    parser.add_argument("--checks", type=int, default=200_000, help="PIN checks per method")
+    parser.add_argument("--pbkdf2-iterations", type=int, default=100_000)
+    parser.add_argument("--lockers", type=int, default=20, help="lockers attacked in the brute-force run")
+    args = parser.parse_args()
+
+    print(f"\n📊 PIN verification, {args.checks:,} checks")
+    print(f"{'method':>20}{'checks/s':>14}")
+    for name, rate in verification_rates(args.checks, args.pbkdf2_iterations):
+        print(f"{name:>20}{rate:>14,.0f}")
+
+    print(f"\n📊 Brute force over all 9,000 PINs on {args.lockers} lockers")
+    print(f"{'limiter':>20}{'attempts/s':>14}{'opened':>9}")
+    for name, limited in (("off", False), ("token bucket", True)):
+        rate, opened = brute_force(args.lockers, limited)
+        print(f"{name:>20}{rate:>14,.0f}{opened:>6}/{args.lockers}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+
+# Shared credential helpers for the LLD systems that hand out or check PINs (Amazon Locker, ATM).
+# Import from a system folder with:
+#     sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Common"))
+#
+# PINs are short (4 digits = 10,000 values), so a slow password hash adds little against an attacker who
+# holds the stored hashes, while it makes every honest pickup slow. Instead each PIN is stored as
+# HMAC-SHA256(key, salt + pin): the key stays with the running service, so a leaked record cannot be brute
+# forced offline, verification costs about a microsecond, and online guessing is stopped by the rate limiter.
+
+
+def generate_pin(digits: int = 4) -> int:
+    """ Uniform PIN from the OS CSPRNG, always `digits` long (no leading zero) """
+    low = 10 ** (digits - 1)
+    return low + secrets.randbelow(9 * low)
+
+
+# PIN Hasher
+class PinHasher:
+    SALT_BYTES = 16
+
+    def __init__(self, key: bytes = None):
+        """ Pass the service key to verify PINs stored by an earlier run; by default a fresh random key """
+        self.key = key if key is not None else secrets.token_bytes(32)
+
+    def hash(self, pin) -> "PinHash":
+        salt = secrets.token_bytes(self.SALT_BYTES)
+        return PinHash(salt, self._digest(salt, pin))
+
+    def verify(self, stored: "PinHash", pin) -> bool:
+        """ Constant-time comparison, so response timing leaks nothing about how close a guess was """
+        return stored is not None and hmac.compare_digest(stored.digest, self._digest(stored.salt, pin))
+
+    def key_id(self) -> bytes:
+        """ Short fingerprint of the key, stored next to persisted hashes to detect a key mismatch on restart """
+        return hmac.new(self.key, b"pin-hasher key id", hashlib.sha256).digest()[:8]
+
+    def _digest(self, salt, pin):
+        return hmac.new(self.key, salt + str(pin).encode(), hashlib.sha256).digest()
+
+
+# Stored PIN (salt + digest, never the PIN itself)
+class PinHash:
+    __slots__ = ("salt", "digest")
+
+    def __init__(self, salt: bytes, digest: bytes):
+        self.salt = salt
+        self.digest = digest
+
+
+# Token Bucket Rate Limiter (one bucket per locker / account)
+class RateLimiter:
+    def __init__(self, capacity: int = 5, refill_per_second: float = 1 / 60, clock=time.monotonic):
+        """ Allows bursts of `capacity` attempts per key, then one more every 1/refill_per_second seconds """
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.clock = clock
+        self.buckets = {}  # key -> [tokens, last refill time]; absent means full
+        self.lock = threading.Lock()
+
+    def allow(self, key) -> bool:
+        """ Spend one attempt for `key`; False once the bucket is empty. O(1), no locker or account work """
+        now = self.clock()
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                self.buckets[key] = [self.capacity - 1, now]
+                return True
+            tokens = min(self.capacity, bucket[0] + (now - bucket[1]) * self.refill_per_second)
+            bucket[1] = now
+            if tokens < 1:
+                bucket[0] = tokens
+                return False
+            bucket[0] = tokens - 1
+            return True
+
+    def reset(self, key):
+        """ Forget a key's attempts, e.g. after a successful login or when a locker gets a new PIN """
+        with self.lock:
+            self.buckets.pop(key, None)
@@ -0,0 +1,237 @@
+import argparse
+import itertools
+import json
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from movie_ticket_booking import MovieTicketBookingSystem, Movie, Theater, Show, User, create_seat_layout
+
+# Load-testing harness for MovieTicketBookingSystem.
+# A seeded workload (browse / hold / confirm / cancel mix, Zipf-skewed show popularity) is replayed against a
+# fresh system; throughput and latency percentiles come from an untraced pass and memory from a traced replay
+# of the same workload. Results can be saved as a baseline and later runs fail on regressions.
+#
+#   python benchmark_movie_booking.py --operations 200000 --save-baseline baseline.json
+#   python benchmark_movie_booking.py --operations 200000 --baseline baseline.json --tolerance 0.2
+
+OPERATIONS = ("browse", "hold", "confirm", "cancel")
+
+
+def parse_mix(text: str):
+    weights = dict.fromkeys(OPERATIONS, 0.0)
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in weights:
+            raise ValueError(f"Unknown operation '{name}' in --mix, expected one of {', '.join(OPERATIONS)}.")
+        weights[name] = float(weight)
+    return [weights[name] for name in OPERATIONS]
+
+
+def build_system(args):
+    """ Fresh singleton with one movie/theater per show and identical venue layouts """
+    MovieTicketBookingSystem.reset_instance()
+    booking_system = MovieTicketBookingSystem.get_instance()
+    start = datetime.now() + timedelta(days=1)
+    shows = []
+    for i in range(args.shows):
+        movie = Movie(f"M{i}", f"Movie {i}", "Benchmark movie", 120)
+        theater = Theater(f"T{i}", f"Theater {i}", f"Location {i}", [])
+        booking_system.add_movie(movie)
+        booking_system.add_theater(theater)
+        seats = create_seat_layout(args.rows, args.columns, max(1, args.rows // 5), 150.0, 100.0)
+        show = Show(f"S{i}", movie, theater, start, start + timedelta(minutes=120), seats)
+        theater.shows.append(show)
+        booking_system.add_show(show)
+        shows.append(show)
+    return booking_system, shows
+
+
+class Workload:
+    """ Seeded operation stream; replaying with the same seed against a fresh system gives the same run """
+
+    def __init__(self, args, shows):
+        self.rng = random.Random(args.seed)
+        self.shows = shows
+        self.operations = args.operations
+        self.max_party = args.max_party
+        # Zipf popularity: show k gets weight 1 / (k + 1) ** skew
+        self.show_weights = list(itertools.accumulate(1 / (k + 1) ** args.hot_skew for k in range(len(shows))))
+        self.mix_weights = list(itertools.accumulate(parse_mix(args.mix)))
+        self.users = [User(f"U{i}", f"User {i}", f"user{i}@example.com") for i in range(args.users)]
+        self.pending = []
+        self.active = []
+
+    def pick_show(self) -> Show:
+        return self.rng.choices(self.shows, cum_weights=self.show_weights)[0]
+
+    def pick_seats(self, booking_system, show: Show):
+        """ Contiguous run of available seats from a random start, found through the published snapshot """
+        data = booking_system.get_seat_map(show.id).data
+        start = data.find(0, self.rng.randrange(len(data)))
+        if start < 0:
+            start = data.find(0)
+            if start < 0:
+                return []
+        party = self.rng.randint(1, self.max_party)
+        end = start
+        while end < len(data) and end - start < party and data[end] == 0:
+            end += 1
+        return show.seats[start:end]
+
+    @staticmethod
+    def take(rng, items):
+        """ O(1) random removal: swap the picked item to the end and pop it """
+        index = rng.randrange(len(items))
+        items[index], items[-1] = items[-1], items[index]
+        return items.pop()
+
+    def run(self, booking_system, latencies=None):
+        clock = time.perf_counter_ns
+        for _ in range(self.operations):
+            operation = self.rng.choices(OPERATIONS, cum_weights=self.mix_weights)[0]
+            if operation == "browse":
+                show = self.pick_show()
+                started = clock()
+                booking_system.get_seat_map(show.id).to_bytes()
+            elif operation == "hold":
+                show = self.pick_show()
+                seats = self.pick_seats(booking_system, show)
+                if not seats:
+                    continue
+                user = self.rng.choice(self.users)
+                started = clock()
+                booking = booking_system.book_tickets(user, show, seats)
+                elapsed = clock() - started
+                if booking:
+                    self.pending.append(booking.id)
+                if latencies is not None:
+                    latencies[operation].append(elapsed)
+                continue
+            elif operation == "confirm":
+                if not self.pending:
+                    continue
+                booking_id = self.take(self.rng, self.pending)
+                started = clock()
+                booking_system.confirm_booking(booking_id)
+                self.active.append(booking_id)
+            else:
+                pool = self.active if self.active and (not self.pending or self.rng.random() < 0.8) else self.pending
+                if not pool:
+                    continue
+                booking_id = self.take(self.rng, pool)
+                started = clock()
+                booking_system.cancel_booking(booking_id)
+            if latencies is not None:
+                latencies[operation].append(clock() - started)
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def run_benchmark(args):
+    booking_system, shows = build_system(args)
+    latencies = {operation: [] for operation in OPERATIONS}
+    started = time.perf_counter()
+    Workload(args, shows).run(booking_system, latencies)
+    wall = time.perf_counter() - started
+
+    results = {"wall_seconds": wall, "operations": {}}
+    for operation, samples in latencies.items():
+        samples.sort()
+        total = sum(samples) / 1e9
+        results["operations"][operation] = {
+            "count": len(samples),
+            "ops_per_second": len(samples) / total if total else 0.0,
+            "p50_us": percentile(samples, 0.50) / 1e3,
+            "p95_us": percentile(samples, 0.95) / 1e3,
+            "p99_us": percentile(samples, 0.99) / 1e3,
+        }
+
+    # Memory: replay the identical workload against a fresh system under tracemalloc
+    tracemalloc.start()
+    booking_system, shows = build_system(args)
+    setup_bytes, _ = tracemalloc.get_traced_memory()
+    Workload(args, shows).run(booking_system)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    results["memory"] = {
+        "setup_mib": setup_bytes / 2**20,
+        "final_mib": current / 2**20,
+        "peak_mib": peak / 2**20,
+        "bookings": len(booking_system.bookings),
+    }
+    return results
+
+
+def report(args, results):
+    print(f"\n📊 Movie booking benchmark: seed {args.seed}, {args.operations:,} operations, {args.shows} shows "
+          f"of {args.rows}x{args.columns} seats, skew {args.hot_skew}, mix {args.mix}")
+    print(f"{'operation':<10}{'count':>10}{'ops/s':>14}{'p50 µs':>10}{'p95 µs':>10}{'p99 µs':>10}")
+    for operation, stats in results["operations"].items():
+        print(f"{operation:<10}{stats['count']:>10,}{stats['ops_per_second']:>14,.0f}"
+              f"{stats['p50_us']:>10.1f}{stats['p95_us']:>10.1f}{stats['p99_us']:>10.1f}")
+    memory = results["memory"]
+    print(f"🧠 Memory: {memory['setup_mib']:.1f} MiB after setup, {memory['final_mib']:.1f} MiB final, "
+          f"{memory['peak_mib']:.1f} MiB peak, {memory['bookings']:,} bookings")
+    print(f"⏱️ Wall time: {results['wall_seconds']:.2f}s")
+
+
+def check_regressions(results, baseline, tolerance: float):
+    """ Flag throughput drops and p95 growth beyond the tolerance (e.g. 0.2 = 20%) """
+    failures = []
+    for operation, stats in baseline["operations"].items():
+        current = results["operations"].get(operation)
+        if not current or not stats["count"]:
+            continue
+        if current["ops_per_second"] < stats["ops_per_second"] * (1 - tolerance):
+            failures.append(f"{operation}: {current['ops_per_second']:,.0f} ops/s vs baseline {stats['ops_per_second']:,.0f}")
+        if current["p95_us"] > stats["p95_us"] * (1 + tolerance):
+            failures.append(f"{operation}: p95 {current['p95_us']:.1f} µs vs baseline {stats['p95_us']:.1f} µs")
+    if results["memory"]["peak_mib"] > baseline["memory"]["peak_mib"] * (1 + tolerance):
+        failures.append(f"memory: peak {results['memory']['peak_mib']:.1f} MiB vs baseline {baseline['memory']['peak_mib']:.1f} MiB")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Movie booking load test and benchmark harness")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--operations", type=int, default=100_000)
+    parser.add_argument("--shows", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=40)
+    parser.add_argument("--columns", type=int, default=50)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--max-party", type=int, default=4)
+    parser.add_argument("--hot-skew", type=float, default=1.2, help="Zipf exponent for show popularity (0 = uniform)")
+    parser.add_argument("--mix", default="browse=70,hold=15,confirm=10,cancel=5")
+    parser.add_argument("--baseline", help="JSON file from --save-baseline to compare against")
+    parser.add_argument("--save-baseline", help="write this run's results as a JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = run_benchmark(args)
+    report(args, results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+        print(f"💾 Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            failures = check_regressions(results, json.load(baseline_file), args.tolerance)
+        if failures:
+            print("❌ Regressions detected:")
+            for failure in failures:
+                print(f"   {failure}")
+            sys.exit(1)
+        print("✅ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
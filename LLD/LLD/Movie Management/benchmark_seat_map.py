@@ -0,0 +1,61 @@
+import argparse
+import json
+import random
+import timeit
+from datetime import datetime, timedelta
+
+from movie_ticket_booking import MovieTicketBookingSystem, Movie, Theater, Show, User, create_seat_layout
+
+# Serializer benchmark: seat-map rendering by walking Show.seats vs. published snapshots (no HTTP involved)
+
+
+def build_show(rows: int, columns: int) -> Show:
+    seats = create_seat_layout(rows, columns, 2, 150.0, 100.0)
+    movie = Movie("M1", "Benchmark", "Seat map benchmark", 120)
+    theater = Theater("T1", "Benchmark Theater", "Local", [])
+    start = datetime.now() + timedelta(days=1)
+    return Show("S1", movie, theater, start, start + timedelta(minutes=120), seats)
+
+
+def walk_and_serialize(show: Show) -> bytes:
+    """ What every browse request used to do: touch each Seat.status and encode it """
+    return json.dumps({seat.id: seat.status.value for seat in show.seats}).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seat map serializer benchmark")
+    parser.add_argument("--rows", type=int, default=80)
+    parser.add_argument("--columns", type=int, default=100)
+    parser.add_argument("--booked", type=float, default=0.6, help="fraction of seats booked before reading")
+    parser.add_argument("--reads", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    booking_system = MovieTicketBookingSystem.get_instance()
+    show = build_show(args.rows, args.columns)
+    booking_system.add_show(show)
+
+    # Book in groups of four so the snapshot goes through many published versions
+    user = User("U1", "Bench", "bench@example.com")
+    seat_list = list(show.seats)
+    random.shuffle(seat_list)
+    to_book = seat_list[:int(len(seat_list) * args.booked)]
+    write_time = timeit.timeit(
+        lambda: [booking_system.book_tickets(user, show, to_book[i:i + 4]) for i in range(0, len(to_book), 4)],
+        number=1)
+    writes = (len(to_book) + 3) // 4
+
+    walk_time = timeit.timeit(lambda: walk_and_serialize(show), number=args.reads)
+    snapshot_time = timeit.timeit(lambda: booking_system.get_seat_map(show.id).to_bytes(), number=args.reads)
+    snapshot = booking_system.get_seat_map(show.id)
+
+    print(f"\n📊 Seat map benchmark: {len(show.seats)} seats, {len(to_book)} booked, snapshot v{snapshot.version}")
+    print(f"✍️ Booking commits (incl. publish): {writes / write_time:,.0f} commits/s")
+    print(f"🐢 Walk + JSON: {args.reads / walk_time:,.0f} reads/s, {len(walk_and_serialize(show)):,} bytes")
+    print(f"⚡ Snapshot bytes: {args.reads / snapshot_time:,.0f} reads/s, {len(snapshot.to_bytes()):,} bytes")
+    print(f"🚀 Speedup: {walk_time / snapshot_time:,.1f}x")
+
+
+if __name__ == "__main__":
+    main()
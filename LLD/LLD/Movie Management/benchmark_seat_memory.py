@@ -0,0 +1,62 @@
+import argparse
+import gc
+import tracemalloc
+
+from movie_ticket_booking import SeatType, SeatStatus, create_seat_layout
+
+# Memory benchmark: per-seat footprint of the old dict-backed seat map vs. the slotted, index-addressed layout
+
+
+# The seat model as it was before slots: instance __dict__, string id, enum members stored directly
+class DictBackedSeat:
+    def __init__(self, seat_id: str, row: int, column: int, seat_type: SeatType, price: float, status: SeatStatus):
+        self._id = seat_id
+        self._row = row
+        self._column = column
+        self._type = seat_type
+        self._price = price
+        self._status = status
+
+
+def build_dict_backed(rows: int, columns: int):
+    # Same construction the old demo used: f-string ids, dict keyed by them
+    return {
+        f"{r}-{c}": DictBackedSeat(f"{r}-{c}", r, c, SeatType.PREMIUM if r <= 2 else SeatType.NORMAL,
+                                   150.0 if r <= 2 else 100.0, SeatStatus.AVAILABLE)
+        for r in range(1, rows + 1) for c in range(1, columns + 1)
+    }
+
+
+def build_slotted(rows: int, columns: int):
+    return create_seat_layout(rows, columns, 2, 150.0, 100.0)
+
+
+def measure(builder, rows: int, columns: int) -> int:
+    """ Bytes allocated (and still alive) while building one show's seat map """
+    gc.collect()
+    tracemalloc.start()
+    seats = builder(rows, columns)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del seats
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seat model memory benchmark")
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--columns", type=int, default=400)
+    args = parser.parse_args()
+
+    seat_count = args.rows * args.columns
+    before = measure(build_dict_backed, args.rows, args.columns)
+    after = measure(build_slotted, args.rows, args.columns)
+
+    print(f"\n📊 Seat memory benchmark: {seat_count:,} seats per show")
+    print(f"🐢 Dict-backed, string keyed: {before / 2**20:,.1f} MiB ({before / seat_count:,.0f} bytes/seat)")
+    print(f"⚡ Slotted, index addressed: {after / 2**20:,.1f} MiB ({after / seat_count:,.0f} bytes/seat)")
+    print(f"📉 Reduction: {100 * (1 - after / before):.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
 from datetime import datetime, timedelta
 from typing import List, Dict
 from enum import Enum
+import heapq
 import itertools
+import struct
+import threading
 
 # Enum for Seat Type
 class SeatType(Enum):
@@ -19,8 +22,16 @@ class BookingStatus(Enum):
     CONFIRMED = "CONFIRMED"
     CANCELLED = "CANCELLED"
 
+# Enums are stored on the hot objects as small int codes (position in these tuples)
+SEAT_TYPES = tuple(SeatType)
+SEAT_STATUSES = tuple(SeatStatus)
+_SEAT_TYPE_CODES = {seat_type: code for code, seat_type in enumerate(SEAT_TYPES)}
+_SEAT_STATUS_CODES = {status: code for code, status in enumerate(SEAT_STATUSES)}
+
 # Movie Class
 class Movie:
+    __slots__ = ("_id", "_title", "_description", "_duration_in_minutes")
+
     def __init__(self, movie_id: str, title: str, description: str, duration_in_minutes: int):
         self._id = movie_id
         self._title = title
@@ -45,6 +56,8 @@ class Movie:
 
 # Theater Class
 class Theater:
+    __slots__ = ("_id", "_name", "_location", "_shows")
+
     def __init__(self, theater_id: str, name: str, location: str, shows: List):
         self._id = theater_id
         self._name = name
@@ -69,17 +82,24 @@ class Theater:
 
 # Seat Class
 class Seat:
-    def __init__(self, seat_id: str, row: int, column: int, seat_type: SeatType, price: float, status: SeatStatus):
-        self._id = seat_id
+    __slots__ = ("_index", "_row", "_column", "_type", "_price", "_status")
+
+    def __init__(self, index: int, row: int, column: int, seat_type: SeatType, price: float, status: SeatStatus):
+        self._index = index  # position of the seat in its show's seat list
         self._row = row
         self._column = column
-        self._type = seat_type
+        self._type = _SEAT_TYPE_CODES[seat_type]
         self._price = price
-        self._status = status
+        self._status = _SEAT_STATUS_CODES[status]
+
+    @property
+    def index(self) -> int:
+        return self._index
 
     @property
     def id(self) -> str:
-        return self._id
+        """ Human readable label, derived on demand instead of stored per seat """
+        return f"{self._row}-{self._column}"
 
     @property
     def row(self) -> int:
@@ -91,7 +111,7 @@ class Seat:
 
     @property
     def type(self) -> SeatType:
-        return self._type
+        return SEAT_TYPES[self._type]
 
     @property
     def price(self) -> float:
@@ -99,21 +119,28 @@ class Seat:
 
     @property
     def status(self) -> SeatStatus:
-        return self._status
+        return SEAT_STATUSES[self._status]
 
     @status.setter
     def status(self, status: SeatStatus):
-        self._status = status
+        self._status = _SEAT_STATUS_CODES[status]
+
+    @property
+    def status_code(self) -> int:
+        return self._status
 
 # Show Class
 class Show:
-    def __init__(self, show_id: str, movie: Movie, theater: Theater, start_time: datetime, end_time: datetime, seats: Dict[str, Seat]):
+    __slots__ = ("_id", "_movie", "_theater", "_start_time", "_end_time", "_seats", "_booked_count")
+
+    def __init__(self, show_id: str, movie: Movie, theater: Theater, start_time: datetime, end_time: datetime, seats: List[Seat]):
         self._id = show_id
         self._movie = movie
         self._theater = theater
         self._start_time = start_time
         self._end_time = end_time
         self._seats = seats
+        self._booked_count = sum(1 for seat in seats if seat.status == SeatStatus.BOOKED)
 
     @property
     def id(self) -> str:
@@ -136,11 +163,29 @@ class Show:
         return self._end_time
 
     @property
-    def seats(self) -> Dict[str, Seat]:
+    def seats(self) -> List[Seat]:
         return self._seats
 
+    def get_seat(self, seat_index: int) -> Seat:
+        return self._seats[seat_index] if 0 <= seat_index < len(self._seats) else None
+
+    @property
+    def booked_count(self) -> int:
+        return self._booked_count
+
+    @booked_count.setter
+    def booked_count(self, booked_count: int):
+        self._booked_count = booked_count
+
+    @property
+    def occupancy(self) -> float:
+        """ Fraction of seats booked, kept as a counter so pricing never scans the seat map """
+        return self._booked_count / len(self._seats) if self._seats else 0.0
+
 # User Class
 class User:
+    __slots__ = ("_id", "_name", "_email")
+
     def __init__(self, user_id: str, name: str, email: str):
         self._id = user_id
         self._name = name
@@ -158,15 +203,184 @@ class User:
     def email(self) -> str:
         return self._email
 
+# Availability Snapshot Class (immutable, versioned seat map served to browse traffic)
+class AvailabilitySnapshot:
+    HEADER = struct.Struct("!QI")  # version, seat count
+    __slots__ = ("_show_id", "_version", "_data")
+
+    def __init__(self, show_id: str, version: int, data: bytes):
+        self._show_id = show_id
+        self._version = version
+        self._data = data  # one status code byte per seat, indexed by Seat.index
+
+    @property
+    def show_id(self) -> str:
+        return self._show_id
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def data(self) -> bytes:
+        return self._data
+
+    def is_available(self, seat_index: int) -> bool:
+        return self._data[seat_index] == _SEAT_STATUS_CODES[SeatStatus.AVAILABLE]
+
+    def available_count(self) -> int:
+        return self._data.count(_SEAT_STATUS_CODES[SeatStatus.AVAILABLE])
+
+    def to_bytes(self) -> bytes:
+        """ Wire format: fixed header followed by the raw status bytes, no per-seat encoding """
+        return self.HEADER.pack(self._version, len(self._data)) + self._data
+
+# Seat Map Publisher Class (copy-on-write snapshots, one per show)
+class SeatMapPublisher:
+    def __init__(self, show: Show):
+        self._show_id = show.id
+        self._lock = threading.Lock()  # serialises writers only
+        data = bytes(seat.status_code for seat in show.seats)
+        self._current = AvailabilitySnapshot(show.id, 1, data)
+
+    def current(self) -> AvailabilitySnapshot:
+        """ Readers take the published reference as-is; snapshots are never mutated """
+        return self._current
+
+    def publish(self, seats: List[Seat]) -> AvailabilitySnapshot:
+        """ Copy the current bytes, patch the changed seats and swap in the new version """
+        with self._lock:
+            data = bytearray(self._current.data)
+            for seat in seats:
+                data[seat.index] = seat.status_code
+            self._current = AvailabilitySnapshot(self._show_id, self._current.version + 1, bytes(data))
+            return self._current
+
+# Price Table Class (immutable batch of per-seat prices for one show)
+class PriceTable:
+    __slots__ = ("_show_id", "_version", "_prices", "_computed_at")
+
+    def __init__(self, show_id: str, version: int, prices: List[float], computed_at: datetime):
+        self._show_id = show_id
+        self._version = version
+        self._prices = prices
+        self._computed_at = computed_at
+
+    @property
+    def show_id(self) -> str:
+        return self._show_id
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def computed_at(self) -> datetime:
+        return self._computed_at
+
+    def price_of(self, seat: Seat) -> float:
+        return self._prices[seat.index]
+
+# Price Quote Class (prices locked in for a set of seats)
+class PriceQuote:
+    __slots__ = ("_show_id", "_version", "_seat_prices", "_total_price", "_expires_at")
+
+    def __init__(self, show_id: str, version: int, seat_prices: Dict[int, float], expires_at: datetime):
+        self._show_id = show_id
+        self._version = version
+        self._seat_prices = seat_prices
+        self._total_price = round(sum(seat_prices.values()), 2)
+        self._expires_at = expires_at
+
+    @property
+    def show_id(self) -> str:
+        return self._show_id
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def seat_prices(self) -> Dict[int, float]:
+        return self._seat_prices
+
+    @property
+    def total_price(self) -> float:
+        return self._total_price
+
+    @property
+    def expires_at(self) -> datetime:
+        return self._expires_at
+
+    def covers(self, show: Show, seats: List[Seat], now: datetime) -> bool:
+        """ A quote is honoured only for the exact seats it was issued for, before it expires """
+        return (self._show_id == show.id and now <= self._expires_at
+                and len(seats) == len(self._seat_prices)
+                and all(seat.index in self._seat_prices for seat in seats))
+
+# Pricing Engine Class
+class PricingEngine:
+    # Surge applied per full 10% of occupancy, per seat type
+    OCCUPANCY_SURGE = {SeatType.NORMAL: 0.05, SeatType.PREMIUM: 0.08}
+    # (time left before the show starts, multiplier) - first matching band wins
+    TIME_BANDS = [(timedelta(0), 0.80), (timedelta(hours=2), 1.15), (timedelta(hours=24), 1.05)]
+    QUOTE_TTL = timedelta(minutes=10)
+
+    def __init__(self, clock=datetime.now):
+        self._clock = clock
+        self._tables = {}  # show_id -> (cache_key, PriceTable)
+        self._versions = itertools.count(1)
+
+    def now(self) -> datetime:
+        return self._clock()
+
+    def _time_band(self, show: Show, now: datetime) -> int:
+        time_left = show.start_time - now
+        for index, (limit, _) in enumerate(self.TIME_BANDS):
+            if time_left <= limit:
+                return index
+        return len(self.TIME_BANDS)
+
+    def get_price_table(self, show: Show) -> PriceTable:
+        """ Return the cached table, recomputing only when the show's demand bucket or time band moves """
+        now = self.now()
+        cache_key = (int(show.occupancy * 10), self._time_band(show, now))
+        cached = self._tables.get(show.id)
+        if cached and cached[0] == cache_key:
+            return cached[1]
+        table = self._compute(show, cache_key, now)
+        self._tables[show.id] = (cache_key, table)
+        return table
+
+    def _compute(self, show: Show, cache_key, now: datetime) -> PriceTable:
+        """ Price every seat of the show in one batch: the multiplier is resolved once per seat type """
+        occupancy_bucket, band = cache_key
+        time_multiplier = self.TIME_BANDS[band][1] if band < len(self.TIME_BANDS) else 1.0
+        multipliers = {
+            seat_type: (1 + surge * occupancy_bucket) * time_multiplier
+            for seat_type, surge in self.OCCUPANCY_SURGE.items()
+        }
+        prices = [round(seat.price * multipliers[seat.type], 2) for seat in show.seats]
+        return PriceTable(show.id, next(self._versions), prices, now)
+
+    def quote(self, show: Show, seats: List[Seat]) -> PriceQuote:
+        table = self.get_price_table(show)
+        seat_prices = {seat.index: table.price_of(seat) for seat in seats}
+        return PriceQuote(show.id, table.version, seat_prices, self.now() + self.QUOTE_TTL)
+
 # Booking Class
 class Booking:
-    def __init__(self, booking_id: str, user: User, show: Show, seats: List[Seat], total_price: float, status: BookingStatus):
+    __slots__ = ("_id", "_user", "_show", "_seats", "_total_price", "_status", "_price_quote")
+
+    def __init__(self, booking_id: str, user: User, show: Show, seats: List[Seat], total_price: float, status: BookingStatus,
+                 price_quote: PriceQuote = None):
         self._id = booking_id
         self._user = user
         self._show = show
         self._seats = seats
         self._total_price = total_price
         self._status = status
+        self._price_quote = price_quote
 
     @property
     def id(self) -> str:
@@ -196,6 +410,103 @@ class Booking:
     def status(self, status: BookingStatus):
         self._status = status
 
+    @property
+    def price_quote(self) -> PriceQuote:
+        return self._price_quote
+
+# Waitlist Entry Class
+class WaitlistEntry:
+    __slots__ = ("_user", "_seat_type", "_seat_count", "_priority", "_sequence", "_active", "_booking")
+
+    def __init__(self, user: User, seat_type: SeatType, seat_count: int, priority: int, sequence: int):
+        self._user = user
+        self._seat_type = seat_type
+        self._seat_count = seat_count
+        self._priority = priority
+        self._sequence = sequence  # position in the queue among equal priorities
+        self._active = True
+        self._booking = None
+
+    @property
+    def user(self) -> User:
+        return self._user
+
+    @property
+    def seat_type(self) -> SeatType:
+        return self._seat_type
+
+    @property
+    def seat_count(self) -> int:
+        return self._seat_count
+
+    @property
+    def priority(self) -> int:
+        return self._priority
+
+    @property
+    def sequence(self) -> int:
+        return self._sequence
+
+    @property
+    def active(self) -> bool:
+        return self._active
+
+    @property
+    def booking(self) -> Booking:
+        return self._booking
+
+    def fulfil(self, booking: Booking):
+        self._active = False
+        self._booking = booking
+
+    def withdraw(self):
+        self._active = False
+
+# Show Waitlist Class (one heap per (seat type, seat count) so a match never scans waiting users)
+class ShowWaitlist:
+    MAX_PARTY_SIZE = 10
+
+    def __init__(self):
+        self._queues = {}  # (SeatType, seat_count) -> heap of (-priority, sequence, entry)
+        self._sequence = itertools.count()
+
+    def join(self, user: User, seat_type: SeatType, seat_count: int, priority: int = 0) -> WaitlistEntry:
+        if not 1 <= seat_count <= self.MAX_PARTY_SIZE:
+            raise ValueError(f"Waitlist requests must be for 1 to {self.MAX_PARTY_SIZE} seats.")
+        entry = WaitlistEntry(user, seat_type, seat_count, priority, next(self._sequence))
+        self.requeue(entry)
+        return entry
+
+    def requeue(self, entry: WaitlistEntry):
+        """ (Re)insert an entry at its original place in line """
+        heapq.heappush(self._queues.setdefault((entry.seat_type, entry.seat_count), []),
+                       (-entry.priority, entry.sequence, entry))
+
+    def _head(self, seat_type: SeatType, seat_count: int):
+        heap = self._queues.get((seat_type, seat_count))
+        while heap and not heap[0][2].active:
+            heapq.heappop(heap)  # withdrawn entries are dropped lazily
+        return heap[0] if heap else None
+
+    def pop_match(self, seat_type: SeatType, free_seats: int) -> WaitlistEntry:
+        """ Highest-priority, earliest entry among the parties that fit: one heap peek per party size plus one pop """
+        best_key = None
+        for seat_count in range(min(free_seats, self.MAX_PARTY_SIZE), 0, -1):
+            head = self._head(seat_type, seat_count)
+            if head and (best_key is None or head[:2] < best_key[:2]):
+                best_key = (head[0], head[1], seat_count)
+        if best_key is None:
+            return None
+        return heapq.heappop(self._queues[(seat_type, best_key[2])])[2]
+
+# Builds a rectangular seat layout; seat index is row-major so (row, column) maps to an index in O(1)
+def create_seat_layout(rows: int, columns: int, premium_rows: int, premium_price: float, normal_price: float) -> List[Seat]:
+    return [
+        Seat((r - 1) * columns + (c - 1), r, c, SeatType.PREMIUM if r <= premium_rows else SeatType.NORMAL,
+             premium_price if r <= premium_rows else normal_price, SeatStatus.AVAILABLE)
+        for r in range(1, rows + 1) for c in range(1, columns + 1)
+    ]
+
 # MovieTicketBookingSystem (Singleton)
 class MovieTicketBookingSystem:
     _instance = None
@@ -207,7 +518,10 @@ class MovieTicketBookingSystem:
             cls._instance.theaters = []
             cls._instance.shows = {}
             cls._instance.bookings = {}
+            cls._instance.seat_maps = {}
+            cls._instance.waitlists = {}
             cls._instance.booking_counter = itertools.count(1)
+            cls._instance.pricing_engine = PricingEngine()
         return cls._instance
 
     @staticmethod
@@ -216,6 +530,11 @@ class MovieTicketBookingSystem:
             MovieTicketBookingSystem()
         return MovieTicketBookingSystem._instance
 
+    @staticmethod
+    def reset_instance():
+        """ Drop the singleton so benchmarks can start each run from an empty system """
+        MovieTicketBookingSystem._instance = None
+
     def add_movie(self, movie: Movie):
         self.movies.append(movie)
 
@@ -224,18 +543,37 @@ class MovieTicketBookingSystem:
 
     def add_show(self, show: Show):
         self.shows[show.id] = show
+        self.seat_maps[show.id] = SeatMapPublisher(show)
+        self.waitlists[show.id] = ShowWaitlist()
+
+    def join_waitlist(self, user: User, show: Show, seat_type: SeatType, seat_count: int, priority: int = 0) -> WaitlistEntry:
+        """ Queue a user for seats on a sold-out show; they are booked as soon as a cancellation frees enough seats """
+        return self.waitlists[show.id].join(user, seat_type, seat_count, priority)
+
+    def get_seat_map(self, show_id: str) -> AvailabilitySnapshot:
+        """ Lock-free read of the latest published availability for a show """
+        publisher = self.seat_maps.get(show_id)
+        return publisher.current() if publisher else None
 
     def get_show(self, show_id: str) -> Show:
         return self.shows.get(show_id)
 
-    def book_tickets(self, user: User, show: Show, selected_seats: List[Seat]) -> Booking:
+    def quote_tickets(self, show: Show, selected_seats: List[Seat]) -> PriceQuote:
+        """ Price the selected seats from the show's cached price table """
+        return self.pricing_engine.quote(show, selected_seats)
+
+    def book_tickets(self, user: User, show: Show, selected_seats: List[Seat], quote: PriceQuote = None) -> Booking:
         if all(seat.status == SeatStatus.AVAILABLE for seat in selected_seats):
+            # Honour the quote the user saw; otherwise lock in the current table price at hold time
+            if quote is None or not quote.covers(show, selected_seats, self.pricing_engine.now()):
+                quote = self.quote_tickets(show, selected_seats)
             for seat in selected_seats:
                 seat.status = SeatStatus.BOOKED
-            total_price = sum(seat.price for seat in selected_seats)
+            show.booked_count += len(selected_seats)
             booking_id = f"BKG{datetime.now().strftime('%Y%m%d%H%M%S')}{next(self._instance.booking_counter):06d}"
-            booking = Booking(booking_id, user, show, selected_seats, total_price, BookingStatus.PENDING)
+            booking = Booking(booking_id, user, show, selected_seats, quote.total_price, BookingStatus.PENDING, quote)
             self.bookings[booking_id] = booking
+            self._publish_seat_map(show, selected_seats)
             return booking
         return None
 
@@ -244,12 +582,45 @@ class MovieTicketBookingSystem:
         if booking and booking.status == BookingStatus.PENDING:
             booking.status = BookingStatus.CONFIRMED
 
-    def cancel_booking(self, booking_id: str):
+    def cancel_booking(self, booking_id: str) -> List[WaitlistEntry]:
+        """ Cancel a booking; returns the waitlist entries rebooked onto the freed seats """
         booking = self.bookings.get(booking_id)
         if booking and booking.status != BookingStatus.CANCELLED:
             booking.status = BookingStatus.CANCELLED
             for seat in booking.seats:
                 seat.status = SeatStatus.AVAILABLE
+            booking.show.booked_count -= len(booking.seats)
+            self._publish_seat_map(booking.show, booking.seats)
+            return self._rebook_from_waitlist(booking.show, booking.seats)
+        return []
+
+    def _rebook_from_waitlist(self, show: Show, freed_seats: List[Seat]) -> List[WaitlistEntry]:
+        """ Hand freed seats straight to waiting users instead of releasing them to general sale """
+        waitlist = self.waitlists.get(show.id)
+        rebooked = []
+        if not waitlist:
+            return rebooked
+        freed_by_type = {}
+        for seat in freed_seats:
+            freed_by_type.setdefault(seat.type, []).append(seat)
+        for seat_type, seats in freed_by_type.items():
+            while seats:
+                entry = waitlist.pop_match(seat_type, len(seats))
+                if entry is None:
+                    break
+                taken, seats = seats[:entry.seat_count], seats[entry.seat_count:]
+                booking = self.book_tickets(entry.user, show, taken)
+                if booking is None:
+                    waitlist.requeue(entry)  # the seats were taken in the meantime; keep the user's place in line
+                    break
+                entry.fulfil(booking)
+                rebooked.append(entry)
+        return rebooked
+
+    def _publish_seat_map(self, show: Show, changed_seats: List[Seat]):
+        publisher = self.seat_maps.get(show.id)
+        if publisher:
+            publisher.publish(changed_seats)
 
 # Demo Execution
 if __name__ == "__main__":
@@ -271,18 +642,10 @@ if __name__ == "__main__":
     booking_system.add_theater(theater1)
     booking_system.add_theater(theater2)
 
-    # Create seats
-    seats1 = {
-        f"{r}-{c}": Seat(f"{r}-{c}", r, c, SeatType.PREMIUM if r <= 2 else SeatType.NORMAL, 
-                         150.0 if r <= 2 else 100.0, SeatStatus.AVAILABLE)
-        for r in range(1, 6) for c in range(1, 6)
-    }
-
-    seats2 = {
-        f"{r}-{c}": Seat(f"{r}-{c}", r, c, SeatType.PREMIUM if r <= 2 else SeatType.NORMAL, 
-                         180.0 if r <= 2 else 120.0, SeatStatus.AVAILABLE)
-        for r in range(1, 6) for c in range(1, 6)
-    }
+    # Create seats (5 x 5, first two rows premium)
+    columns = 5
+    seats1 = create_seat_layout(5, columns, 2, 150.0, 100.0)
+    seats2 = create_seat_layout(5, columns, 2, 180.0, 120.0)
 
     # Add shows (Each show corresponds to a movie-theater combination)
     show1 = Show("S1", movie1, theater1, datetime.now(), datetime.now() + timedelta(minutes=120), seats1)
@@ -295,17 +658,20 @@ if __name__ == "__main__":
     booking_system.add_show(show3)
     booking_system.add_show(show4)
 
-    # List of users, their selected show, and their selected seats
+    # List of users, their selected show, and their selected seats as (row, column)
     users_booking_info = [
-        (User("U1", "John Doe", "john@example.com"), show1, ["1-1", "1-2"]),
-        (User("U2", "Arun", "arun@example.com"), show3, ["1-3", "1-4"]),  # Booking for a different movie
-        (User("U3", "Sandy", "sandy@example.com"), show4, ["1-4", "1-5"]),  # Booking for yet another movie
+        (User("U1", "John Doe", "john@example.com"), show1, [(1, 1), (1, 2)]),
+        (User("U2", "Arun", "arun@example.com"), show3, [(1, 3), (1, 4)]),  # Booking for a different movie
+        (User("U3", "Sandy", "sandy@example.com"), show4, [(1, 4), (1, 5)]),  # Booking for yet another movie
     ]
 
     # Process each user's booking
-    for user, show, seat_ids in users_booking_info:
-        selected_seats = [show.seats[seat_id] for seat_id in seat_ids if seat_id in show.seats]
-        booking = booking_system.book_tickets(user, show, selected_seats)
+    for user, show, positions in users_booking_info:
+        seat_indices = [(row - 1) * columns + (column - 1) for row, column in positions]
+        selected_seats = [show.get_seat(index) for index in seat_indices if show.get_seat(index)]
+        quote = booking_system.quote_tickets(show, selected_seats)
+        print(f"\n🏷️ Quoted {user.name}: ${quote.total_price:.2f} (price table v{quote.version})")
+        booking = booking_system.book_tickets(user, show, selected_seats, quote)
 
         if booking:
             booking_system.confirm_booking(booking.id)
@@ -319,8 +685,22 @@ if __name__ == "__main__":
             print(f"🕒 Show Timing: {booking.show.start_time.strftime('%Y-%m-%d %H:%M:%S')} to {booking.show.end_time.strftime('%Y-%m-%d %H:%M:%S')}")
             print(f"🎫 Number of Seats Booked: {len(booking.seats)}")
             print(f"💺 Seat Details: {', '.join(seat.id for seat in booking.seats)}")
-            print(f"💰 Total Price: ${booking.total_price:.2f}")
+            print(f"💰 Total Price: ${booking.total_price:.2f} (price table v{booking.price_quote.version})")
             print(f"📌 Booking Status: {booking.status.value}")
+            seat_map = booking_system.get_seat_map(show.id)
+            print(f"🗺️ Seat Map v{seat_map.version}: {seat_map.available_count()}/{len(show.seats)} seats available")
 
         else:
             print(f"\n⚠️ Booking failed for {user.name}. Selected seats are not available.")
+
+    # Waitlist: seats 1-1 and 1-2 of show 1 are taken, so a second user waits and is rebooked on cancellation
+    first_booking = next(booking for booking in booking_system.bookings.values() if booking.show is show1)
+    waiting_user = User("U4", "Priya", "priya@example.com")
+    entry = booking_system.join_waitlist(waiting_user, show1, SeatType.PREMIUM, 2)
+    print(f"\n⏳ {waiting_user.name} joined the waitlist for 2 {SeatType.PREMIUM.value} seat(s) on show {show1.id}")
+    for rebooked in booking_system.cancel_booking(first_booking.id):
+        print(f"🔔 Waitlist: {rebooked.user.name} rebooked on show {show1.id}, seats "
+              f"{', '.join(seat.id for seat in rebooked.booking.seats)} (booking {rebooked.booking.id}, pending confirmation)")
+    if entry.booking:
+        booking_system.confirm_booking(entry.booking.id)
+        print(f"📌 {waiting_user.name}'s Booking Status: {entry.booking.status.value}")
@@ -0,0 +1,74 @@
+import threading
+
+# Availability Board
+# Keeps free/total counters per (level, spot category) that park/unpark update in O(1), and renders the
+# board on its own thread at a fixed rate instead of printing every spot on every transaction.
+# Categories are whatever the lot uses to split spots (e.g. VehicleType); untyped lots use a single None.
+class AvailabilityBoard:
+    def __init__(self, refresh_interval=1.0, output=print):
+        self.refresh_interval = refresh_interval
+        self.output = output
+        self.lock = threading.Lock()
+        self.counters = {}  # level -> {category: [free, total]}
+        self.version = 0  # bumped on every change
+        self.published_version = -1
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def register(self, level, category, total, free=None):
+        with self.lock:
+            self.counters.setdefault(level, {})[category] = [total if free is None else free, total]
+            self.version += 1
+
+    def record_park(self, level, category=None):
+        with self.lock:
+            self.counters[level][category][0] -= 1
+            self.version += 1
+
+    def record_unpark(self, level, category=None):
+        with self.lock:
+            self.counters[level][category][0] += 1
+            self.version += 1
+
+    def free(self, level, category=None):
+        return self.counters[level][category][0]
+
+    def render(self):
+        with self.lock:
+            version = self.version
+            rows = [(level, [(category, free, total) for category, (free, total) in categories.items()])
+                    for level, categories in self.counters.items()]
+        lines = [f"\n📢 **Availability Board** (update {version}):"]
+        for level, categories in rows:
+            cells = " | ".join(f"{'Spots' if category is None else category.name} {free}/{total} free"
+                               for category, free, total in categories)
+            lines.append(f"📍 Level {level}: {cells}")
+        return version, "\n".join(lines)
+
+    def publish(self):
+        """ Render and emit the board if anything changed since the last publish """
+        if self.version == self.published_version:
+            return False
+        self.published_version, board = self.render()
+        self.output(board)
+        return True
+
+    def _run(self):
+        while not self._stop_event.wait(self.refresh_interval):
+            self.publish()
+
+    def start(self):
+        """ Publish in the background every refresh_interval seconds """
+        if self._thread is None:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="availability-board", daemon=True)
+            self._thread.start()
+
+    def stop(self, final_update=True):
+        """ Stop the publisher and emit one final update """
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+        if final_update:
+            self.publish()
@@ -0,0 +1,59 @@
+import argparse
+import contextlib
+import os
+import random
+import time
+
+from parking_lot_with_different_spots import Level, VehicleType, Car, Motorcycle, Truck
+
+# Allocation benchmark under high churn: a level is filled to the target occupancy, then every
+# iteration one random vehicle leaves and a new one of a random type arrives.
+
+VEHICLE_CLASSES = {VehicleType.MOTORCYCLE: Motorcycle, VehicleType.CAR: Car, VehicleType.TRUCK: Truck}
+
+
+def run(num_spots: int, occupancy: float, churn: int, rng: random.Random):
+    level = Level(0, num_spots)
+    parked = []
+    plates = (f"PLATE{i}" for i in range(10**9))
+
+    def arrive():
+        vehicle_type = rng.choice(list(VehicleType))
+        position = level.park_vehicle(VEHICLE_CLASSES[vehicle_type](next(plates)))
+        if position is not None:
+            parked.append(position)
+
+    park_time = remove_time = 0.0
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        while len(parked) < int(num_spots * occupancy):
+            arrive()
+        for _ in range(churn):
+            index = rng.randrange(len(parked))
+            parked[index], parked[-1] = parked[-1], parked[index]
+            started = time.perf_counter()
+            level.remove_vehicle_at(parked.pop())  # the spot the lot's plate index resolves to
+            remove_time += time.perf_counter() - started
+
+            started = time.perf_counter()
+            arrive()
+            park_time += time.perf_counter() - started
+    return churn / park_time, churn / remove_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parking spot allocation benchmark under churn")
+    parser.add_argument("--sizes", default="1000,10000,50000", help="comma separated spot counts per level")
+    parser.add_argument("--occupancy", type=float, default=0.9)
+    parser.add_argument("--churn", type=int, default=2000, help="leave/arrive pairs per size")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    print(f"\n📊 Allocation under churn: {args.occupancy:.0%} occupancy, {args.churn:,} leave/arrive pairs")
+    print(f"{'spots':>8}{'park ops/s':>14}{'unpark ops/s':>15}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        park_rate, remove_rate = run(size, args.occupancy, args.churn, random.Random(args.seed))
+        print(f"{size:>8,}{park_rate:>14,.0f}{remove_rate:>15,.0f}")
+
+
+if __name__ == "__main__":
+    main()
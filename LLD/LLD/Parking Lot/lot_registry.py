@@ -0,0 +1,105 @@
+import threading
+from contextlib import contextmanager
+
+from parking_lot_with_different_spots import ParkingLot
+
+# Lot Registry
+# Named ParkingLot instances with explicit lifetimes: create() builds an independent lot under a name, get()
+# hands it out, release() closes it and frees the name. lease() ties a lot to a `with` block, so parallel
+# benchmarks can each build a lot of their own size and tear it down without touching the process singleton.
+# The factory is any callable returning an object with close(), e.g. ParkingLot.create_independent from any
+# of the parking lot modules.
+class LotRegistry:
+    def __init__(self, factory=ParkingLot.create_independent):
+        self.factory = factory
+        self.lock = threading.Lock()
+        self.lots = {}  # name -> lot; None while the lot is being built
+
+    def create(self, name, *args, **kwargs):
+        with self.lock:
+            if name in self.lots:
+                raise ValueError(f"A lot named {name!r} already exists")
+            self.lots[name] = None  # reserve the name; building happens outside the lock
+        try:
+            lot = self.factory(*args, **kwargs)
+        except BaseException:
+            with self.lock:
+                del self.lots[name]
+            raise
+        with self.lock:
+            self.lots[name] = lot
+        return lot
+
+    def get(self, name):
+        with self.lock:
+            lot = self.lots.get(name)
+        if lot is None:
+            raise KeyError(f"No lot named {name!r}")
+        return lot
+
+    def release(self, name):
+        """ Close the lot and forget it; the name can be reused afterwards """
+        with self.lock:
+            lot = self.lots.get(name)
+            if lot is None:
+                raise KeyError(f"No lot named {name!r}")
+            del self.lots[name]
+        lot.close()
+
+    @contextmanager
+    def lease(self, name, *args, **kwargs):
+        lot = self.create(name, *args, **kwargs)
+        try:
+            yield lot
+        finally:
+            self.release(name)
+
+    def names(self):
+        with self.lock:
+            return [name for name, lot in self.lots.items() if lot is not None]
+
+    def close_all(self):
+        for name in self.names():
+            self.release(name)
+
+
+# Demonstration: lots of different sizes built, exercised and torn down concurrently
+if __name__ == "__main__":
+    import contextlib
+    import io
+    import time
+
+    from parking_lot_with_different_spots import VehicleType, Car, Motorcycle, Truck
+
+    VEHICLE_CLASSES = {VehicleType.MOTORCYCLE: Motorcycle, VehicleType.CAR: Car, VehicleType.TRUCK: Truck}
+    registry = LotRegistry()
+    results = {}
+
+    def benchmark(name, num_levels, spots_per_level):
+        with registry.lease(name, num_levels, spots_per_level) as lot:
+            started = time.perf_counter()
+            for i in range(num_levels * spots_per_level):
+                vehicle_type = list(VehicleType)[i % 3]
+                lot.park_vehicle(VEHICLE_CLASSES[vehicle_type](f"{name}-{i}"))
+            results[name] = (num_levels * spots_per_level - sum(map(lot.free_count, VehicleType)),
+                             time.perf_counter() - started)
+
+    sizes = {"small": (1, 30), "medium": (2, 300), "large": (4, 1500)}
+    threads = [threading.Thread(target=benchmark, args=(name, *size)) for name, size in sizes.items()]
+    with contextlib.redirect_stdout(io.StringIO()):
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    for name, (parked, elapsed) in results.items():
+        print(f"🅿️ {name}: parked {parked:,} vehicles in {elapsed * 1000:.1f} ms")
+    print(f"🧹 Lots still registered: {registry.names() or 'none'}")
+
+    # The process-wide singleton now refuses a conflicting shape instead of ignoring it
+    ParkingLot(num_levels=2, spots_per_level=6)
+    try:
+        ParkingLot(num_levels=3, spots_per_level=6)
+    except ValueError as error:
+        print(f"⚠️ {error}")
+    ParkingLot.reset_instance()
+    print(f"♻️ After reset: {ParkingLot(num_levels=3, spots_per_level=6).num_levels} levels")
@@ -0,0 +1,204 @@
+import math
+import threading
+import time
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # settlement falls back to a plain Python loop
+    np = None
+
+from parking_lot_with_different_spots import ParkingLot, VehicleType, Car, Motorcycle, Truck
+
+# Parking fees
+# A Tariff is a set of hourly time bands plus a per-calendar-day cap and a grace period. The engine turns each
+# tariff into a cumulative cost-per-minute table, so the fee for any stay is a handful of table lookups:
+# partial first day + full days in between + partial last day, each clipped to the daily cap. The same
+# formula runs over whole arrays of sessions for end-of-day settlement (vectorized when NumPy is installed).
+
+MINUTES_PER_DAY = 24 * 60
+
+
+# Tariff Class
+class Tariff:
+    def __init__(self, bands, daily_cap, grace_minutes=0):
+        """ bands: [(start_hour, end_hour, rate_per_hour)] covering the whole day """
+        self.bands = bands
+        self.daily_cap = daily_cap
+        self.grace_minutes = grace_minutes
+
+    def minute_rates(self):
+        rates = [None] * MINUTES_PER_DAY
+        for start_hour, end_hour, rate_per_hour in self.bands:
+            for minute in range(int(start_hour * 60), int(end_hour * 60)):
+                rates[minute] = rate_per_hour / 60
+        if None in rates:
+            raise ValueError(f"Tariff bands leave minute {rates.index(None)} of the day without a rate")
+        return rates
+
+
+DEFAULT_TARIFFS = {
+    VehicleType.MOTORCYCLE: Tariff([(0, 7, 0.5), (7, 19, 1.5), (19, 24, 0.75)], daily_cap=10.0, grace_minutes=10),
+    VehicleType.CAR: Tariff([(0, 7, 1.0), (7, 19, 3.0), (19, 24, 1.5)], daily_cap=25.0, grace_minutes=10),
+    VehicleType.TRUCK: Tariff([(0, 7, 2.0), (7, 19, 6.0), (19, 24, 3.0)], daily_cap=60.0, grace_minutes=5),
+}
+
+
+# Tariff Engine (cumulative minute tables per vehicle type)
+class TariffEngine:
+    def __init__(self, tariffs=None, utc_offset=0):
+        self.tariffs = dict(DEFAULT_TARIFFS if tariffs is None else tariffs)
+        self.utc_offset = utc_offset  # seconds added to epoch time to get local wall-clock time
+        rows = max(vehicle_type.value for vehicle_type in VehicleType) + 1
+        # cumulative[row][m] = cost of minutes [0, m) of a day; rows are indexed by VehicleType.value
+        self.cumulative = [[0.0] * (MINUTES_PER_DAY + 1) for _ in range(rows)]
+        self.caps = [0.0] * rows
+        self.grace = [0.0] * rows  # seconds
+        for vehicle_type, tariff in self.tariffs.items():
+            table = self.cumulative[vehicle_type.value]
+            for minute, rate in enumerate(tariff.minute_rates()):
+                table[minute + 1] = table[minute] + rate
+            self.caps[vehicle_type.value] = tariff.daily_cap
+            self.grace[vehicle_type.value] = tariff.grace_minutes * 60
+        if np is not None:
+            self.cumulative_array = np.array(self.cumulative)
+            self.caps_array = np.array(self.caps)
+            self.grace_array = np.array(self.grace)
+
+    def fee(self, vehicle_type, entry_time, exit_time):
+        """ Fee for one stay; every started minute is billed at the rate of the band it falls in """
+        row = VehicleType[vehicle_type.name].value  # by name: the other lot modules number their VehicleType differently
+        if exit_time - entry_time <= self.grace[row]:
+            return 0.0
+        table, cap = self.cumulative[row], self.caps[row]
+        start = math.floor((entry_time + self.utc_offset) / 60)
+        end = max(math.ceil((exit_time + self.utc_offset) / 60), start)
+        first_day = start // MINUTES_PER_DAY
+        last_day = max((end - 1) // MINUTES_PER_DAY, first_day)  # a stay ending at midnight belongs to that day
+        start_minute = start - first_day * MINUTES_PER_DAY
+        end_minute = end - last_day * MINUTES_PER_DAY
+        if first_day == last_day:
+            return round(min(cap, table[end_minute] - table[start_minute]), 2)
+        full_day = min(cap, table[MINUTES_PER_DAY])
+        total = (min(cap, table[MINUTES_PER_DAY] - table[start_minute])
+                 + (last_day - first_day - 1) * full_day
+                 + min(cap, table[end_minute]))
+        return round(total, 2)
+
+    def settle(self, type_codes, entry_times, exit_times):
+        """ Fees for many sessions at once; type_codes are VehicleType values """
+        if np is None:
+            types = {vehicle_type.value: vehicle_type for vehicle_type in VehicleType}
+            return [self.fee(types[code], entry, exit)
+                    for code, entry, exit in zip(type_codes, entry_times, exit_times)]
+
+        rows = np.asarray(type_codes, dtype=np.intp)
+        entries = np.asarray(entry_times, dtype=np.float64)
+        exits = np.asarray(exit_times, dtype=np.float64)
+        start = np.floor((entries + self.utc_offset) / 60).astype(np.int64)
+        end = np.maximum(np.ceil((exits + self.utc_offset) / 60).astype(np.int64), start)
+        first_day = start // MINUTES_PER_DAY
+        last_day = np.maximum((end - 1) // MINUTES_PER_DAY, first_day)
+        start_minute = start - first_day * MINUTES_PER_DAY
+        end_minute = end - last_day * MINUTES_PER_DAY
+
+        table, caps = self.cumulative_array, self.caps_array[rows]
+        at_start = table[rows, start_minute]
+        at_end = table[rows, end_minute]
+        whole_day = table[rows, MINUTES_PER_DAY]
+        same_day = np.minimum(caps, at_end - at_start)
+        spanning = (np.minimum(caps, whole_day - at_start)
+                    + (last_day - first_day - 1) * np.minimum(caps, whole_day)
+                    + np.minimum(caps, at_end))
+        fees = np.where(first_day == last_day, same_day, spanning)
+        fees[exits - entries <= self.grace_array[rows]] = 0.0
+        return np.round(fees, 2)
+
+
+# Parking Billing (registered as a ParkingLot listener)
+class ParkingBilling:
+    def __init__(self, engine=None):
+        self.engine = engine or TariffEngine()
+        self.lock = threading.Lock()
+        self._reset_sessions()
+
+    def _reset_sessions(self):
+        # Column arrays rather than one object per session: cheap to append, cheap to hand to NumPy
+        self.type_codes = array("B")
+        self.entry_times = array("d")
+        self.exit_times = array("d")
+        self.collected = 0.0
+
+    # Listener callbacks
+    def on_park(self, lot, level_position, spot_position, vehicle, entry_time):
+        pass
+
+    def on_unpark(self, lot, level_position, spot_position, vehicle, entry_time):
+        exit_time = lot.clock()
+        fee = self.engine.fee(vehicle.get_vehicle_type(), entry_time, exit_time)
+        with self.lock:
+            self.type_codes.append(vehicle.get_vehicle_type().value)
+            self.entry_times.append(entry_time)
+            self.exit_times.append(exit_time)
+            self.collected += fee
+        print(f"💳 {vehicle.license_plate} owes ${fee:.2f} for {(exit_time - entry_time) / 3600:.1f} h")
+
+    def settle_day(self):
+        """ Re-rate every session closed since the last settlement; returns ({VehicleType: revenue}, collected) """
+        with self.lock:
+            type_codes, entry_times, exit_times = self.type_codes, self.entry_times, self.exit_times
+            collected = self.collected
+            self._reset_sessions()
+        fees = self.engine.settle(type_codes, entry_times, exit_times)
+        if np is not None:
+            codes = np.frombuffer(type_codes, dtype=np.uint8)
+            revenue = {vehicle_type: round(float(fees[codes == vehicle_type.value].sum()), 2)
+                       for vehicle_type in VehicleType}
+        else:
+            revenue = dict.fromkeys(VehicleType, 0.0)
+            for code, fee in zip(type_codes, fees):
+                revenue[VehicleType(code)] += fee
+            revenue = {vehicle_type: round(total, 2) for vehicle_type, total in revenue.items()}
+        return revenue, round(collected, 2)
+
+
+# Demonstration: fees at the exit gate, then end-of-day settlement
+if __name__ == "__main__":
+    import random
+
+    now = [time.mktime((2024, 5, 6, 8, 0, 0, 0, 0, -1))]  # a Monday, 08:00 local time
+    billing = ParkingBilling(TariffEngine(utc_offset=-time.timezone))
+    lot = ParkingLot.create_independent(num_levels=1, spots_per_level=9)
+    lot.clock = lambda: now[0]
+    lot.add_listener(billing)
+
+    lot.park_vehicle(Car("CAR1"))
+    lot.park_vehicle(Motorcycle("BIKE1"))
+    lot.park_vehicle(Truck("TRUCK1"))
+    now[0] += 5 * 60
+    lot.remove_vehicle("BIKE1")  # inside the grace period
+    now[0] += 2.5 * 3600
+    lot.remove_vehicle("CAR1")  # daytime band
+    now[0] += 26 * 3600
+    lot.remove_vehicle("TRUCK1")  # overnight: capped per calendar day
+    revenue, collected = billing.settle_day()
+    print(f"🧾 Settled: {', '.join(f'{t.name} ${amount:.2f}' for t, amount in revenue.items())} "
+          f"(collected at the gates: ${collected:.2f})")
+
+    # Settlement throughput over a large synthetic day, checked against the per-session formula
+    rng = random.Random(7)
+    sessions = 200_000
+    engine = billing.engine
+    type_codes = array("B", (rng.choice(list(VehicleType)).value for _ in range(sessions)))
+    entry_times = array("d", (now[0] + rng.uniform(0, 86_400) for _ in range(sessions)))
+    exit_times = array("d", (entry + rng.expovariate(1 / 7200) for entry in entry_times))
+    started = time.perf_counter()
+    fees = engine.settle(type_codes, entry_times, exit_times)
+    elapsed = time.perf_counter() - started
+    started = time.perf_counter()
+    expected = [engine.fee(VehicleType(code), entry, exit) for code, entry, exit in zip(type_codes, entry_times, exit_times)]
+    loop_elapsed = time.perf_counter() - started
+    mismatches = sum(abs(fee - want) > 0.005 for fee, want in zip(fees, expected))
+    mode = "vectorized with NumPy" if np is not None else "Python loop (NumPy not installed)"
+    print(f"⚡ Settled {sessions:,} sessions in {elapsed * 1000:.1f} ms, {mode}; "
+          f"per-session loop {loop_elapsed * 1000:.1f} ms; {mismatches} mismatches")
@@ -0,0 +1,221 @@
+import bisect
+import os
+import struct
+import threading
+import time
+
+from parking_lot_with_different_spots import ParkingLot, VehicleType, Car, Motorcycle, Truck
+
+# Event-sourced parking ledger
+# Every entry/exit is appended to events.log as a fixed-width binary record. Every `snapshot_every` events
+# the full occupancy is appended to snapshots.bin together with the number of events it covers, so the
+# state at any timestamp is the nearest earlier snapshot plus a short replay of the log after it.
+# The lot notifies listeners after a spot is back in its pool, so with concurrent gates the next vehicle's
+# ENTRY for a spot can be logged before the previous vehicle's EXIT: an EXIT only clears the spot if the
+# plate still matches.
+# Records carry the spot's entry time as stamped by the lot's clock; the ledger's own clock only orders the
+# log for historical queries. Recovery hands the entry times back, so a stay is billed from when it began.
+
+VEHICLE_CLASSES = {VehicleType.MOTORCYCLE: Motorcycle, VehicleType.CAR: Car, VehicleType.TRUCK: Truck}
+
+ENTRY = 1
+EXIT = 2
+
+# timestamp, event, vehicle type, level position, spot position, license plate (padded), entry time (lot clock)
+EVENT = struct.Struct("<dBBHI16sd")
+# timestamp, events covered, number of occupied spots
+SNAPSHOT_HEADER = struct.Struct("<dQI")
+# vehicle type, level position, spot position, license plate, entry timestamp
+SNAPSHOT_ENTRY = struct.Struct("<BHI16sd")
+
+
+def _encode_plate(license_plate):
+    encoded = license_plate.encode()
+    if len(encoded) > 16:
+        raise ValueError(f"License plate {license_plate} does not fit the 16 byte ledger field")
+    return encoded.ljust(16, b"\0")  # padded as struct would, so live and replayed state compare equal
+
+
+def _decode_vehicle(vehicle_type, plate):
+    return VEHICLE_CLASSES[VehicleType(vehicle_type)](plate.rstrip(b"\0").decode())
+
+
+def _apply(occupancy, event, level, spot, vehicle_type, plate, entry_time):
+    if event == ENTRY:
+        occupancy[(level, spot)] = (vehicle_type, plate, entry_time)
+    elif occupancy.get((level, spot), (None, None))[1] == plate:
+        del occupancy[(level, spot)]  # a late EXIT must not remove the vehicle that took the spot since
+
+
+# Parking Ledger (registered as a ParkingLot listener)
+class ParkingLedger:
+    def __init__(self, directory, snapshot_every=10_000, clock=time.time):
+        os.makedirs(directory, exist_ok=True)
+        self.events_path = os.path.join(directory, "events.log")
+        self.snapshots_path = os.path.join(directory, "snapshots.bin")
+        self.snapshot_every = snapshot_every
+        self.clock = clock
+        self.lock = threading.Lock()
+
+        self._truncate_torn_tail(self.events_path, EVENT.size)
+        self.event_count = os.path.getsize(self.events_path) // EVENT.size if os.path.exists(self.events_path) else 0
+        self.snapshots = self._load_snapshot_index()  # [(timestamp, events covered, file offset)]
+        self.occupancy = self._replay(float("inf"))  # {(level, spot): (vehicle type, plate bytes, entry time)}
+        self.events = open(self.events_path, "ab")
+        self.snapshot_file = open(self.snapshots_path, "ab")
+
+    @staticmethod
+    def _truncate_torn_tail(path, record_size):
+        """ A crash mid-write can leave a partial record at the end; drop it """
+        if os.path.exists(path):
+            size = os.path.getsize(path)
+            if size % record_size:
+                with open(path, "r+b") as log:
+                    log.truncate(size - size % record_size)
+
+    def _load_snapshot_index(self):
+        index = []
+        if not os.path.exists(self.snapshots_path):
+            return index
+        with open(self.snapshots_path, "rb") as snapshots:
+            offset = 0
+            while True:
+                header = snapshots.read(SNAPSHOT_HEADER.size)
+                if len(header) < SNAPSHOT_HEADER.size:
+                    break
+                timestamp, covered, count = SNAPSHOT_HEADER.unpack(header)
+                body_size = count * SNAPSHOT_ENTRY.size
+                if len(snapshots.read(body_size)) < body_size or covered > self.event_count:
+                    break  # torn or ahead of the surviving log; ignore it and anything after
+                index.append((timestamp, covered, offset))
+                offset += SNAPSHOT_HEADER.size + body_size
+        with open(self.snapshots_path, "r+b") as snapshots:
+            snapshots.truncate(offset)
+        return index
+
+    # Listener callbacks
+    def on_park(self, lot, level_position, spot_position, vehicle, entry_time):
+        self._append(ENTRY, level_position, spot_position, vehicle, entry_time)
+
+    def on_unpark(self, lot, level_position, spot_position, vehicle, entry_time):
+        self._append(EXIT, level_position, spot_position, vehicle, entry_time)
+
+    def _append(self, event, level_position, spot_position, vehicle, entry_time):
+        plate = _encode_plate(vehicle.license_plate)
+        vehicle_type = vehicle.get_vehicle_type().value
+        with self.lock:
+            timestamp = self.clock()
+            self.events.write(EVENT.pack(timestamp, event, vehicle_type, level_position, spot_position, plate,
+                                         entry_time))
+            self.event_count += 1
+            _apply(self.occupancy, event, level_position, spot_position, vehicle_type, plate, entry_time)
+            if self.event_count % self.snapshot_every == 0:
+                self._write_snapshot(timestamp)
+
+    def _write_snapshot(self, timestamp):
+        # Caller holds self.lock. The log is flushed first so a snapshot never covers events that are not on disk.
+        self.events.flush()
+        offset = self.snapshot_file.tell()
+        parts = [SNAPSHOT_HEADER.pack(timestamp, self.event_count, len(self.occupancy))]
+        parts.extend(SNAPSHOT_ENTRY.pack(vehicle_type, level, spot, plate, entry_time)
+                     for (level, spot), (vehicle_type, plate, entry_time) in self.occupancy.items())
+        self.snapshot_file.write(b"".join(parts))
+        self.snapshot_file.flush()
+        self.snapshots.append((timestamp, self.event_count, offset))
+
+    def flush(self, durable=False):
+        with self.lock:
+            self.events.flush()
+            self.snapshot_file.flush()
+            if durable:
+                os.fsync(self.events.fileno())
+                os.fsync(self.snapshot_file.fileno())
+
+    def close(self):
+        self.flush(durable=True)
+        self.events.close()
+        self.snapshot_file.close()
+
+    def occupancy_at(self, timestamp):
+        """ {(level, spot): (vehicle type, plate, entry time)} as of `timestamp`: nearest snapshot, then replay the log """
+        self.flush()
+        return self._replay(timestamp)
+
+    def _replay(self, timestamp):
+        position = bisect.bisect_right(self.snapshots, (timestamp, float("inf"), float("inf")))
+        occupancy, replay_from = {}, 0
+        if position:
+            _, replay_from, offset = self.snapshots[position - 1]
+            with open(self.snapshots_path, "rb") as snapshots:
+                snapshots.seek(offset)
+                _, _, count = SNAPSHOT_HEADER.unpack(snapshots.read(SNAPSHOT_HEADER.size))
+                body = snapshots.read(count * SNAPSHOT_ENTRY.size)
+            for vehicle_type, level, spot, plate, entry_time in SNAPSHOT_ENTRY.iter_unpack(body):
+                occupancy[(level, spot)] = (vehicle_type, plate, entry_time)
+
+        if os.path.exists(self.events_path):
+            with open(self.events_path, "rb") as events:
+                events.seek(replay_from * EVENT.size)
+                tail = events.read((self.event_count - replay_from) * EVENT.size)
+            for event_time, event, vehicle_type, level, spot, plate, entry_time in EVENT.iter_unpack(tail):
+                if event_time > timestamp:
+                    break
+                _apply(occupancy, event, level, spot, vehicle_type, plate, entry_time)
+        return occupancy
+
+    def vehicles_at(self, timestamp):
+        """ Same as occupancy_at, with Vehicle objects ready for ParkingLot.restore_occupancy """
+        return {location: _decode_vehicle(vehicle_type, plate)
+                for location, (vehicle_type, plate, _) in self.occupancy_at(timestamp).items()}
+
+    def recover(self, lot):
+        """ Rebuild an empty lot from the ledger (original entry times included, so fees survive a restart) """
+        with self.lock:
+            current = dict(self.occupancy)
+        lot.restore_occupancy({location: _decode_vehicle(vehicle_type, plate)
+                               for location, (vehicle_type, plate, _) in current.items()},
+                              {location: entry_time for location, (_, _, entry_time) in current.items()})
+        lot.add_listener(self)
+        return lot
+
+
+# Demonstration: record, "crash", recover, and look back in time
+if __name__ == "__main__":
+    import contextlib
+    import random
+    import tempfile
+
+    directory = tempfile.mkdtemp(prefix="parking-ledger-")
+    ticks = iter(range(1, 10**9))
+    ledger = ParkingLedger(directory, snapshot_every=1000, clock=lambda: float(next(ticks)))
+
+    lot = ParkingLot.create_independent(num_levels=4, spots_per_level=300)
+    lot.add_listener(ledger)
+    rng = random.Random(5)
+    parked = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for i in range(50_000):
+            if parked and rng.random() < 0.45:
+                lot.remove_vehicle(parked.pop(rng.randrange(len(parked))))
+            else:
+                vehicle = VEHICLE_CLASSES[rng.choice(list(VehicleType))](f"CAR{i}")
+                if lot.park_vehicle(vehicle):
+                    parked.append(vehicle.license_plate)
+    ledger.close()
+    print(f"📒 Recorded {ledger.event_count:,} events and {len(ledger.snapshots)} snapshots, {len(parked)} vehicles parked")
+
+    # Simulated restart: reopen the ledger and rebuild a fresh lot from it
+    started = time.perf_counter()
+    reopened = ParkingLedger(directory, snapshot_every=1000)
+    recovered = reopened.recover(ParkingLot.create_independent(num_levels=4, spots_per_level=300))
+    elapsed = time.perf_counter() - started
+    matches = all((spot := recovered.locate_vehicle(plate)) is not None
+                  and spot.entry_time == lot.locate_vehicle(plate).entry_time for plate in parked)
+    print(f"♻️ Recovered {sum(len(plates) for plates in recovered.plate_index)} vehicles in {elapsed * 1000:.1f} ms "
+          f"({'matches' if matches else 'DOES NOT match'} the state before the restart)")
+
+    # Historical occupancy: nearest snapshot plus a short replay
+    started = time.perf_counter()
+    occupied = len(reopened.occupancy_at(12_345.0))
+    print(f"🕰️ Occupancy at t=12345: {occupied} spots (reconstructed in {(time.perf_counter() - started) * 1000:.2f} ms)")
+    reopened.close()
@@ -2,7 +2,11 @@
 
 
 from enum import Enum
-from typing import List
+import threading
+import time
+from typing import List, Optional
+
+from availability_board import AvailabilityBoard
 
 # Enum for Vehicle Types
 class VehicleType(Enum):
@@ -39,21 +43,24 @@ class ParkingSpot:
     def __init__(self, spot_number: int):
         self.spot_number = spot_number
         self.parked_vehicle = None  # Stores the vehicle currently occupying this spot
+        self.entry_time = None  # When the current vehicle parked (epoch seconds)
 
     def is_available(self) -> bool:
         """Returns True if the parking spot is available."""
         return self.parked_vehicle is None
 
-    def park_vehicle(self, vehicle: Vehicle) -> None:
-        """Parks a vehicle in the spot if available."""
+    def park_vehicle(self, vehicle: Vehicle, entry_time: float = None) -> None:
+        """Parks a vehicle in the spot if available and records its entry time."""
         if self.is_available():
             self.parked_vehicle = vehicle
+            self.entry_time = time.time() if entry_time is None else entry_time
         else:
             raise ValueError(f"🚫 Spot {self.spot_number} is already occupied.")
 
     def unpark_vehicle(self) -> None:
         """Removes the vehicle from the spot."""
         self.parked_vehicle = None
+        self.entry_time = None
 
     def get_parked_vehicle(self) -> Vehicle:
         return self.parked_vehicle
@@ -66,6 +73,8 @@ class Level:
     def __init__(self, floor: int, num_spots: int):
         self.floor = floor
         self.parking_spots: List[ParkingSpot] = [ParkingSpot(i) for i in range(num_spots)]
+        self.board = None  # set when the level joins a ParkingLot
+        self.lot = None  # likewise; supplies the clock and tariff
 
     def display_availability(self) -> None:
         """Displays the available and occupied spots on this level."""
@@ -80,9 +89,10 @@ class Level:
             selected_spot = self.parking_spots[spot_number]
 
             if selected_spot.is_available():
-                selected_spot.park_vehicle(vehicle)
+                selected_spot.park_vehicle(vehicle, self.lot.clock() if self.lot else None)
                 print(f"✅ Vehicle {vehicle.license_plate} parked at spot {spot_number} on Level {self.floor - 1}")
-                self.display_availability()
+                if self.board:
+                    self.board.record_park(self.floor - 1)
                 return True
             else:
                 print("🚫 Selected spot is already occupied. Choose another spot.")
@@ -96,10 +106,13 @@ class Level:
             selected_spot = self.parking_spots[spot_number]
 
             if not selected_spot.is_available():
-                vehicle = selected_spot.get_parked_vehicle()
+                vehicle, entry_time = selected_spot.get_parked_vehicle(), selected_spot.entry_time
                 selected_spot.unpark_vehicle()
                 print(f"❌ Vehicle {vehicle.license_plate} removed from spot {spot_number} on Level {self.floor - 1}")
-                self.display_availability()
+                if self.board:
+                    self.board.record_unpark(self.floor - 1)
+                if self.lot:
+                    self.lot.charge(vehicle, entry_time)
                 return True
             else:
                 print("🚫 No vehicle is parked in this spot. Choose another.")
@@ -110,25 +123,53 @@ class Level:
 # Parking Lot Singleton Class
 class ParkingLot:
     _instance = None
-
-    def __init__(self):
-        """Ensures only one instance of ParkingLot exists (Singleton pattern)."""
-        if ParkingLot._instance is not None:
-            raise Exception("🚫 This class is a singleton!")
-        else:
-            ParkingLot._instance = self
-            self.levels: List[Level] = []
+    _lock = threading.Lock()
+
+    def __init__(self, singleton: bool = True):
+        """Ensures only one instance of ParkingLot exists (Singleton pattern); singleton=False builds an independent lot."""
+        self.levels: List[Level] = []
+        self.board = AvailabilityBoard()
+        self.clock = time.time  # source of entry/exit timestamps
+        self.tariff = None  # parking_fees.TariffEngine (anything with fee(vehicle_type, entry, exit)); None: free
+        if singleton:  # published only once fully built, so get_instance() never sees a half-made lot
+            with ParkingLot._lock:
+                if ParkingLot._instance is not None:
+                    raise Exception("🚫 This class is a singleton!")
+                ParkingLot._instance = self
 
     @staticmethod
     def get_instance():
-        """Returns the single instance of the ParkingLot."""
+        """Returns the single instance of the ParkingLot (safe to call from many threads)."""
         if ParkingLot._instance is None:
-            ParkingLot()
+            with ParkingLot._lock:
+                if ParkingLot._instance is None:
+                    ParkingLot._instance = ParkingLot(singleton=False)
         return ParkingLot._instance
 
+    @staticmethod
+    def create_independent():
+        """A lot with its own state, outside the singleton (benchmarks, one lot per site)."""
+        return ParkingLot(singleton=False)
+
+    @staticmethod
+    def reset_instance() -> None:
+        """Closes and drops the singleton so the next get_instance() starts from an empty lot."""
+        with ParkingLot._lock:
+            instance, ParkingLot._instance = ParkingLot._instance, None
+        if instance is not None:
+            instance.close()
+
+    def close(self) -> None:
+        """Stops the availability board publisher."""
+        self.board.stop(final_update=False)
+
     def add_level(self, level: Level) -> None:
         """Adds a new parking level to the parking lot."""
         self.levels.append(level)
+        level.board = self.board
+        level.lot = self
+        free = sum(1 for spot in level.parking_spots if spot.is_available())
+        self.board.register(level.floor - 1, None, len(level.parking_spots), free)
 
     def park_vehicle(self, vehicle: Vehicle, level: int, slot: int) -> bool:
         """Attempts to park a vehicle at the specified level and slot."""
@@ -146,6 +187,15 @@ class ParkingLot:
             print("⚠️ Invalid level selection.")
             return False
 
+    def charge(self, vehicle: Vehicle, entry_time: float) -> Optional[float]:
+        """Prices a finished stay with the lot's tariff (None when the lot does not charge)."""
+        if self.tariff is None:
+            return None
+        exit_time = self.clock()
+        fee = self.tariff.fee(vehicle.get_type(), entry_time, exit_time)
+        print(f"💳 {vehicle.license_plate} owes ${fee:.2f} for {(exit_time - entry_time) / 3600:.1f} h")
+        return fee
+
     def display_availability(self) -> None:
         """Displays the overall parking lot availability."""
         for level in self.levels:
@@ -157,6 +207,13 @@ if __name__ == "__main__":
     parking_lot = ParkingLot.get_instance()
     parking_lot.add_level(Level(1, 5))  # Level 1 with 5 spots
     parking_lot.add_level(Level(2, 5))  # Level 2 with 5 spots
+    parking_lot.board.start()  # Board refreshes in the background, off the park/unpark path
+
+    # Bill stays on a simulated clock
+    from parking_fees import TariffEngine
+    now = [time.mktime((2024, 5, 6, 8, 0, 0, 0, 0, -1))]  # a Monday, 08:00 local time
+    parking_lot.clock = lambda: now[0]
+    parking_lot.tariff = TariffEngine(utc_offset=-time.timezone)
 
     # Create Vehicles
     car1 = Car("ABC123")
@@ -171,9 +228,14 @@ if __name__ == "__main__":
     parking_lot.park_vehicle(bike1, level=0, slot=0)
     parking_lot.park_vehicle(truck1, level=1, slot=4)
 
+    now[0] += 2.5 * 3600
+
     # Remove Vehicles (Manual Slot & Level Selection)
     parking_lot.unpark_vehicle(level=0, slot=1)
     parking_lot.unpark_vehicle(level=1, slot=2)
 
     # Attempt to park again
     parking_lot.park_vehicle(new_car, level=0, slot=3)
+
+    parking_lot.board.stop()  # Final board update
+    parking_lot.display_availability()  # Full spot-by-spot view on demand
@@ -1,5 +1,10 @@
 from enum import Enum
-from typing import List
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+import heapq
+
+from availability_board import AvailabilityBoard
 
 # Enum for Vehicle Types
 class VehicleType(Enum):
@@ -36,21 +41,24 @@ class ParkingSpot:
     def __init__(self, spot_number: int):
         self.spot_number = spot_number
         self.parked_vehicle = None  # Stores the vehicle currently occupying this spot
+        self.entry_time = None  # When the current vehicle parked (epoch seconds)
 
     def is_available(self) -> bool:
         """Returns True if the parking spot is available."""
         return self.parked_vehicle is None
 
-    def park_vehicle(self, vehicle: Vehicle) -> None:
-        """Parks a vehicle in the spot if available."""
+    def park_vehicle(self, vehicle: Vehicle, entry_time: float = None) -> None:
+        """Parks a vehicle in the spot if available and records its entry time."""
         if self.is_available():
             self.parked_vehicle = vehicle
+            self.entry_time = time.time() if entry_time is None else entry_time
         else:
             raise ValueError(f"Spot {self.spot_number} is already occupied.")
 
     def unpark_vehicle(self) -> None:
         """Removes the vehicle from the spot."""
         self.parked_vehicle = None
+        self.entry_time = None
 
     def get_parked_vehicle(self) -> Vehicle:
         return self.parked_vehicle
@@ -63,26 +71,45 @@ class Level:
     def __init__(self, floor: int, num_spots: int):
         self.floor = floor
         self.parking_spots: List[ParkingSpot] = [ParkingSpot(i) for i in range(num_spots)]
+        self.free_spots: List[int] = list(range(num_spots))  # min-heap of free spot numbers (sorted list is a valid heap)
+        self.board = None  # set when the level joins a ParkingLot
+        self.lot = None  # likewise; supplies the clock and tariff
 
-    def park_vehicle(self, vehicle: Vehicle) -> bool:
-        """Finds the next available spot and parks the vehicle."""
-        for spot in self.parking_spots:
-            if spot.is_available():
-                spot.park_vehicle(vehicle)
-                print(f"✅ Vehicle {vehicle.license_plate} parked at spot {spot.get_spot_number()} on Level {self.floor}")
-                self.display_availability()
-                return True
+    def has_free_spot(self) -> bool:
+        return bool(self.free_spots)
+
+    def park_vehicle(self, vehicle: Vehicle) -> Optional[int]:
+        """Parks the vehicle in the lowest numbered free spot and returns that spot number."""
+        if self.free_spots:
+            spot = self.parking_spots[heapq.heappop(self.free_spots)]
+            spot.park_vehicle(vehicle, self.lot.clock() if self.lot else None)
+            print(f"✅ Vehicle {vehicle.license_plate} parked at spot {spot.get_spot_number()} on Level {self.floor}")
+            if self.board:
+                self.board.record_park(self.floor)
+            return spot.get_spot_number()
         print(f"🚫 No parking spots available for {vehicle.license_plate}")
-        return False
+        return None
+
+    def unpark_spot(self, spot_number: int) -> bool:
+        """Removes whatever vehicle is in the given spot."""
+        spot = self.parking_spots[spot_number]
+        if spot.is_available():
+            return False
+        vehicle, entry_time = spot.get_parked_vehicle(), spot.entry_time
+        spot.unpark_vehicle()
+        heapq.heappush(self.free_spots, spot_number)
+        print(f"❌ Vehicle {vehicle.license_plate} left spot {spot_number} on Level {self.floor}")
+        if self.board:
+            self.board.record_unpark(self.floor)
+        if self.lot:
+            self.lot.charge(vehicle, entry_time)
+        return True
 
     def unpark_vehicle(self, vehicle: Vehicle) -> bool:
         """Finds the vehicle and removes it from the parking spot."""
         for spot in self.parking_spots:
             if not spot.is_available() and spot.get_parked_vehicle() == vehicle:
-                spot.unpark_vehicle()
-                print(f"❌ Vehicle {vehicle.license_plate} left spot {spot.get_spot_number()} on Level {self.floor}")
-                self.display_availability()
-                return True
+                return self.unpark_spot(spot.get_spot_number())
         print(f"⚠️ Vehicle {vehicle.license_plate} not found in the parking lot")
         return False
 
@@ -96,42 +123,99 @@ class Level:
 # Parking Lot Singleton Class
 class ParkingLot:
     _instance = None
+    _lock = threading.Lock()
 
-    def __init__(self):
-        """Ensures only one instance of ParkingLot exists (Singleton pattern)."""
-        if ParkingLot._instance is not None:
-            raise Exception("This class is a singleton!")
-        else:
-            ParkingLot._instance = self
-            self.levels: List[Level] = []
+    def __init__(self, singleton: bool = True):
+        """Ensures only one instance of ParkingLot exists (Singleton pattern); singleton=False builds an independent lot."""
+        self.levels: List[Level] = []
+        self.available_levels: List[int] = []  # min-heap of positions of levels with a free spot
+        self.available_level_set = set()  # mirrors available_levels membership
+        self.plate_index: Dict[str, Tuple[int, int]] = {}  # license_plate -> (level position, spot number)
+        self.board = AvailabilityBoard()
+        self.clock = time.time  # source of entry/exit timestamps
+        self.tariff = None  # parking_fees.TariffEngine (anything with fee(vehicle_type, entry, exit)); None: free
+        if singleton:  # published only once fully built, so get_instance() never sees a half-made lot
+            with ParkingLot._lock:
+                if ParkingLot._instance is not None:
+                    raise Exception("This class is a singleton!")
+                ParkingLot._instance = self
 
     @staticmethod
     def get_instance():
-        """Returns the single instance of the ParkingLot."""
+        """Returns the single instance of the ParkingLot (safe to call from many threads)."""
         if ParkingLot._instance is None:
-            ParkingLot()
+            with ParkingLot._lock:
+                if ParkingLot._instance is None:
+                    ParkingLot._instance = ParkingLot(singleton=False)
         return ParkingLot._instance
 
+    @staticmethod
+    def create_independent():
+        """A lot with its own state, outside the singleton (benchmarks, one lot per site)."""
+        return ParkingLot(singleton=False)
+
+    @staticmethod
+    def reset_instance() -> None:
+        """Closes and drops the singleton so the next get_instance() starts from an empty lot."""
+        with ParkingLot._lock:
+            instance, ParkingLot._instance = ParkingLot._instance, None
+        if instance is not None:
+            instance.close()
+
+    def close(self) -> None:
+        """Stops the availability board publisher."""
+        self.board.stop(final_update=False)
+
     def add_level(self, level: Level) -> None:
         """Adds a new parking level to the parking lot."""
         self.levels.append(level)
+        level.board = self.board
+        level.lot = self
+        self.board.register(level.floor, None, len(level.parking_spots), len(level.free_spots))
+        self._mark_available(len(self.levels) - 1)
+
+    def _mark_available(self, position: int) -> None:
+        if position not in self.available_level_set and self.levels[position].has_free_spot():
+            self.available_level_set.add(position)
+            heapq.heappush(self.available_levels, position)
 
     def park_vehicle(self, vehicle: Vehicle) -> bool:
-        """Attempts to park a vehicle in the next available spot."""
-        for level in self.levels:
-            if level.park_vehicle(vehicle):
-                return True
+        """Parks the vehicle on the lowest level that still has a free spot."""
+        if vehicle.license_plate in self.plate_index:
+            print(f"⚠️ Vehicle {vehicle.license_plate} is already parked")
+            return False
+        if self.available_levels:
+            position = self.available_levels[0]
+            level = self.levels[position]
+            self.plate_index[vehicle.license_plate] = (position, level.park_vehicle(vehicle))
+            if not level.has_free_spot():
+                heapq.heappop(self.available_levels)
+                self.available_level_set.discard(position)
+            return True
         print(f"🚫 No parking spots available for {vehicle.license_plate}")
         return False
 
     def unpark_vehicle(self, vehicle: Vehicle) -> bool:
-        """Attempts to remove a vehicle from the parking lot."""
-        for level in self.levels:
-            if level.unpark_vehicle(vehicle):
+        """Removes a vehicle from the parking lot, resolving its spot through the plate index."""
+        location = self.plate_index.get(vehicle.license_plate)
+        if location is not None:
+            position, spot_number = location
+            if self.levels[position].unpark_spot(spot_number):
+                del self.plate_index[vehicle.license_plate]
+                self._mark_available(position)
                 return True
         print(f"⚠️ Vehicle {vehicle.license_plate} not found in the parking lot")
         return False
 
+    def charge(self, vehicle: Vehicle, entry_time: float) -> Optional[float]:
+        """Prices a finished stay with the lot's tariff (None when the lot does not charge)."""
+        if self.tariff is None:
+            return None
+        exit_time = self.clock()
+        fee = self.tariff.fee(vehicle.get_type(), entry_time, exit_time)
+        print(f"💳 {vehicle.license_plate} owes ${fee:.2f} for {(exit_time - entry_time) / 3600:.1f} h")
+        return fee
+
     def display_availability(self) -> None:
         """Displays the overall parking lot availability."""
         for level in self.levels:
@@ -144,6 +228,13 @@ if __name__ == "__main__":
    
     parking_lot.add_level(Level(1, 5))  # Level 1 with 5 spots
     parking_lot.add_level(Level(2, 5))  # Level 2 with 5 spots
+    parking_lot.board.start()  # Board refreshes in the background, off the park/unpark path
+
+    # Bill stays on a simulated clock
+    from parking_fees import TariffEngine
+    now = [time.mktime((2024, 5, 6, 8, 0, 0, 0, 0, -1))]  # a Monday, 08:00 local time
+    parking_lot.clock = lambda: now[0]
+    parking_lot.tariff = TariffEngine(utc_offset=-time.timezone)
 
     # Create Vehicles
     car1 = Car("ABC123")
@@ -159,6 +250,8 @@ if __name__ == "__main__":
     parking_lot.park_vehicle(truck1)
     parking_lot.park_vehicle(truck1)
     parking_lot.park_vehicle(truck1)
+    now[0] += 2.5 * 3600
+
     # Remove Vehicles
     parking_lot.unpark_vehicle(car1)
     parking_lot.unpark_vehicle(bike1)
@@ -166,3 +259,5 @@ if __name__ == "__main__":
     # Attempt to park again
     parking_lot.park_vehicle(new_car)
 
+    parking_lot.board.stop()  # Final board update
+
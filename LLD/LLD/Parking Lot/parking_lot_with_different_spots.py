@@ -1,6 +1,11 @@
-from threading import Lock
+from threading import Lock, local
 from enum import Enum
 from abc import ABC, abstractmethod
+import heapq
+import itertools
+import time
+
+from availability_board import AvailabilityBoard
 
 # Enum for Vehicle Types
 class VehicleType(Enum):
@@ -46,12 +51,18 @@ class ParkingSpot:
         self.vehicle_type = vehicle_type
         self.occupied = False
         self.vehicle = None
+        self.entry_time = None  # When the current vehicle parked (epoch seconds)
         self.lock = Lock()
 
-    def park_vehicle(self, vehicle):
+    def fits(self, vehicle):
+        """ A vehicle fits any spot of its own size or larger """
+        return vehicle.get_vehicle_type().value <= self.vehicle_type.value
+
+    def park_vehicle(self, vehicle, entry_time=None):
         with self.lock:
-            if not self.occupied and vehicle.get_vehicle_type() == self.vehicle_type:
+            if not self.occupied and self.fits(vehicle):
                 self.vehicle = vehicle
+                self.entry_time = time.time() if entry_time is None else entry_time
                 self.occupied = True
                 return True
             return False
@@ -61,6 +72,7 @@ class ParkingSpot:
             if self.occupied:
                 vehicle = self.vehicle
                 self.vehicle = None
+                self.entry_time = None
                 self.occupied = False
                 return vehicle
             return None
@@ -68,12 +80,70 @@ class ParkingSpot:
     def is_available(self):
         return not self.occupied
 
+# Spot sizes, smallest first: a spot's size is the VehicleType it was built for
+SPOT_SIZES = sorted(VehicleType, key=lambda vehicle_type: vehicle_type.value)
+
+# Allocation Strategies
+# A strategy names the spot sizes a vehicle may take, in order of preference, and may veto a size based on
+# the lot's current free counts. The lot then pops from the ordered free pools of each allowed size in turn,
+# so allocation cost depends on the number of sizes, not the number of spots.
+class AllocationStrategy(ABC):
+    @abstractmethod
+    def spot_sizes(self, vehicle_type):
+        pass
+
+    def allows(self, lot, vehicle_type, spot_size):
+        return True
+
+class ExactFitStrategy(AllocationStrategy):
+    """ Only spots built for the vehicle's own type (the original behaviour) """
+    def spot_sizes(self, vehicle_type):
+        return [vehicle_type]
+
+class SmallestFittingStrategy(AllocationStrategy):
+    """ The smallest free spot the vehicle fits in """
+    def spot_sizes(self, vehicle_type):
+        return [size for size in SPOT_SIZES if size.value >= vehicle_type.value]
+
+class OverflowWithPenaltyStrategy(SmallestFittingStrategy):
+    """ Overflow into larger spots, unless the penalty (size steps x scarcity of that size) gets too high """
+    def __init__(self, max_penalty=4.0):
+        self.max_penalty = max_penalty
+
+    def penalty(self, lot, vehicle_type, spot_size):
+        free = lot.free_count(spot_size)
+        if not free:
+            return float("inf")
+        return (spot_size.value - vehicle_type.value) * lot.capacity(spot_size) / free
+
+    def allows(self, lot, vehicle_type, spot_size):
+        return spot_size == vehicle_type or self.penalty(lot, vehicle_type, spot_size) <= self.max_penalty
+
+class ReservedQuotaStrategy(SmallestFittingStrategy):
+    """ Overflow into larger spots, but always keep a share of each size for its own vehicle type """
+    def __init__(self, reserved_share=0.25):
+        self.reserved_share = reserved_share
+
+    def allows(self, lot, vehicle_type, spot_size):
+        # A soft quota: two gates may both pass the check for the last unreserved spot
+        return spot_size == vehicle_type or lot.free_count(spot_size) > self.reserved_share * lot.capacity(spot_size)
+
+# Each gate (thread) gets its own home stripe, so concurrent gates start popping from different pools
+_gate = local()
+_gate_numbers = itertools.count()
+
+def _gate_number():
+    if not hasattr(_gate, "number"):
+        _gate.number = next(_gate_numbers)
+    return _gate.number
+
 # Level Class
 class Level:
-    def __init__(self, level_id, num_spots):
+    POOL_STRIPES = 4
+
+    def __init__(self, level_id, num_spots, stripes=POOL_STRIPES):
         self.level_id = level_id
         self.spots = []
-        self.lock = Lock()
 
         # Creating spots (equal distribution for each type)
         for i in range(num_spots // 3):
@@ -83,29 +153,84 @@ class Level:
         for i in range(2 * num_spots // 3, num_spots):
             self.spots.append(ParkingSpot(f"{level_id}-T-{i}", VehicleType.TRUCK))
 
-    def park_vehicle(self, vehicle):
-        with self.lock:
-            for spot in self.spots:
-                if spot.is_available() and spot.vehicle_type == vehicle.get_vehicle_type():
-                    if spot.park_vehicle(vehicle):
-                        print(f"✅ Vehicle {vehicle.license_plate} parked at spot {spot.spot_id}")
-                        return True
-        return False
+        # Free spot pools: per vehicle type, `stripes` min-heaps of positions in self.spots, each with its own
+        # lock. A spot always lives in stripe (position % stripes); gates only hold a stripe lock for one heap op.
+        self.stripes = stripes
+        self.capacity = {spot_size: 0 for spot_size in SPOT_SIZES}
+        for spot in self.spots:
+            self.capacity[spot.vehicle_type] += 1
+        self.free_spots = {vehicle_type: [[] for _ in range(stripes)] for vehicle_type in VehicleType}
+        self.pool_locks = {vehicle_type: [Lock() for _ in range(stripes)] for vehicle_type in VehicleType}
+        for position, spot in enumerate(self.spots):
+            self.free_spots[spot.vehicle_type][position % stripes].append(position)  # ascending, so valid heaps
+
+    def free_count(self, vehicle_type):
+        return sum(len(pool) for pool in self.free_spots[vehicle_type])
+
+    def rebuild_free_pools(self):
+        """ Recompute the free pools from spot state (used when restoring a lot, not on the hot path) """
+        for vehicle_type in VehicleType:
+            for stripe in range(self.stripes):
+                self.free_spots[vehicle_type][stripe] = []
+        for position, spot in enumerate(self.spots):
+            if spot.is_available():
+                self.free_spots[spot.vehicle_type][position % self.stripes].append(position)
+
+    def _claim_position(self, vehicle_type):
+        """ Pop a free position, starting at this gate's home stripe and stealing from the others when empty """
+        pools = self.free_spots[vehicle_type]
+        locks = self.pool_locks[vehicle_type]
+        home = _gate_number() % self.stripes
+        for offset in range(self.stripes):
+            stripe = (home + offset) % self.stripes
+            if not pools[stripe]:
+                continue  # unlocked peek; rechecked under the stripe lock
+            with locks[stripe]:
+                if pools[stripe]:
+                    return heapq.heappop(pools[stripe])
+        return None
+
+    def park_vehicle(self, vehicle, entry_time=None, spot_size=None):
+        """ Returns the position of the spot the vehicle was parked in, or None; spot_size defaults to an exact fit """
+        position = self._claim_position(spot_size or vehicle.get_vehicle_type())
+        if position is None:
+            return None
+        # The popped position is owned by this gate alone; the spot lock makes the hand-over atomic
+        spot = self.spots[position]
+        if spot.park_vehicle(vehicle, entry_time):
+            print(f"✅ Vehicle {vehicle.license_plate} parked at spot {spot.spot_id}")
+            return position
+        self._release_position(spot.vehicle_type, position)
+        return None
+
+    def _release_position(self, vehicle_type, position):
+        stripe = position % self.stripes
+        with self.pool_locks[vehicle_type][stripe]:
+            heapq.heappush(self.free_spots[vehicle_type][stripe], position)
+
+    def remove_vehicle_at(self, position):
+        """ Frees the spot at a known position (as recorded by the lot's plate index) """
+        spot = self.spots[position]
+        removed_vehicle = spot.remove_vehicle()
+        if removed_vehicle:
+            self._release_position(spot.vehicle_type, position)
+            print(f"❌ Vehicle {removed_vehicle.license_plate} left spot {spot.spot_id}")
+        return removed_vehicle
 
     def remove_vehicle(self, license_plate):
-        with self.lock:
-            for spot in self.spots:
-                if spot.occupied and spot.vehicle.license_plate == license_plate:
-                    removed_vehicle = spot.remove_vehicle()
-                    print(f"❌ Vehicle {license_plate} left spot {spot.spot_id}")
-                    return removed_vehicle
+        """ Scans for the plate; the lot resolves plates through its index and uses remove_vehicle_at """
+        for position, spot in enumerate(self.spots):
+            vehicle = spot.vehicle
+            if vehicle is not None and vehicle.license_plate == license_plate:
+                return self.remove_vehicle_at(position)
         return None
 
     def display_level(self):
         print(f"\n📍 **Level {self.level_id} Status:**")
         for spot in self.spots:
-            if spot.occupied:
-                print(f"🟢 {spot.spot_id} → {spot.vehicle.license_plate}")
+            vehicle = spot.vehicle  # read once: another gate may free the spot mid-render
+            if vehicle:
+                print(f"🟢 {spot.spot_id} → {vehicle.license_plate}")
             else:
                 print(f"🔴 {spot.spot_id} → [Empty]")
 
@@ -113,33 +238,200 @@ class Level:
 class ParkingLot:
     _instance = None
     _lock = Lock()
+    PLATE_STRIPES = 16
 
-    def __new__(cls, num_levels=1, spots_per_level=10):
+    def __new__(cls, num_levels=None, spots_per_level=None, strategy=None):
         with cls._lock:
             if cls._instance is None:
-                cls._instance = super(ParkingLot, cls).__new__(cls)
-                cls._instance.num_levels = num_levels
-                cls._instance.levels = [Level(i, spots_per_level) for i in range(num_levels)]
+                cls._instance = cls._build(num_levels or 1, spots_per_level or 10, strategy)
+            else:
+                cls._instance._check_config(num_levels, spots_per_level, strategy)
         return cls._instance
 
-    def park_vehicle(self, vehicle):
+    def _check_config(self, num_levels, spots_per_level, strategy):
+        """ Asking the singleton for a different shape is an error, not a silent no-op """
+        conflicts = []
+        if num_levels is not None and num_levels != self.num_levels:
+            conflicts.append(f"num_levels={num_levels} (have {self.num_levels})")
+        if spots_per_level is not None and spots_per_level != self.spots_per_level:
+            conflicts.append(f"spots_per_level={spots_per_level} (have {self.spots_per_level})")
+        if strategy is not None and type(strategy) is not type(self.strategy):
+            conflicts.append(f"strategy={type(strategy).__name__} (have {type(self.strategy).__name__})")
+        if conflicts:
+            raise ValueError(f"ParkingLot already exists; conflicting {', '.join(conflicts)}. "
+                             f"Use create_independent() or reset_instance() first")
+
+    @classmethod
+    def reset_instance(cls):
+        """ Close and drop the singleton so the next ParkingLot(...) builds a fresh lot """
+        with cls._lock:
+            instance, cls._instance = cls._instance, None
+        if instance is not None:
+            instance.close()
+
+    @classmethod
+    def _build(cls, num_levels, spots_per_level, strategy=None):
+        lot = super(ParkingLot, cls).__new__(cls)
+        lot.num_levels = num_levels
+        lot.spots_per_level = spots_per_level
+        lot.levels = [Level(i, spots_per_level) for i in range(num_levels)]
+        lot.strategy = strategy or ExactFitStrategy()
+        lot.listeners = []  # objects with on_park(lot, level_position, spot_position, vehicle, entry_time) / on_unpark(same)
+        lot.clock = time.time  # source of entry/exit timestamps; simulations swap in their own
+        lot._init_level_index()
+        lot._init_board()
+        return lot
+
+    @classmethod
+    def create_independent(cls, num_levels=1, spots_per_level=10, strategy=None):
+        """ A lot with its own state, outside the process-wide singleton (one per site in a multi-lot service) """
+        return cls._build(num_levels, spots_per_level, strategy)
+
+    def close(self):
+        """ Stop the board publisher; the lot's state stays readable """
+        self.board.stop(final_update=False)
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def restore_occupancy(self, occupancy, entry_times=None):
+        """ Load {(level position, spot position): vehicle} into an empty lot and rebuild its pools and indexes """
+        entry_times = entry_times or {}
+        for location, vehicle in occupancy.items():
+            level_position, spot_position = location
+            spot = self.levels[level_position].spots[spot_position]
+            if not spot.park_vehicle(vehicle, entry_times.get(location)):
+                raise ValueError(f"Cannot restore {vehicle.license_plate} into spot {level_position}-{spot_position}")
         for level in self.levels:
-            if level.park_vehicle(vehicle):
-                self.display_board()  # Display updated parking status
-                return True
+            level.rebuild_free_pools()
+        self._init_level_index()
+        for (level_position, spot_position), vehicle in occupancy.items():
+            stripe = self._plate_stripe(vehicle.license_plate)
+            self.plate_index[stripe][vehicle.license_plate] = (level_position, spot_position)
+        self._refresh_board()  # the running board (publisher, output, start/stop state) keeps serving
+
+    def free_count(self, spot_size):
+        return sum(level.free_count(spot_size) for level in self.levels)
+
+    def capacity(self, spot_size):
+        return sum(level.capacity[spot_size] for level in self.levels)
+
+    def _init_level_index(self):
+        """ Per vehicle type, a min-heap of level positions that still have a free spot of that type """
+        self.index_lock = Lock()
+        # license_plate -> (level position, spot position); None while the vehicle is being parked.
+        # Striped by plate hash so gates handling different vehicles rarely share a lock.
+        self.plate_index = [{} for _ in range(self.PLATE_STRIPES)]
+        self.plate_locks = [Lock() for _ in range(self.PLATE_STRIPES)]
+        self.available_levels = {vehicle_type: [] for vehicle_type in VehicleType}
+        self.available_level_sets = {vehicle_type: set() for vehicle_type in VehicleType}
+        for position in range(len(self.levels)):
+            for vehicle_type in VehicleType:
+                self._mark_available(position, vehicle_type)
+
+    def _init_board(self, refresh_interval=1.0):
+        self.board = AvailabilityBoard(refresh_interval)
+        self._refresh_board()
+
+    def _refresh_board(self):
+        """ Set the board's counters to the levels' current free counts, in place """
+        for level in self.levels:
+            for spot_size in SPOT_SIZES:
+                self.board.register(level.level_id, spot_size, level.capacity[spot_size], level.free_count(spot_size))
+
+    def _mark_available(self, position, vehicle_type):
+        # Caller holds index_lock (or is still constructing the lot)
+        if position not in self.available_level_sets[vehicle_type] and self.levels[position].free_count(vehicle_type):
+            self.available_level_sets[vehicle_type].add(position)
+            heapq.heappush(self.available_levels[vehicle_type], position)
+
+    def _first_available_level(self, vehicle_type):
+        # Caller holds index_lock; entries for levels marked full are dropped lazily
+        heap = self.available_levels[vehicle_type]
+        while heap and heap[0] not in self.available_level_sets[vehicle_type]:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def _mark_full_if_empty(self, position, vehicle_type):
+        if self.levels[position].free_count(vehicle_type):
+            return  # still has room; skip the lot-wide lock
+        with self.index_lock:
+            if not self.levels[position].free_count(vehicle_type):
+                self.available_level_sets[vehicle_type].discard(position)
+
+    def _plate_stripe(self, license_plate):
+        return hash(license_plate) % self.PLATE_STRIPES
+
+    def park_vehicle(self, vehicle):
+        # Reserve the plate first so the same vehicle can't be parked twice by two gates
+        stripe = self._plate_stripe(vehicle.license_plate)
+        plates, plate_lock = self.plate_index[stripe], self.plate_locks[stripe]
+        with plate_lock:
+            if vehicle.license_plate in plates:
+                print(f"⚠️ Vehicle {vehicle.license_plate} is already parked")
+                return False
+            plates[vehicle.license_plate] = None
+
+        vehicle_type = vehicle.get_vehicle_type()
+        for spot_size in self.strategy.spot_sizes(vehicle_type):
+            if not self.strategy.allows(self, vehicle_type, spot_size):
+                continue
+            while True:
+                with self.index_lock:
+                    position = self._first_available_level(spot_size)
+                if position is None:
+                    break
+                entry_time = self.clock()
+                spot_position = self.levels[position].park_vehicle(vehicle, entry_time, spot_size)
+                self._mark_full_if_empty(position, spot_size)
+                if spot_position is not None:
+                    self.board.record_park(self.levels[position].level_id, spot_size)
+                    # Listeners hear of the entry before the plate can be found, so its exit cannot overtake it
+                    for listener in self.listeners:
+                        listener.on_park(self, position, spot_position, vehicle, entry_time)
+                    with plate_lock:
+                        plates[vehicle.license_plate] = (position, spot_position)
+                    return True
+
+        with plate_lock:
+            del plates[vehicle.license_plate]
         print(f"🚫 No parking spots available for {vehicle.license_plate}")
         return False
 
+    def locate_vehicle(self, license_plate):
+        """ O(1) exit gate lookup: the ParkingSpot holding this plate, or None """
+        stripe = self._plate_stripe(license_plate)
+        with self.plate_locks[stripe]:
+            location = self.plate_index[stripe].get(license_plate)
+        if location is None:
+            return None
+        level_position, spot_position = location
+        return self.levels[level_position].spots[spot_position]
+
     def remove_vehicle(self, license_plate):
-        for level in self.levels:
-            removed_vehicle = level.remove_vehicle(license_plate)
-            if removed_vehicle:
-                self.display_board()  # Display updated parking status
-                return True
-        print(f"⚠️ Vehicle {license_plate} not found in the parking lot")
-        return False
+        stripe = self._plate_stripe(license_plate)
+        with self.plate_locks[stripe]:
+            location = self.plate_index[stripe].get(license_plate)
+            if location is not None:
+                del self.plate_index[stripe][license_plate]
+        if location is None:
+            print(f"⚠️ Vehicle {license_plate} not found in the parking lot")
+            return False
+
+        level_position, spot_position = location
+        # Safe to read before freeing: the plate is out of the index, so no other gate can touch this spot
+        spot = self.levels[level_position].spots[spot_position]
+        entry_time, spot_size = spot.entry_time, spot.vehicle_type
+        removed_vehicle = self.levels[level_position].remove_vehicle_at(spot_position)
+        with self.index_lock:
+            self._mark_available(level_position, spot_size)
+        self.board.record_unpark(self.levels[level_position].level_id, spot_size)
+        for listener in self.listeners:
+            listener.on_unpark(self, level_position, spot_position, removed_vehicle, entry_time)
+        return True
 
     def display_board(self):
+        """ Full spot-by-spot listing, on demand; the availability board covers routine updates """
         print("\n📢 **Parking Lot Status:**")
         for level in self.levels:
             level.display_level()
@@ -150,6 +442,7 @@ if __name__ == "__main__":
     # Create a Parking Lot with 2 Levels, Each Level having 6 Spots
     parking_lot = ParkingLot(num_levels=2, spots_per_level=6)
     parking_lot = ParkingLot(num_levels=2, spots_per_level=6)
+    parking_lot.board.start()  # Board refreshes in the background, off the park/unpark path
     # Create Vehicles
     car1 = Car("ABC123")
     car2 = Car("XYZ789")
@@ -171,5 +464,8 @@ if __name__ == "__main__":
     # Attempt to park again
     parking_lot.park_vehicle(Car("NEW456"))
 
+    parking_lot.board.stop()  # Final board update
+    parking_lot.display_board()
+
 
 
@@ -0,0 +1,241 @@
+import math
+import multiprocessing
+import threading
+import zlib
+
+from parking_lot_with_different_spots import ParkingLot, VehicleType, Car, Motorcycle, Truck
+
+# Multi-lot parking service
+# Many independent ParkingLots (one per site) behind one routing layer. A CapacityIndex keeps per-site,
+# per-VehicleType free counters and a uniform grid holding only the sites that currently have room for each
+# type, so "nearest site with a free TRUCK spot" searches outward from the caller's cell instead of
+# scanning every site. ShardedParkingService spreads the sites over worker processes and keeps the
+# index in the routing process.
+
+VEHICLE_CLASSES = {VehicleType.MOTORCYCLE: Motorcycle, VehicleType.CAR: Car, VehicleType.TRUCK: Truck}
+
+
+# Capacity Index (counters + spatial grid of sites with capacity, per vehicle type)
+class CapacityIndex:
+    def __init__(self, cell_size=1.0):
+        self.cell_size = cell_size
+        self.lock = threading.Lock()
+        self.locations = {}  # site_id -> (x, y)
+        self.free = {}  # site_id -> {VehicleType: free spots}
+        self.cells = {vehicle_type: {} for vehicle_type in VehicleType}  # type -> {(cx, cy): set(site_id)}
+        self.bounds = None  # (min_cx, min_cy, max_cx, max_cy) over all sites
+
+    def _cell(self, x, y):
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def add_site(self, site_id, x, y, free_counts):
+        with self.lock:
+            self.locations[site_id] = (x, y)
+            self.free[site_id] = dict.fromkeys(VehicleType, 0)
+            cx, cy = self._cell(x, y)
+            if self.bounds is None:
+                self.bounds = (cx, cy, cx, cy)
+            else:
+                min_cx, min_cy, max_cx, max_cy = self.bounds
+                self.bounds = (min(min_cx, cx), min(min_cy, cy), max(max_cx, cx), max(max_cy, cy))
+            for vehicle_type, count in free_counts.items():
+                self._set_free(site_id, vehicle_type, count)
+
+    def _set_free(self, site_id, vehicle_type, count):
+        # Caller holds self.lock; only 0 <-> non-zero transitions touch the grid
+        had_room = self.free[site_id][vehicle_type] > 0
+        self.free[site_id][vehicle_type] = count
+        if had_room == (count > 0):
+            return
+        cell = self._cell(*self.locations[site_id])
+        sites = self.cells[vehicle_type]
+        if count > 0:
+            sites.setdefault(cell, set()).add(site_id)
+        else:
+            sites[cell].discard(site_id)
+            if not sites[cell]:
+                del sites[cell]
+
+    def update(self, site_id, vehicle_type, delta):
+        with self.lock:
+            self._set_free(site_id, vehicle_type, self.free[site_id][vehicle_type] + delta)
+
+    def set_counts(self, site_id, free_counts):
+        with self.lock:
+            for vehicle_type, count in free_counts.items():
+                self._set_free(site_id, vehicle_type, count)
+
+    def nearest(self, vehicle_type, x, y, exclude=()):
+        """ Closest site with a free spot of this type: search grid rings outward, stop once no closer cell can exist """
+        with self.lock:
+            sites = self.cells[vehicle_type]
+            if not sites or self.bounds is None:
+                return None
+            cx, cy = self._cell(x, y)
+            min_cx, min_cy, max_cx, max_cy = self.bounds
+            max_ring = max(abs(cx - min_cx), abs(cx - max_cx), abs(cy - min_cy), abs(cy - max_cy))
+            best_site, best_distance = None, math.inf
+            for ring in range(max_ring + 1):
+                # Anything in ring r+1 or beyond is at least r cells away
+                if best_distance <= ring * self.cell_size - self.cell_size:
+                    break
+                for cell in self._ring(cx, cy, ring):
+                    for site_id in sites.get(cell, ()):
+                        if site_id in exclude:
+                            continue
+                        sx, sy = self.locations[site_id]
+                        distance = math.hypot(sx - x, sy - y)
+                        if distance < best_distance:
+                            best_site, best_distance = site_id, distance
+            return best_site
+
+    @staticmethod
+    def _ring(cx, cy, ring):
+        if ring == 0:
+            yield (cx, cy)
+            return
+        for dx in range(-ring, ring + 1):
+            yield (cx + dx, cy - ring)
+            yield (cx + dx, cy + ring)
+        for dy in range(-ring + 1, ring):
+            yield (cx - ring, cy + dy)
+            yield (cx + ring, cy + dy)
+
+
+# Parking Service (many lots in one process)
+class ParkingService:
+    def __init__(self, cell_size=1.0):
+        self.lots = {}  # site_id -> ParkingLot
+        self.index = CapacityIndex(cell_size)
+        self.site_of_lot = {}  # id(lot) -> site_id, for listener callbacks
+
+    def add_site(self, site_id, x, y, num_levels, spots_per_level):
+        lot = ParkingLot.create_independent(num_levels, spots_per_level)
+        self.lots[site_id] = lot
+        self.site_of_lot[id(lot)] = site_id
+        self.index.add_site(site_id, x, y, {vehicle_type: lot.free_count(vehicle_type) for vehicle_type in VehicleType})
+        lot.add_listener(self)
+        return lot
+
+    # Listener callbacks: keep the index counters in step with every lot (by the size of the spot taken)
+    def on_park(self, lot, level_position, spot_position, vehicle, entry_time):
+        spot_size = lot.levels[level_position].spots[spot_position].vehicle_type
+        self.index.update(self.site_of_lot[id(lot)], spot_size, -1)
+
+    def on_unpark(self, lot, level_position, spot_position, vehicle, entry_time):
+        spot_size = lot.levels[level_position].spots[spot_position].vehicle_type
+        self.index.update(self.site_of_lot[id(lot)], spot_size, +1)
+
+    def nearest_available(self, vehicle_type, x, y):
+        return self.index.nearest(vehicle_type, x, y)
+
+    def park_nearest(self, vehicle, x, y):
+        """ Park at the closest site with room; returns the site id or None when every site is full """
+        tried = set()
+        while True:
+            site_id = self.index.nearest(vehicle.get_vehicle_type(), x, y, exclude=tried)
+            if site_id is None:
+                print(f"🚫 No site has a free {vehicle.get_vehicle_type().name} spot for {vehicle.license_plate}")
+                return None
+            if self.lots[site_id].park_vehicle(vehicle):
+                return site_id
+            tried.add(site_id)  # lost a race for the last spot, or plate already parked there
+
+    def remove_vehicle(self, site_id, license_plate):
+        return self.lots[site_id].remove_vehicle(license_plate)
+
+
+# Shard worker: owns a ParkingService for its share of the sites and answers commands over a pipe
+def _shard_worker(connection):
+    service = ParkingService()
+    while True:
+        command, *payload = connection.recv()
+        if command == "stop":
+            connection.close()
+            return
+        if command == "add_site":
+            site_id, x, y, num_levels, spots_per_level = payload
+            service.add_site(site_id, x, y, num_levels, spots_per_level)
+            ok = True
+        elif command == "park":
+            site_id, vehicle_type, license_plate = payload
+            ok = service.lots[site_id].park_vehicle(VEHICLE_CLASSES[vehicle_type](license_plate))
+        else:  # "remove"
+            site_id, license_plate = payload
+            ok = service.remove_vehicle(site_id, license_plate)
+        lot = service.lots[site_id]
+        connection.send((ok, {vehicle_type: lot.free_count(vehicle_type) for vehicle_type in VehicleType}))
+
+
+# Sharded Parking Service (sites spread over worker processes, routing index kept here)
+class ShardedParkingService:
+    def __init__(self, num_shards=2, cell_size=1.0):
+        self.index = CapacityIndex(cell_size)
+        self.shard_of_site = {}
+        self.workers = []
+        for _ in range(num_shards):
+            parent_end, child_end = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_shard_worker, args=(child_end,), daemon=True)
+            process.start()
+            self.workers.append((process, parent_end, threading.Lock()))
+
+    def _shard(self, site_id):
+        return zlib.crc32(str(site_id).encode()) % len(self.workers)  # stable across processes, unlike hash()
+
+    def _call(self, site_id, *command):
+        _, connection, lock = self.workers[self.shard_of_site[site_id]]
+        with lock:
+            connection.send(command)
+            ok, free_counts = connection.recv()
+        self.index.set_counts(site_id, free_counts)
+        return ok
+
+    def add_site(self, site_id, x, y, num_levels, spots_per_level):
+        self.shard_of_site[site_id] = self._shard(site_id)
+        self.index.add_site(site_id, x, y, {})
+        self._call(site_id, "add_site", site_id, x, y, num_levels, spots_per_level)
+
+    def park_nearest(self, vehicle, x, y):
+        tried = set()
+        while True:
+            site_id = self.index.nearest(vehicle.get_vehicle_type(), x, y, exclude=tried)
+            if site_id is None:
+                print(f"🚫 No site has a free {vehicle.get_vehicle_type().name} spot for {vehicle.license_plate}")
+                return None
+            if self._call(site_id, "park", site_id, vehicle.get_vehicle_type(), vehicle.license_plate):
+                return site_id
+            tried.add(site_id)
+
+    def remove_vehicle(self, site_id, license_plate):
+        return self._call(site_id, "remove", site_id, license_plate)
+
+    def close(self):
+        for process, connection, lock in self.workers:
+            with lock:
+                connection.send(("stop",))
+            process.join()
+        self.workers = []
+
+
+# Demonstration of the multi-lot service
+if __name__ == "__main__":
+    sites = [("Downtown", 0.5, 0.5), ("Airport", 9.0, 9.0), ("Mall", 3.0, 1.0), ("Stadium", 6.0, 4.0)]
+
+    service = ParkingService(cell_size=2.0)
+    for site_id, x, y in sites:
+        service.add_site(site_id, x, y, num_levels=1, spots_per_level=3)  # one spot per vehicle type
+
+    # Two trucks arriving downtown: the second is routed to the next closest site with a truck spot
+    print(f"🚚 Nearest truck spot to (0, 0): {service.nearest_available(VehicleType.TRUCK, 0, 0)}")
+    print(f"📍 Parked at {service.park_nearest(Truck('TRUCK1'), 0, 0)}")
+    print(f"📍 Parked at {service.park_nearest(Truck('TRUCK2'), 0, 0)}")
+    service.remove_vehicle("Downtown", "TRUCK1")
+    print(f"🚚 Nearest truck spot to (0, 0) after TRUCK1 left: {service.nearest_available(VehicleType.TRUCK, 0, 0)}")
+
+    # Same routing with the sites sharded over two worker processes
+    sharded = ShardedParkingService(num_shards=2, cell_size=2.0)
+    for site_id, x, y in sites:
+        sharded.add_site(site_id, x, y, num_levels=1, spots_per_level=3)
+    for i in range(5):
+        print(f"📍 Sharded: TRUCK{i} parked at {sharded.park_nearest(Truck(f'TRUCK{i}'), 0, 0)}")
+    sharded.close()
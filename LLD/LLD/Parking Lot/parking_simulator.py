@@ -0,0 +1,288 @@
+import argparse
+import contextlib
+import heapq
+import itertools
+import math
+import os
+import random
+import time
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:  # random draws fall back to the standard library, still in batches
+    np = None
+
+from parking_lot_with_different_spots import (ParkingLot, VehicleType, Car, Motorcycle, Truck, ExactFitStrategy,
+                                              SmallestFittingStrategy)
+
+# Discrete-event simulator and capacity planner
+# Vehicles arrive as a Poisson process, queue at the entry gates, park in a real ParkingLot (or are turned away
+# when it is full), stay for a per-type dwell time, then queue at the exit gates. A vehicle that has waited
+# `patience_seconds` at the entry gates gives up and drives off. Events live in one heap keyed by simulated
+# time; random numbers are drawn in blocks so the hot loop only indexes into lists.
+#
+# Every arrival ends up in exactly one bucket: served (parked), rejected (lot full), abandoned (gave up in the
+# entry queue) or unserved (still queued or at a gate when the run ends).
+
+VEHICLE_CLASSES = {VehicleType.MOTORCYCLE: Motorcycle, VehicleType.CAR: Car, VehicleType.TRUCK: Truck}
+
+ARRIVAL, ENTERED, DEPARTURE, EXITED, ABANDON = range(5)
+
+# Default demand: arrival share and (mean, sigma) of the log-normal dwell time in hours, per vehicle type
+DEFAULT_MIX = {VehicleType.MOTORCYCLE: 0.2, VehicleType.CAR: 0.65, VehicleType.TRUCK: 0.15}
+DEFAULT_DWELL_HOURS = {VehicleType.MOTORCYCLE: (1.5, 0.6), VehicleType.CAR: (2.5, 0.8), VehicleType.TRUCK: (4.0, 0.5)}
+
+
+# Batched random draws
+class RandomBlocks:
+    BLOCK = 8192
+
+    def __init__(self, seed, mix, dwell_hours, service_seconds):
+        self.rng = np.random.default_rng(seed) if np is not None else random.Random(seed)
+        self.types, weights = zip(*mix.items())
+        total = sum(weights)
+        self.weights = [weight / total for weight in weights]
+        # log-normal parameters from the requested mean and shape
+        self.dwell = {vehicle_type: (_lognormal_mu(mean * 3600, sigma), sigma)
+                      for vehicle_type, (mean, sigma) in dwell_hours.items()}
+        self.service_seconds = service_seconds
+        self.streams = {}
+
+    def _block(self, kind, argument):
+        rng, size = self.rng, self.BLOCK
+        if kind == "interarrival":  # argument: mean gap in seconds
+            return rng.exponential(argument, size).tolist() if np is not None else \
+                [rng.expovariate(1 / argument) for _ in range(size)]
+        if kind == "type":
+            if np is not None:
+                return [self.types[i] for i in rng.choice(len(self.types), size, p=self.weights)]
+            return rng.choices(self.types, self.weights, k=size)
+        if kind == "dwell":  # argument: vehicle type
+            mu, sigma = self.dwell[argument]
+            return rng.lognormal(mu, sigma, size).tolist() if np is not None else \
+                [rng.lognormvariate(mu, sigma) for _ in range(size)]
+        # "service": exponential gate service time
+        return rng.exponential(self.service_seconds, size).tolist() if np is not None else \
+            [rng.expovariate(1 / self.service_seconds) for _ in range(size)]
+
+    def draw(self, kind, argument=None):
+        key = (kind, argument)
+        stream = self.streams.get(key)
+        if stream is None or stream[1] == len(stream[0]):
+            stream = self.streams[key] = [self._block(kind, argument), 0]
+        value = stream[0][stream[1]]
+        stream[1] += 1
+        return value
+
+
+def _lognormal_mu(mean, sigma):
+    return math.log(mean) - sigma * sigma / 2
+
+
+# Gate bank: `servers` parallel gates sharing one FIFO queue, with time-weighted queue statistics
+class GateBank:
+    def __init__(self, servers):
+        self.servers = servers
+        self.busy = 0
+        self.queue = deque()
+        self.max_queue = 0
+        self.queue_area = 0.0  # integral of queue length over time
+        self.last_change = 0.0
+
+    def _account(self, now):
+        self.queue_area += len(self.queue) * (now - self.last_change)
+        self.last_change = now
+
+    def arrive(self, now, item):
+        """ True when a gate is free and service can start now; otherwise the item waits in the queue """
+        self._account(now)
+        if self.busy < self.servers:
+            self.busy += 1
+            return True
+        self.queue.append(item)
+        self.max_queue = max(self.max_queue, len(self.queue))
+        return False
+
+    def finish(self, now):
+        """ A gate finished; returns the next queued item (which takes over the gate) or None """
+        self._account(now)
+        if self.queue:
+            return self.queue.popleft()
+        self.busy -= 1
+        return None
+
+    def renege(self, now, item):
+        """ The item gives up waiting; True if it was still queued. With one patience for everyone the queue
+        is also ordered by give-up time, so a vehicle still waiting at its deadline is at the front """
+        if self.queue and self.queue[0] is item:
+            self._account(now)
+            self.queue.popleft()
+            return True
+        return False
+
+    def mean_queue(self, now):
+        self._account(now)
+        return self.queue_area / now if now else 0.0
+
+
+# Parking Simulator
+class ParkingSimulator:
+    def __init__(self, num_levels, spots_per_level, arrivals_per_hour, entry_gates=2, exit_gates=2,
+                 service_seconds=12.0, patience_seconds=600.0, mix=None, dwell_hours=None, strategy=None, seed=1):
+        self.lot = ParkingLot.create_independent(num_levels, spots_per_level, strategy or ExactFitStrategy())
+        self.now = 0.0
+        self.lot.clock = lambda: self.now
+        self.mean_gap = 3600 / arrivals_per_hour
+        self.patience_seconds = patience_seconds  # None: vehicles wait at the entry gates for ever
+        self.random = RandomBlocks(seed, mix or DEFAULT_MIX, dwell_hours or DEFAULT_DWELL_HOURS, service_seconds)
+        self.entry = GateBank(entry_gates)
+        self.exit = GateBank(exit_gates)
+        self.events = []
+        self.sequence = itertools.count()  # tie-breaker so the heap never compares vehicles
+        self.arrivals = dict.fromkeys(VehicleType, 0)
+        self.served = dict.fromkeys(VehicleType, 0)
+        self.rejected = dict.fromkeys(VehicleType, 0)
+        self.abandoned = dict.fromkeys(VehicleType, 0)
+        self.events_processed = 0
+        self.peak_occupancy = 0
+        self.occupied = 0
+
+    def _schedule(self, at, kind, vehicle=None):
+        heapq.heappush(self.events, (at, next(self.sequence), kind, vehicle))
+
+    def run(self, hours):
+        end = hours * 3600
+        plates = itertools.count()
+        self._schedule(self.random.draw("interarrival", self.mean_gap), ARRIVAL)
+        draw, schedule, pop, patience = self.random.draw, self._schedule, heapq.heappop, self.patience_seconds
+        processed = 0
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            while self.events:
+                at, _, kind, vehicle = pop(self.events)
+                if at > end:
+                    break
+                self.now = at
+                processed += 1
+                if kind == ARRIVAL:
+                    vehicle_type = draw("type")
+                    vehicle = VEHICLE_CLASSES[vehicle_type](f"SIM{next(plates)}")
+                    self.arrivals[vehicle_type] += 1
+                    if self.entry.arrive(at, vehicle):
+                        schedule(at + draw("service"), ENTERED, vehicle)
+                    elif patience is not None:
+                        schedule(at + patience, ABANDON, vehicle)
+                    schedule(at + draw("interarrival", self.mean_gap), ARRIVAL)
+                elif kind == ABANDON:
+                    if self.entry.renege(at, vehicle):
+                        self.abandoned[vehicle.get_vehicle_type()] += 1
+                elif kind == ENTERED:
+                    self._park(vehicle)
+                    waiting = self.entry.finish(at)
+                    if waiting is not None:
+                        schedule(at + draw("service"), ENTERED, waiting)
+                elif kind == DEPARTURE:
+                    if self.exit.arrive(at, vehicle):
+                        schedule(at + draw("service"), EXITED, vehicle)
+                else:  # EXITED
+                    self.lot.remove_vehicle(vehicle.license_plate)
+                    self.occupied -= 1
+                    waiting = self.exit.finish(at)
+                    if waiting is not None:
+                        schedule(at + draw("service"), EXITED, waiting)
+        self.now = end
+        self.events_processed += processed
+        return self.report()
+
+    def _park(self, vehicle):
+        if self.lot.park_vehicle(vehicle):
+            self.served[vehicle.get_vehicle_type()] += 1
+            self.occupied += 1
+            self.peak_occupancy = max(self.peak_occupancy, self.occupied)
+            self._schedule(self.now + self.random.draw("dwell", vehicle.get_vehicle_type()), DEPARTURE, vehicle)
+        else:
+            self.rejected[vehicle.get_vehicle_type()] += 1
+
+    def report(self):
+        arrivals = sum(self.arrivals.values())
+        served, rejected, abandoned = (sum(counts.values()) for counts in (self.served, self.rejected, self.abandoned))
+        unserved = arrivals - served - rejected - abandoned
+        return {
+            "arrivals": arrivals,
+            "served": served,
+            "rejected": rejected,
+            "abandoned": abandoned,
+            "unserved": unserved,
+            "events": self.events_processed,
+            "rejection_rate": rejected / arrivals if arrivals else 0.0,
+            "rejection_by_type": {vehicle_type: self.rejected[vehicle_type] / count if count else 0.0
+                                  for vehicle_type, count in self.arrivals.items()},
+            # everyone who did not get a spot: lot full, gave up at the gates, or still waiting at the end
+            "not_served_rate": (arrivals - served) / arrivals if arrivals else 0.0,
+            "entry_queue_mean": self.entry.mean_queue(self.now),
+            "entry_queue_max": self.entry.max_queue,
+            "exit_queue_mean": self.exit.mean_queue(self.now),
+            "exit_queue_max": self.exit.max_queue,
+            "peak_occupancy": self.peak_occupancy,
+        }
+
+
+def plan_capacity(candidates, target_rejection, hours, **simulation):
+    """ Smallest spots-per-level among the candidates whose share of vehicles not served meets the target """
+    results = []
+    for spots_per_level in sorted(candidates):
+        report = ParkingSimulator(spots_per_level=spots_per_level, **simulation).run(hours)
+        results.append((spots_per_level, report))
+        if report["not_served_rate"] <= target_rejection:
+            return spots_per_level, results
+    return None, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Discrete-event parking simulation and capacity planning")
+    parser.add_argument("--levels", type=int, default=4)
+    parser.add_argument("--spots", type=int, default=300, help="spots per level")
+    parser.add_argument("--arrivals", type=float, default=300, help="vehicles per hour")
+    parser.add_argument("--hours", type=float, default=24 * 7)
+    parser.add_argument("--entry-gates", type=int, default=2)
+    parser.add_argument("--exit-gates", type=int, default=2)
+    parser.add_argument("--service", type=float, default=12.0, help="mean gate service time in seconds")
+    parser.add_argument("--patience", type=float, default=10.0,
+                        help="minutes a vehicle waits at the entry gates before giving up (0: for ever)")
+    parser.add_argument("--overflow", action="store_true", help="let vehicles take larger spots")
+    parser.add_argument("--plan", default="", help="comma separated spots-per-level candidates to size against")
+    parser.add_argument("--target", type=float, default=0.01, help="acceptable share of vehicles not served when planning")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    simulation = dict(num_levels=args.levels, arrivals_per_hour=args.arrivals, entry_gates=args.entry_gates,
+                      exit_gates=args.exit_gates, service_seconds=args.service, seed=args.seed,
+                      patience_seconds=args.patience * 60 if args.patience > 0 else None,
+                      strategy=SmallestFittingStrategy() if args.overflow else ExactFitStrategy())
+
+    started = time.perf_counter()
+    report = ParkingSimulator(spots_per_level=args.spots, **simulation).run(args.hours)
+    elapsed = time.perf_counter() - started
+    print(f"\n🚦 Simulated {args.hours:,.0f} h: {report['events']:,} events in {elapsed:.2f} s "
+          f"({report['events'] / elapsed:,.0f} events/s, {'NumPy' if np is not None else 'stdlib'} random blocks)")
+    print(f"🚗 {report['arrivals']:,} arrivals: {report['served']:,} parked, {report['rejected']:,} rejected (lot full), "
+          f"{report['abandoned']:,} gave up at the entry gates, {report['unserved']:,} still waiting at the end")
+    print(f"🚫 Rejected {report['rejection_rate']:.1%} "
+          f"({', '.join(f'{t.name} {rate:.1%}' for t, rate in report['rejection_by_type'].items())}); "
+          f"not served {report['not_served_rate']:.1%}")
+    print(f"⏳ Entry queue mean {report['entry_queue_mean']:.2f} / max {report['entry_queue_max']}, "
+          f"exit queue mean {report['exit_queue_mean']:.2f} / max {report['exit_queue_max']}")
+    print(f"🅿️ Peak occupancy {report['peak_occupancy']:,} of {args.levels * args.spots:,} spots")
+
+    if args.plan:
+        candidates = [int(value) for value in args.plan.split(",")]
+        chosen, results = plan_capacity(candidates, args.target, args.hours, **simulation)
+        print(f"\n📐 Capacity plan (target rejection {args.target:.1%}):")
+        for spots_per_level, result in results:
+            print(f"   {args.levels} x {spots_per_level:>5} spots → not served {result['not_served_rate']:.2%}, "
+                  f"entry queue max {result['entry_queue_max']}")
+        print(f"✅ {args.levels} levels x {chosen} spots" if chosen else "❌ No candidate meets the target")
+
+
+if __name__ == "__main__":
+    main()
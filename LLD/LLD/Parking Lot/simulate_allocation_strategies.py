@@ -0,0 +1,91 @@
+import argparse
+import contextlib
+import os
+import random
+import time
+
+from parking_lot_with_different_spots import (ParkingLot, VehicleType, Car, Motorcycle, Truck, ExactFitStrategy,
+                                              SmallestFittingStrategy, OverflowWithPenaltyStrategy,
+                                              ReservedQuotaStrategy)
+
+# Allocation strategy comparison: the same seeded arrival/departure stream is replayed against a lot per
+# strategy. The lot is split into equal thirds by spot size while demand is skewed towards cars, which is
+# exactly where exact-type matching leaves truck spots idle and turns cars away.
+
+VEHICLE_CLASSES = {VehicleType.MOTORCYCLE: Motorcycle, VehicleType.CAR: Car, VehicleType.TRUCK: Truck}
+
+STRATEGIES = {
+    "exact": ExactFitStrategy,
+    "smallest-fitting": SmallestFittingStrategy,
+    "overflow-penalty": OverflowWithPenaltyStrategy,
+    "reserved-quota": ReservedQuotaStrategy,
+}
+
+
+def workload(operations, mix, seed):
+    """ ("park", type, plate) / ("leave", None, None) steps; a leave picks a random parked vehicle """
+    rng = random.Random(seed)
+    types, weights = zip(*mix.items())
+    steps = []
+    for i in range(operations):
+        if rng.random() < 0.45:
+            steps.append(("leave", None, None))
+        else:
+            steps.append(("park", rng.choices(types, weights)[0], f"V{i}"))
+    return steps
+
+
+def run(strategy, steps, num_levels, spots_per_level, seed):
+    lot = ParkingLot.create_independent(num_levels, spots_per_level, strategy)
+    total_spots = num_levels * spots_per_level
+    rng = random.Random(seed)
+    parked = []
+    arrivals = rejected = overflowed = 0
+    occupied_sum = 0
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        started = time.perf_counter()
+        for action, vehicle_type, plate in steps:
+            if action == "leave":
+                if parked:
+                    index = rng.randrange(len(parked))
+                    parked[index], parked[-1] = parked[-1], parked[index]
+                    lot.remove_vehicle(parked.pop())
+            else:
+                arrivals += 1
+                if lot.park_vehicle(VEHICLE_CLASSES[vehicle_type](plate)):
+                    parked.append(plate)
+                    overflowed += lot.locate_vehicle(plate).vehicle_type != vehicle_type
+                else:
+                    rejected += 1
+            occupied_sum += len(parked)
+        elapsed = time.perf_counter() - started
+    return {
+        "utilization": occupied_sum / len(steps) / total_spots,
+        "rejected": rejected / arrivals,
+        "overflowed": overflowed / max(arrivals - rejected, 1),
+        "ops": len(steps) / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare parking allocation strategies")
+    parser.add_argument("--levels", type=int, default=3)
+    parser.add_argument("--spots", type=int, default=300, help="spots per level")
+    parser.add_argument("--operations", type=int, default=100_000)
+    parser.add_argument("--mix", default="20,65,15", help="motorcycle,car,truck arrival weights")
+    parser.add_argument("--seed", type=int, default=17)
+    args = parser.parse_args()
+
+    mix = dict(zip(VehicleType, (float(weight) for weight in args.mix.split(","))))
+    steps = workload(args.operations, mix, args.seed)
+    print(f"\n📊 Allocation strategies: {args.levels} levels x {args.spots} spots, {args.operations:,} operations, "
+          f"arrival mix {args.mix} (M,C,T)")
+    print(f"{'strategy':>18}{'utilization':>13}{'rejected':>10}{'overflow':>10}{'ops/s':>11}")
+    for name, strategy in STRATEGIES.items():
+        result = run(strategy(), steps, args.levels, args.spots, args.seed)
+        print(f"{name:>18}{result['utilization']:>13.1%}{result['rejected']:>10.1%}"
+              f"{result['overflowed']:>10.1%}{result['ops']:>11,.0f}")
+
+
+if __name__ == "__main__":
+    main()
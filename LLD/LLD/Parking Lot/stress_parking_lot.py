@@ -0,0 +1,174 @@
+import argparse
+import contextlib
+import os
+import random
+import tempfile
+import threading
+import time
+
+from parking_ledger import ParkingLedger
+from parking_lot_with_different_spots import ParkingLot, VehicleType, Car, Motorcycle, Truck
+
+# Multi-threaded stress test for concurrent entry/exit gates.
+# Every gate is a thread that keeps parking new vehicles and removing its own. A shared ledger of
+# spot -> plate (updated under its own lock) flags any spot handed to two vehicles at once; after each
+# round the lot is drained and the free pools are checked for lost or duplicated spots.
+# Ledger check: gates churn a small lot with a ParkingLedger attached and stop without draining; the
+# ledger's occupancy (what a crash rebuild would restore) must then match the lot spot for spot.
+
+VEHICLE_CLASSES = {VehicleType.MOTORCYCLE: Motorcycle, VehicleType.CAR: Car, VehicleType.TRUCK: Truck}
+
+
+class OccupancyLedger:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.occupied = {}  # spot_id -> license plate
+        self.violations = []
+
+    def claim(self, spot_id, license_plate):
+        with self.lock:
+            if spot_id in self.occupied:
+                self.violations.append(f"{spot_id} given to {license_plate} while holding {self.occupied[spot_id]}")
+            self.occupied[spot_id] = license_plate
+
+    def release(self, spot_id):
+        with self.lock:
+            self.occupied.pop(spot_id, None)
+
+
+def gate(gate_id, parking_lot, ledger, operations, seed, counters, drain=True):
+    rng = random.Random(seed + gate_id)
+    parked = []
+    done = 0
+    for i in range(operations):
+        if parked and (rng.random() < 0.5 or i == operations - 1):
+            license_plate, spot_id = parked.pop(rng.randrange(len(parked)))
+            ledger.release(spot_id)  # before the spot can be handed out again
+            if not parking_lot.remove_vehicle(license_plate):
+                ledger.violations.append(f"gate {gate_id} could not remove its own vehicle {license_plate}")
+        else:
+            vehicle_type = rng.choice(list(VehicleType))
+            vehicle = VEHICLE_CLASSES[vehicle_type](f"G{gate_id}-{i}")
+            if parking_lot.park_vehicle(vehicle):
+                spot = parking_lot.locate_vehicle(vehicle.license_plate)
+                if spot is None or spot.vehicle is not vehicle:
+                    ledger.violations.append(f"{vehicle.license_plate} not found where the index says it is")
+                else:
+                    ledger.claim(spot.spot_id, vehicle.license_plate)
+                    parked.append((vehicle.license_plate, spot.spot_id))
+        done += 1
+    if not drain:
+        return
+    for license_plate, spot_id in parked:
+        ledger.release(spot_id)
+        parking_lot.remove_vehicle(license_plate)
+    counters[gate_id] = done
+
+
+def check_pools(parking_lot):
+    """ After draining, every spot must be free exactly once in its pool and the plate index must be empty """
+    problems = []
+    for level in parking_lot.levels:
+        positions = [position for pools in level.free_spots.values() for pool in pools for position in pool]
+        if sorted(positions) != list(range(len(level.spots))):
+            problems.append(f"level {level.level_id}: free pools hold {len(positions)} entries for {len(level.spots)} spots")
+        problems.extend(f"{spot.spot_id} still occupied" for spot in level.spots if spot.occupied)
+    leftover = sum(len(plates) for plates in parking_lot.plate_index)
+    if leftover:
+        problems.append(f"{leftover} plates left in the index")
+    return problems
+
+
+def check_ledger(gate_count, spots, operations, seed):
+    """ Churn a small lot with a ledger attached; returns spots where ledger and lot disagree """
+    parking_lot = ParkingLot.create_independent(num_levels=1, spots_per_level=spots)
+    event_ledger = ParkingLedger(tempfile.mkdtemp(prefix="parking-ledger-"))
+    parking_lot.add_listener(event_ledger)
+    threads = [threading.Thread(target=gate, args=(g, parking_lot, OccupancyLedger(), operations, seed, [0] * gate_count,
+                                                   False)) for g in range(gate_count)]
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    event_ledger.close()
+    in_lot = {(0, position): spot.vehicle.license_plate
+              for position, spot in enumerate(parking_lot.levels[0].spots) if spot.occupied}
+    in_ledger = {location: plate.rstrip(b"\0").decode() for location, (_, plate, _) in event_ledger.occupancy.items()}
+    return [f"spot {location}: lot has {in_lot.get(location)}, ledger has {in_ledger.get(location)}"
+            for location in sorted(set(in_lot) | set(in_ledger)) if in_lot.get(location) != in_ledger.get(location)]
+
+
+def check_board_after_restore():
+    """ Restoring occupancy into a lot whose board is running must update that board, not orphan it """
+    parking_lot = ParkingLot.create_independent(num_levels=2, spots_per_level=10)
+    published = []
+    board = parking_lot.board
+    board.refresh_interval, board.output = 0.01, published.append
+    board.start()
+    parking_lot.restore_occupancy({(0, 4): Car("RESTORED1"), (1, 8): Truck("RESTORED2")})
+    problems = []
+    if parking_lot.board is not board or board._thread is None:
+        problems.append("restore_occupancy replaced or stopped the running board")
+    stale = [(level.level_id, size.name) for level in parking_lot.levels for size in level.capacity
+             if board.free(level.level_id, size) != level.free_count(size)]
+    if stale:
+        problems.append(f"board counters disagree with the lot for {stale}")
+    parking_lot.close()
+    board.publish()
+    if not published or published[-1] != board.render()[1]:
+        problems.append("the board's own output never showed the restored occupancy")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent gate stress test for the parking lot")
+    parser.add_argument("--levels", type=int, default=4)
+    parser.add_argument("--spots", type=int, default=60, help="spots per level")
+    parser.add_argument("--gates", default="1,2,4,8,16,32")
+    parser.add_argument("--operations", type=int, default=2000, help="operations per gate")
+    parser.add_argument("--seed", type=int, default=3)
+    parser.add_argument("--ledger-trials", type=int, default=20, help="ledger consistency rounds (8 gates, 10 spots)")
+    args = parser.parse_args()
+
+    parking_lot = ParkingLot.create_independent(num_levels=args.levels, spots_per_level=args.spots)
+    failed = False
+    print(f"\n📊 Gate stress test: {args.levels} levels x {args.spots} spots, {args.operations:,} operations per gate")
+    print(f"{'gates':>6}{'ops/s':>12}{'violations':>12}")
+    for gate_count in (int(value) for value in args.gates.split(",")):
+        ledger = OccupancyLedger()
+        counters = [0] * gate_count
+        threads = [threading.Thread(target=gate, args=(g, parking_lot, ledger, args.operations, args.seed, counters))
+                   for g in range(gate_count)]
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+        problems = ledger.violations + check_pools(parking_lot)
+        print(f"{gate_count:>6}{sum(counters) / elapsed:>12,.0f}{len(problems):>12}")
+        for problem in problems[:5]:
+            print(f"   ❌ {problem}")
+        failed = failed or bool(problems)
+
+    mismatched_trials = 0
+    for trial in range(args.ledger_trials):
+        mismatches = check_ledger(8, 10, 500, args.seed + trial)
+        if mismatches:
+            mismatched_trials += 1
+            print(f"   ❌ ledger trial {trial}: {mismatches[0]}")
+    print(f"📒 Ledger vs lot after concurrent gates: {mismatched_trials} of {args.ledger_trials} trials disagree")
+    failed = failed or bool(mismatched_trials)
+    problems = check_board_after_restore()
+    print(f"📢 Board after restoring occupancy: {'ok' if not problems else problems[0]}")
+    failed = failed or bool(problems)
+
+    print("❌ Spot double-assignment, pool corruption or ledger drift detected" if failed
+          else "✅ No spot was ever double-assigned and the ledger matches the lot")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()